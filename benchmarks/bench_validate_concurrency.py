@@ -0,0 +1,160 @@
+"""
+validate_project_logic 并发延迟基准
+
+使用进程内的 Neo4j 替身（不需要真实数据库），对比：
+- before: 旧版同步驱动，在 async 工具中阻塞事件循环
+- after:  AsyncGraphDatabase 异步驱动，I/O 可以并发重叠
+- memory: 进程内邻接表引擎，无网络往返
+
+用法：
+    uv run python -m benchmarks.bench_validate_concurrency --concurrency 50 --latency-ms 20
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import core.graph_backend as graph_backend
+import core.path_cache as path_cache
+import tools.logic_guardian as logic_guardian
+from core.memory_graph import MemoryGraphBackend
+from core.neo4j_backend import Neo4jClient, Neo4jConnection
+from core.path_cache import PathCache
+
+# 基准使用独立的项目，不影响默认项目已创建的后端与缓存
+PROJECT = "bench"
+
+
+class _FakeResult:
+    def __init__(self, record):
+        self._record = record
+
+    async def single(self):
+        return self._record
+
+    async def consume(self):
+        return None
+
+
+class _FakeTx:
+    def __init__(self, latency):
+        self._latency = latency
+
+    async def run(self, query, **params):
+        await asyncio.sleep(self._latency)
+        return _FakeResult({"path_list": [params.get("start"), params.get("end")]})
+
+
+class _FakeAsyncSession:
+    def __init__(self, latency):
+        self._latency = latency
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute_read(self, fn, *args):
+        return await fn(_FakeTx(self._latency), *args)
+
+    execute_write = execute_read
+
+
+class _FakeAsyncDriver:
+    """模拟 AsyncDriver：每次查询耗时 latency 秒，但不阻塞事件循环。"""
+
+    def __init__(self, latency):
+        self._latency = latency
+
+    def session(self, **kwargs):
+        return _FakeAsyncSession(self._latency)
+
+    async def close(self):
+        return None
+
+
+class _BlockingClient:
+    """复现旧版行为：async 工具内部调用同步驱动，查询期间阻塞事件循环。"""
+
+    def __init__(self, latency):
+        self._latency = latency
+        self.project = PROJECT
+        self.generation = 0
+
+    async def check_path(self, start, end, max_depth=None):
+        time.sleep(self._latency)
+        return [start, end]
+
+    async def check_paths(self, pairs, max_depth=None):
+        return [await self.check_path(start, end) for start, end in pairs]
+
+
+def _percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+async def _run_round(concurrency):
+    # 所有请求视为同一时刻到达，延迟从到达时刻算起（包含排队等待事件循环的时间）
+    async def timed_call(i):
+        await logic_guardian.validate_project_logic(f"任务{i}", "系统设计", project=PROJECT)
+        return time.perf_counter() - begin
+
+    begin = time.perf_counter()
+    latencies = await asyncio.gather(*(timed_call(i) for i in range(concurrency)))
+    return latencies, time.perf_counter() - begin
+
+
+def _report(label, latencies, wall):
+    ms = [x * 1000 for x in latencies]
+    print(
+        f"{label:<7} p50={statistics.median(ms):8.2f}ms  "
+        f"p99={_percentile(ms, 99):8.2f}ms  total={wall * 1000:8.2f}ms"
+    )
+
+
+def _install(backend):
+    # 直接登记为基准项目的后端，并配一个容量为 0 的缓存，使每次调用都真正访问后端
+    graph_backend._backends[PROJECT] = backend
+    path_cache._path_caches[PROJECT] = (backend, PathCache(max_size=0))
+
+
+async def main(concurrency, latency_ms):
+    latency = latency_ms / 1000
+    # 关闭可达性索引
+    original_index = logic_guardian.get_reachability_index
+    logic_guardian.get_reachability_index = lambda project=None: None
+
+    try:
+        _install(_BlockingClient(latency))
+        latencies, wall = await _run_round(concurrency)
+        _report("before", latencies, wall)
+
+        connection = Neo4jConnection()
+        connection._driver = _FakeAsyncDriver(latency)
+        _install(Neo4jClient(PROJECT, connection))
+        latencies, wall = await _run_round(concurrency)
+        _report("after", latencies, wall)
+
+        memory = MemoryGraphBackend(PROJECT)
+        await memory.upsert_chunked(
+            [{"pre": "系统设计", "post": f"任务{i}"} for i in range(concurrency)]
+        )
+        _install(memory)
+        latencies, wall = await _run_round(concurrency)
+        _report("memory", latencies, wall)
+    finally:
+        logic_guardian.get_reachability_index = original_index
+        graph_backend.discard_backend(PROJECT)
+        path_cache._path_caches.pop(PROJECT, None)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--concurrency", type=int, default=50, help="并发调用数 N")
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="单次查询模拟耗时")
+    args = parser.parse_args()
+    asyncio.run(main(args.concurrency, args.latency_ms))
@@ -0,0 +1,276 @@
+"""
+Task 图离线批量导入（命令行）
+
+以有界内存流式读取 CSV / JSONL 关系文件，流式去重后：
+- 默认模式：按块并发写入当前配置的图谱后端（每块一个受管写事务）
+- --admin-dir 模式：生成 neo4j-admin database import 所需的节点 / 关系 CSV
+
+函数：
+- iter_edges: 流式读取关系文件，逐行产出 (行号, pre, post) 或格式错误
+- dedupe_edges: 任务名规范化后基于 64 位摘要的流式去重
+- load_into_backend: 分块并发写入后端
+- write_admin_files: 生成 neo4j-admin 导入文件
+
+用法：
+    uv run python -m core.bulk_import edges.csv --project demo --chunk-size 5000 --workers 4
+    uv run python -m core.bulk_import edges.jsonl --admin-dir import/
+"""
+
+import argparse
+import asyncio
+import csv
+import hashlib
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger("LogicGuardian.BulkImport")
+
+Edge = Tuple[int, str, str]
+
+
+class ImportProgress:
+    """导入进度与吞吐统计，按时间间隔输出日志。"""
+
+    def __init__(self, interval: float = 2.0):
+        self.interval = interval
+        self.started = time.perf_counter()
+        self._last_report = self.started
+        self.rows = 0
+        self.malformed = 0
+        self.duplicates = 0
+        self.loaded = 0
+        self.failed = 0
+
+    def tick(self, force: bool = False) -> None:
+        now = time.perf_counter()
+        if force or now - self._last_report >= self.interval:
+            self._last_report = now
+            logger.info(
+                f"已读取 {self.rows} 行，重复 {self.duplicates}，格式错误 {self.malformed}，"
+                f"已写入 {self.loaded}，失败 {self.failed}，{self.rate():.0f} 行/秒"
+            )
+
+    def rate(self) -> float:
+        elapsed = time.perf_counter() - self.started
+        return self.rows / elapsed if elapsed > 0 else 0.0
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "rows": self.rows,
+            "malformed": self.malformed,
+            "duplicates": self.duplicates,
+            "loaded": self.loaded,
+            "failed": self.failed,
+            "seconds": round(time.perf_counter() - self.started, 2),
+            "rows_per_sec": round(self.rate(), 1),
+        }
+
+
+def iter_edges(
+    path: Path, fmt: str, pre_column: str = "pre", post_column: str = "post"
+) -> Iterator[Tuple[int, Optional[str], Optional[str]]]:
+    """
+    流式读取关系文件。
+
+    Args:
+        path (Path): 文件路径
+        fmt (str): "csv" 或 "jsonl"
+        pre_column (str): 前置任务所在的列 / 字段名
+        post_column (str): 后置任务所在的列 / 字段名
+
+    Returns:
+        Iterator: 逐行产出 (行号, pre, post)；行格式错误时 pre / post 为 None
+    """
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        if fmt == "csv":
+            for line_no, row in enumerate(csv.DictReader(f), start=2):
+                yield line_no, row.get(pre_column) or None, row.get(post_column) or None
+        else:
+            for line_no, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    row = json.loads(line)
+                    pre, post = row.get(pre_column), row.get(post_column)
+                except (ValueError, AttributeError):
+                    pre = post = None
+                yield (
+                    line_no,
+                    pre if isinstance(pre, str) and pre else None,
+                    post if isinstance(post, str) and post else None,
+                )
+
+
+def _digest(*parts: str) -> int:
+    raw = "\x1f".join(parts).encode("utf-8")
+    return int.from_bytes(hashlib.blake2b(raw, digest_size=8).digest(), "little")
+
+
+def dedupe_edges(
+    rows: Iterable[Tuple[int, Optional[str], Optional[str]]],
+    progress: ImportProgress,
+    normalize: Optional[Callable[[str], str]] = None,
+) -> Iterator[Edge]:
+    """
+    流式去重：只保留每条关系的 64 位摘要而不是完整字符串，内存与不重复的关系数成正比。
+    传入 normalize 时先把任务名规范化再去重，写法不同的同一关系只保留一条。
+    """
+    seen = set()
+    for line_no, pre, post in rows:
+        progress.rows += 1
+        if normalize is not None and pre is not None and post is not None:
+            try:
+                pre, post = normalize(pre), normalize(post)
+            except ValueError:
+                pre = post = None
+        if pre is None or post is None:
+            progress.malformed += 1
+            logger.warning(f"第 {line_no} 行格式错误，已跳过")
+            continue
+        key = _digest(pre, post)
+        if key in seen:
+            progress.duplicates += 1
+            continue
+        seen.add(key)
+        yield line_no, pre, post
+
+
+def _batches(edges: Iterable[Edge], size: int) -> Iterator[List[Edge]]:
+    batch: List[Edge] = []
+    for edge in edges:
+        batch.append(edge)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+async def load_into_backend(
+    edges: Iterable[Edge],
+    progress: ImportProgress,
+    chunk_size: int,
+    workers: int,
+    failed_file: Optional[Path] = None,
+    project: Optional[str] = None,
+) -> None:
+    """
+    分块并发写入当前配置的图谱后端中的 project 项目。
+
+    队列长度限制为 workers * 2，读取速度不会超过写入速度太多，内存保持有界。
+    并发写入同一任务节点可能发生死锁，驱动会把它当作瞬时错误在事务重试时间内自动重试。
+    """
+    from core.graph_backend import get_backend
+
+    backend = get_backend(project)
+    queue: asyncio.Queue = asyncio.Queue(maxsize=workers * 2)
+    failed_out = open(failed_file, "w", encoding="utf-8") if failed_file else None
+
+    async def worker():
+        while True:
+            batch = await queue.get()
+            try:
+                if batch is None:
+                    return
+                rels = [{"pre": pre, "post": post} for _, pre, post in batch]
+                report = await backend.upsert_chunked(rels, chunk_size)
+                progress.failed += len(report["failed_rows"])
+                progress.loaded += len(rels) - len(report["failed_rows"])
+                if failed_out is not None:
+                    for row in report["failed_rows"]:
+                        line_no = batch[row["row"]][0]
+                        failed_out.write(json.dumps({"line": line_no, **row}, ensure_ascii=False) + "\n")
+                progress.tick()
+            finally:
+                queue.task_done()
+
+    tasks = [asyncio.create_task(worker()) for _ in range(workers)]
+    try:
+        for batch in _batches(edges, chunk_size):
+            await queue.put(batch)
+        for _ in tasks:
+            await queue.put(None)
+        await asyncio.gather(*tasks)
+    finally:
+        for task in tasks:
+            task.cancel()
+        if failed_out is not None:
+            failed_out.close()
+        await backend.close()
+
+
+def write_admin_files(
+    edges: Iterable[Edge], progress: ImportProgress, out_dir: Path, project: str
+) -> Dict[str, str]:
+    """
+    生成 neo4j-admin database import full 使用的 CSV（所有任务归入 project 项目）：
+
+        neo4j-admin database import full --nodes=Task=tasks.csv --relationships=DependsOn=depends_on.csv
+    """
+    out_dir.mkdir(parents=True, exist_ok=True)
+    nodes_path, rels_path = out_dir / "tasks.csv", out_dir / "depends_on.csv"
+    seen_nodes = set()
+    with open(nodes_path, "w", encoding="utf-8", newline="") as nf, \
+            open(rels_path, "w", encoding="utf-8", newline="") as rf:
+        nodes, rels = csv.writer(nf), csv.writer(rf)
+        nodes.writerow(["name:ID(Task)", "project", ":LABEL"])
+        rels.writerow([":START_ID(Task)", ":END_ID(Task)", ":TYPE"])
+        for _, pre, post in edges:
+            for name in (pre, post):
+                key = _digest(name)
+                if key not in seen_nodes:
+                    seen_nodes.add(key)
+                    nodes.writerow([name, project, "Task"])
+            # 关系方向与在线写入一致：(post)-[:DependsOn]->(pre)
+            rels.writerow([post, pre, "DependsOn"])
+            progress.loaded += 1
+            progress.tick()
+    return {"nodes": str(nodes_path), "relationships": str(rels_path)}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Task 图离线批量导入")
+    parser.add_argument("path", type=Path, help="CSV 或 JSONL 关系文件")
+    parser.add_argument("--format", choices=["csv", "jsonl"], help="文件格式，默认按扩展名判断")
+    parser.add_argument("--pre-column", default="pre", help="前置任务列名")
+    parser.add_argument("--post-column", default="post", help="后置任务列名")
+    parser.add_argument("--chunk-size", type=int, default=5000, help="每个写事务的关系数")
+    parser.add_argument("--workers", type=int, default=4, help="并发写事务数")
+    parser.add_argument("--failed-file", type=Path, help="写入失败的行输出到该 JSONL 文件")
+    parser.add_argument("--project", help="导入到的项目命名空间，默认取 logic_graph.default_project")
+    parser.add_argument("--admin-dir", type=Path, help="不写数据库，改为在该目录生成 neo4j-admin 导入文件")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, stream=sys.stderr, format="%(levelname)s: %(message)s")
+    fmt = args.format or ("jsonl" if args.path.suffix.lower() in (".jsonl", ".ndjson") else "csv")
+    if not args.path.exists():
+        logger.error(f"文件不存在: {args.path}")
+        return 1
+
+    from core.graph_backend import resolve_project
+    from core.names import get_name_normalizer
+
+    try:
+        project = resolve_project(args.project)
+    except ValueError as e:
+        logger.error(str(e))
+        return 1
+    progress = ImportProgress()
+    rows = iter_edges(args.path, fmt, args.pre_column, args.post_column)
+    edges = dedupe_edges(rows, progress, get_name_normalizer().normalize)
+    if args.admin_dir:
+        files = write_admin_files(edges, progress, args.admin_dir, project)
+        logger.info(f"已生成 neo4j-admin 导入文件: {files}")
+    else:
+        asyncio.run(load_into_backend(edges, progress, args.chunk_size, args.workers, args.failed_file, project))
+    progress.tick(force=True)
+    print(json.dumps(progress.summary(), ensure_ascii=False))
+    return 0 if progress.failed == 0 else 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,84 @@
+"""
+增量循环依赖检测
+
+- CycleMonitor: 记录已知的环与自上次检测以来被写入触及的节点，检测时只拉取并
+  重算受影响的区域
+- get_cycle_monitor: 返回挂在项目图谱后端上的检测器实例（每个项目一个）
+
+增量正确性：新增关系 (post)-[:DependsOn]->(pre) 产生的环必然经过 post，且环上
+每个节点都可以从 post 沿 DependsOn 到达。因此以被触及的 post 为种子、沿
+DependsOn 方向的可达闭包 R 包含所有新环；而与 R 相交的旧环也整体落在 R 内，
+重算 R 后替换即可，R 之外的旧环保持不变。
+
+删除关系不会产生新环，但会拆开经过其 post 的旧环；拆开后剩下的环可能不再经过
+post（如删掉 P->X 后 X<->Y 仍成环），从 post 出发也未必可达。因此删除时除 post
+外，还要把包含 post 的已知环上的所有任务一并标脏，使这些残余环落在 R 内重新算出。
+"""
+
+import asyncio
+from typing import Any, Dict, List, Optional, Set
+
+from core.graph_algorithms import find_cycles
+from core.graph_backend import GraphBackend, get_backend
+
+
+class CycleMonitor:
+    def __init__(self, backend: GraphBackend):
+        self.backend = backend
+        self._cycles: List[Dict[str, Any]] = []
+        self._dirty: Set[str] = set()
+        self._initialized = False
+        self._lock = asyncio.Lock()
+        backend.add_write_listener(self.on_write)
+        backend.add_delete_listener(self.on_delete)
+
+    def on_write(self, chunk: List[Dict[str, str]]) -> None:
+        self._dirty.update(rel["post"] for rel in chunk)
+
+    def on_delete(self, chunk: List[Dict[str, str]]) -> None:
+        posts = {rel["post"] for rel in chunk}
+        self._dirty.update(posts)
+        for cycle in self._cycles:
+            if not posts.isdisjoint(cycle["tasks"]):
+                self._dirty.update(cycle["tasks"])
+
+    async def check(self, full_scan: bool = False) -> Dict[str, Any]:
+        """
+        返回全图当前的循环依赖。
+
+        Args:
+            full_scan (bool): 为 True 时忽略增量状态，重新扫描全图
+
+        Returns:
+            Dict[str, Any]: {"cycles": [...], "mode": "full" | "incremental" | "cached", "checked_tasks": int}
+        """
+        async with self._lock:
+            if full_scan or not self._initialized:
+                # 先清空脏集合再拉取：拉取期间的新写入会留在脏集合里等待下次检测
+                self._dirty.clear()
+                edges = await self.backend.fetch_edges()
+                self._cycles = find_cycles(edges)
+                self._initialized = True
+                mode = "full"
+            elif self._dirty:
+                seeds, self._dirty = list(self._dirty), set()
+                edges = await self.backend.fetch_edges(seeds)
+                region = set(edges)
+                kept = [c for c in self._cycles if region.isdisjoint(c["tasks"])]
+                self._cycles = sorted(kept + find_cycles(edges), key=lambda c: c["tasks"])
+                mode = "incremental"
+            else:
+                edges = {}
+                mode = "cached"
+            return {"cycles": list(self._cycles), "mode": mode, "checked_tasks": len(edges)}
+
+
+_monitors: Dict[str, CycleMonitor] = {}
+
+
+def get_cycle_monitor(project: Optional[str] = None) -> CycleMonitor:
+    backend = get_backend(project)
+    instance = _monitors.get(backend.project)
+    if instance is None or instance.backend is not backend:
+        instance = _monitors[backend.project] = CycleMonitor(backend)
+    return instance
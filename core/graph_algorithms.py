@@ -0,0 +1,237 @@
+"""
+DependsOn 图上的纯算法（不访问数据库）
+
+邻接表统一为 {post: [pre, ...]}，即沿 DependsOn 方向：
+- strongly_connected_components: 迭代版 Tarjan 强连通分量
+- find_cycles: 所有循环依赖（多节点 SCC 与自环），附带一条可读的环路
+- topological_order: Kahn 拓扑排序，前置任务排在前面，返回无法排序的剩余节点
+- schedule: 分层、最早开始时间、松弛时间与关键路径（CPM）
+- CyclicDependencyError: schedule 遇到循环依赖时抛出
+"""
+
+from collections import deque
+from typing import Dict, Iterable, List, Mapping, Set, Tuple
+
+Adjacency = Mapping[str, Iterable[str]]
+
+
+class CyclicDependencyError(ValueError):
+    """图中存在循环依赖，blocked 为无法排序的任务。"""
+
+    def __init__(self, blocked: List[str]):
+        super().__init__(f"存在循环依赖，无法排期，涉及任务: {', '.join(blocked[:20])}")
+        self.blocked = blocked
+
+
+def strongly_connected_components(depends_on: Adjacency) -> List[List[str]]:
+    """
+    Tarjan 强连通分量（显式栈实现，避免深链触发递归上限）。
+
+    Args:
+        depends_on (Adjacency): {post: [pre, ...]}，未出现在键中的 pre 视为无出边
+
+    Returns:
+        List[List[str]]: 所有强连通分量，每个分量一个任务名列表
+    """
+    index: Dict[str, int] = {}
+    lowlink: Dict[str, int] = {}
+    on_stack: Set[str] = set()
+    stack: List[str] = []
+    components: List[List[str]] = []
+    counter = 0
+
+    for root in depends_on:
+        if root in index:
+            continue
+        work = [(root, iter(depends_on.get(root, ())))]
+        index[root] = lowlink[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack.add(root)
+        while work:
+            node, neighbours = work[-1]
+            advanced = False
+            for nxt in neighbours:
+                if nxt not in index:
+                    index[nxt] = lowlink[nxt] = counter
+                    counter += 1
+                    stack.append(nxt)
+                    on_stack.add(nxt)
+                    work.append((nxt, iter(depends_on.get(nxt, ()))))
+                    advanced = True
+                    break
+                if nxt in on_stack:
+                    lowlink[node] = min(lowlink[node], index[nxt])
+            if advanced:
+                continue
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                lowlink[parent] = min(lowlink[parent], lowlink[node])
+            if lowlink[node] == index[node]:
+                component = []
+                while True:
+                    member = stack.pop()
+                    on_stack.discard(member)
+                    component.append(member)
+                    if member == node:
+                        break
+                components.append(component)
+    return components
+
+
+def _witness_cycle(depends_on: Adjacency, members: Set[str]) -> List[str]:
+    """在一个强连通分量内用 BFS 找出一条从某节点回到自身的最短环。"""
+    start = min(members)
+    parent: Dict[str, str] = {}
+    queue = deque([start])
+    while queue:
+        node = queue.popleft()
+        for nxt in depends_on.get(node, ()):
+            if nxt not in members:
+                continue
+            if nxt == start:
+                chain = [node]
+                while chain[-1] != start:
+                    chain.append(parent[chain[-1]])
+                chain.reverse()
+                return chain + [start]
+            if nxt not in parent:
+                parent[nxt] = node
+                queue.append(nxt)
+    return [start, start]
+
+
+def find_cycles(depends_on: Adjacency) -> List[Dict[str, object]]:
+    """
+    找出图中所有循环依赖。
+
+    Returns:
+        List[Dict[str, object]]: 每个环一项，{"tasks": 分量内全部任务, "chain": 一条具体环路}
+    Example:
+        [{"tasks": ["A", "B", "C"], "chain": ["A", "C", "B", "A"]}]
+    """
+    cycles = []
+    for component in strongly_connected_components(depends_on):
+        members = set(component)
+        if len(component) == 1 and component[0] not in set(depends_on.get(component[0], ())):
+            continue
+        cycles.append({
+            "tasks": sorted(members),
+            "chain": _witness_cycle(depends_on, members),
+        })
+    cycles.sort(key=lambda c: c["tasks"])
+    return cycles
+
+
+def topological_order(depends_on: Adjacency) -> Tuple[List[str], List[str]]:
+    """
+    Kahn 拓扑排序，输出的执行顺序中每个任务都排在它依赖的前置任务之后。
+
+    Returns:
+        Tuple[List[str], List[str]]: (可排序的任务顺序, 处于环上或依赖环的剩余任务)
+    """
+    nodes: Dict[str, None] = {}
+    dependents: Dict[str, List[str]] = {}
+    pending: Dict[str, int] = {}
+    for post, pres in depends_on.items():
+        nodes.setdefault(post)
+        unique = set(pres)
+        pending[post] = pending.get(post, 0) + len(unique)
+        for pre in unique:
+            nodes.setdefault(pre)
+            dependents.setdefault(pre, []).append(post)
+
+    queue = deque(sorted(node for node in nodes if pending.get(node, 0) == 0))
+    order: List[str] = []
+    while queue:
+        node = queue.popleft()
+        order.append(node)
+        for post in dependents.get(node, ()):
+            pending[post] -= 1
+            if pending[post] == 0:
+                queue.append(post)
+    placed = set(order)
+    return order, sorted(node for node in nodes if node not in placed)
+
+
+def schedule(
+    depends_on: Adjacency, durations: Mapping[str, float], default_duration: float = 1
+) -> Dict[str, object]:
+    """
+    在 DAG 上线性时间计算分层、最早开始时间、松弛时间与关键路径。
+
+    Args:
+        depends_on (Adjacency): {post: [pre, ...]}
+        durations (Mapping[str, float]): 任务工期，缺失的任务使用 default_duration
+        default_duration (float): 默认工期
+
+    Returns:
+        Dict[str, object]: 分层、每个任务的排期、关键路径与总工期
+    Raises:
+        CyclicDependencyError: 图中存在循环依赖
+    Example:
+        {
+            "total_duration": 5,
+            "critical_path": ["系统设计", "后端开发", "系统联调"],
+            "layers": [["系统设计"], ["后端开发"], ["系统联调"]],
+            "tasks": {"系统设计": {"layer": 0, "duration": 2, "earliest_start": 0,
+                                   "earliest_finish": 2, "latest_start": 0, "slack": 0}}
+        }
+    """
+    order, blocked = topological_order(depends_on)
+    if blocked:
+        raise CyclicDependencyError(blocked)
+
+    pres_of: Dict[str, Set[str]] = {name: set(depends_on.get(name, ())) for name in order}
+    dependents: Dict[str, List[str]] = {name: [] for name in order}
+    for post, pres in pres_of.items():
+        for pre in pres:
+            dependents[pre].append(post)
+
+    duration = {name: durations.get(name, default_duration) for name in order}
+    layer: Dict[str, int] = {}
+    start: Dict[str, float] = {}
+    finish: Dict[str, float] = {}
+    for name in order:
+        pres = pres_of[name]
+        layer[name] = 1 + max((layer[pre] for pre in pres), default=-1)
+        start[name] = max((finish[pre] for pre in pres), default=0)
+        finish[name] = start[name] + duration[name]
+
+    total = max(finish.values(), default=0)
+    latest_finish: Dict[str, float] = {}
+    for name in reversed(order):
+        latest_finish[name] = min(
+            (latest_finish[post] - duration[post] for post in dependents[name]), default=total
+        )
+
+    critical_path: List[str] = []
+    if order:
+        node = max(order, key=lambda name: finish[name])
+        critical_path.append(node)
+        while pres_of[node]:
+            node = max(pres_of[node], key=lambda pre: finish[pre])
+            critical_path.append(node)
+        critical_path.reverse()
+
+    layers: List[List[str]] = [[] for _ in range(max(layer.values(), default=-1) + 1)]
+    for name in order:
+        layers[layer[name]].append(name)
+
+    return {
+        "total_duration": total,
+        "critical_path": critical_path,
+        "layers": layers,
+        "tasks": {
+            name: {
+                "layer": layer[name],
+                "duration": duration[name],
+                "earliest_start": start[name],
+                "earliest_finish": finish[name],
+                "latest_start": latest_finish[name] - duration[name],
+                "slack": latest_finish[name] - finish[name],
+            }
+            for name in order
+        },
+    }
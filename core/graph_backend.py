@@ -0,0 +1,360 @@
+"""
+逻辑图谱存储后端接口
+
+logic_guardian 的工具只依赖 GraphBackend 定义的异步方法，具体存储可以是
+Neo4j（core/neo4j_backend.py）或进程内邻接表引擎（core/memory_graph.py）。
+
+- GraphBackend: 后端抽象基类，内置分块写入 / 删除的通用流程与写入 / 删除监听
+- resolve_project: 校验项目名，为空时返回默认项目
+- get_backend: 按 config.yaml 中的 logic_graph.backend 返回项目对应的后端实例
+- discard_backend: 丢弃项目的后端实例（删除项目后调用），挂在其上的缓存与索引随之重建
+
+每个后端实例只看得到一个项目（命名空间）内的任务：不同项目可以有同名任务，
+关系也不会跨项目。
+"""
+
+import logging
+import os
+import re
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from modules.YA_Common.utils.config import get_config
+
+logger = logging.getLogger("LogicGuardian")
+
+# 与原 Cypher 中 DependsOn*1..15 的上限保持一致；可由 logic_graph.path_search.max_depth 覆盖
+DEFAULT_MAX_DEPTH = 15
+
+# 未指定项目时使用的命名空间；升级前的数据迁移到该项目下
+DEFAULT_PROJECT = "default"
+
+# 允许通过工具写入的 Task 节点属性及其校验函数
+TASK_PROPERTIES = {
+    "duration": lambda v: isinstance(v, (int, float)) and not isinstance(v, bool) and v >= 0,
+    "description": lambda v: isinstance(v, str),
+}
+
+
+def resolve_project(project: Optional[str] = None) -> str:
+    """
+    校验项目名；为空时取配置 logic_graph.default_project。
+
+    Raises:
+        ValueError: 项目名包含字母、数字、下划线、连字符与点以外的字符
+    """
+    project = project or get_config("logic_graph.default_project", DEFAULT_PROJECT)
+    # 项目名会用于快照文件名，只允许安全字符
+    if not isinstance(project, str) or not re.fullmatch(r"\w[\w.-]*", project):
+        raise ValueError(f"项目名不合法: {project!r}，只能包含字母、数字、下划线、连字符与点")
+    return project
+
+
+class PathSearchBudgetExceeded(RuntimeError):
+    """路径搜索访问的节点数超出 logic_graph.path_search.visit_budget。"""
+
+
+def resolve_max_depth(max_depth: Optional[int] = None) -> Optional[int]:
+    """
+    解析路径搜索的最大跳数。
+
+    Args:
+        max_depth (Optional[int]): 为空时取配置 logic_graph.path_search.max_depth；0 表示不限跳数
+
+    Returns:
+        Optional[int]: 最大跳数，None 表示不限
+    Raises:
+        ValueError: max_depth 为负数
+    """
+    if max_depth is None:
+        max_depth = get_config("logic_graph.path_search.max_depth", DEFAULT_MAX_DEPTH)
+    if max_depth < 0:
+        raise ValueError("max_depth 必须大于等于 0（0 表示不限跳数）")
+    return max_depth or None
+
+
+class GraphBackend(ABC):
+    """Task / DependsOn 图的存储后端。关系方向始终为 (post)-[:DependsOn]->(pre)。"""
+
+    name = "abstract"
+
+    def __init__(self, project: str = DEFAULT_PROJECT):
+        self.project = project
+        self.chunk_size = get_config("neo4j.ingest_chunk_size", 1000)
+        # 图谱代数：每次成功写入后递增，供缓存判断结果是否过期
+        self.generation = 0
+        # 写入监听：每个成功提交的块都会以 (chunk) 回调，用于维护进程内的增量结构
+        self._write_listeners: List[Callable[[List[Dict[str, str]]], None]] = []
+        # 删除监听：每个成功删除关系的块以 (chunk) 回调
+        self._delete_listeners: List[Callable[[List[Dict[str, str]]], None]] = []
+        # 节点监听：set_task_properties 成功后以 (任务名列表) 回调，覆盖没有任何关系的孤立任务
+        self._node_listeners: List[Callable[[List[str]], None]] = []
+
+    @abstractmethod
+    async def _write_chunk(self, chunk: List[Dict[str, str]], attempts: List[float]) -> None:
+        """以一个事务写入一块关系；每次（重）试执行前向 attempts 追加一个时间戳。"""
+
+    @abstractmethod
+    async def _delete_chunk(self, chunk: List[Dict[str, str]], attempts: List[float]) -> None:
+        """以一个事务删除一块关系（只删关系，不删任务节点）；不存在的关系忽略。"""
+
+    @abstractmethod
+    async def check_path(self, start: str, end: str, max_depth: Optional[int] = DEFAULT_MAX_DEPTH) -> Optional[List[str]]:
+        """
+        返回 start 经 DependsOn 到达 end 的最短路径（任务名列表），不存在时返回 None。
+
+        Args:
+            max_depth (Optional[int]): 最大跳数，None 表示不限（见 resolve_max_depth）
+        Raises:
+            PathSearchBudgetExceeded: 搜索访问的节点数超出预算
+        """
+
+    @abstractmethod
+    async def check_paths(
+        self, pairs: List[Tuple[str, str]], max_depth: Optional[int] = DEFAULT_MAX_DEPTH
+    ) -> List[Optional[List[str]]]:
+        """批量版 check_path，一次往返解析所有 (start, end)，结果与 pairs 一一对应。"""
+
+    @abstractmethod
+    async def k_paths(
+        self, start: str, end: str, k: int, time_budget: float, max_depth: Optional[int] = DEFAULT_MAX_DEPTH
+    ) -> Tuple[List[List[str]], bool]:
+        """
+        返回 start 经 DependsOn 到达 end 的至多 k 条不同链条，按跳数从短到长排列。
+
+        Args:
+            time_budget (float): 时间预算（秒），超出后返回已找到的链条
+            max_depth (Optional[int]): 最大跳数，None 表示不限
+
+        Returns:
+            Tuple[List[List[str]], bool]: (链条列表, 是否因超出时间预算而提前结束)
+        """
+
+    @abstractmethod
+    async def get_context(self, name: str) -> Tuple[List[str], List[str]]:
+        """返回 (直接前置任务, 直接后置任务)。"""
+
+    @abstractmethod
+    async def neighbours(self, names: List[str], direction: str) -> Dict[str, List[str]]:
+        """
+        一次查询一批任务的直接邻居。
+
+        Args:
+            names (List[str]): 任务名
+            direction (str): "upstream" 返回 {name: [pre, ...]}，"downstream" 返回 {name: [post, ...]}
+        """
+
+    @abstractmethod
+    async def neighbour_page(
+        self, name: str, direction: str, after: Optional[str], limit: int
+    ) -> List[str]:
+        """
+        按名称顺序分页读取一个任务的直接邻居（keyset 分页），单次最多返回 limit 个。
+
+        Args:
+            name (str): 任务名
+            direction (str): "upstream"（前置任务）或 "downstream"（后置任务）
+            after (Optional[str]): 只返回名称大于 after 的邻居，为空时从头读取
+            limit (int): 最多返回的数量
+        """
+
+    @abstractmethod
+    async def fetch_edges(self, seeds: Optional[List[str]] = None) -> Dict[str, List[str]]:
+        """
+        拉取 DependsOn 邻接表 {post: [pre, ...]}。
+
+        Args:
+            seeds (Optional[List[str]]): 为空时返回全图；否则只返回从 seeds 出发
+                沿 DependsOn 方向可达的子图（含 seeds 自身）
+        """
+
+    async def fetch_task_names(self) -> List[str]:
+        """返回本项目的全部任务名（含没有任何关系的孤立任务）。"""
+        return list(await self.fetch_edges())
+
+    @abstractmethod
+    async def search_tasks(self, query: str, offset: int, limit: int) -> List[Dict[str, Any]]:
+        """
+        按任务名与描述做全文检索，按相关度从高到低（同分按名称）返回第 offset 起的至多 limit 条。
+
+        Returns:
+            List[Dict[str, Any]]: [{"name": 任务名, "description": 描述或 None, "score": 相关度}]
+        """
+
+    @abstractmethod
+    async def set_task_properties(self, properties: Dict[str, Dict[str, Any]]) -> None:
+        """批量写入任务属性 {name: {key: value}}，任务不存在时会先创建（MERGE 语义）。"""
+
+    @abstractmethod
+    async def fetch_task_properties(self, names: List[str], keys: List[str]) -> Dict[str, Dict[str, Any]]:
+        """读取任务属性，返回 {name: {key: value}}，缺失的属性不出现在结果中。"""
+
+    @abstractmethod
+    async def describe_schema(self) -> Dict[str, Any]:
+        """返回后端当前的索引 / 约束信息。"""
+
+    @abstractmethod
+    async def drop_project(self) -> int:
+        """删除本项目的全部任务及其关系，返回删除的任务数。"""
+
+    async def close(self) -> None:
+        return None
+
+    def pool_stats(self) -> Optional[Dict[str, Any]]:
+        """连接池统计；没有连接池的后端返回 None。"""
+        return None
+
+    async def expand(
+        self, name: str, depth: int, direction: str, max_visit: int
+    ) -> Tuple[Dict[str, int], List[Tuple[str, str]], bool]:
+        """
+        从 name 出发沿一个方向做 k 跳 BFS，每一跳一次 neighbours 查询。
+
+        Args:
+            name (str): 起点任务
+            depth (int): 最大跳数
+            direction (str): "upstream" 或 "downstream"
+            max_visit (int): 最多访问的节点数，超出后停止扩展
+
+        Returns:
+            Tuple[Dict[str, int], List[Tuple[str, str]], bool]:
+                ({任务: 跳数}（不含起点）, 按发现顺序的 (post, pre) 关系列表, 是否因 max_visit 截断)
+        """
+        hops: Dict[str, int] = {}
+        edges: List[Tuple[str, str]] = []
+        frontier = [name]
+        for hop in range(1, depth + 1):
+            if not frontier:
+                break
+            found = await self.neighbours(frontier, direction)
+            next_frontier = []
+            for node in frontier:
+                for other in sorted(found.get(node, ())):
+                    if other != name and other not in hops:
+                        if len(hops) >= max_visit:
+                            return hops, edges, True
+                        hops[other] = hop
+                        next_frontier.append(other)
+                    edges.append((node, other) if direction == "upstream" else (other, node))
+            frontier = next_frontier
+        return hops, edges, False
+
+    def add_write_listener(self, listener: Callable[[List[Dict[str, str]]], None]) -> None:
+        self._write_listeners.append(listener)
+
+    def add_delete_listener(self, listener: Callable[[List[Dict[str, str]]], None]) -> None:
+        self._delete_listeners.append(listener)
+
+    def add_node_listener(self, listener: Callable[[List[str]], None]) -> None:
+        self._node_listeners.append(listener)
+
+    def _notify_nodes(self, names: List[str]) -> None:
+        self._notify(self._node_listeners, names)
+
+    def _notify_write(self, chunk: List[Dict[str, str]]) -> None:
+        self._notify(self._write_listeners, chunk)
+
+    def _notify_delete(self, chunk: List[Dict[str, str]]) -> None:
+        self._notify(self._delete_listeners, chunk)
+
+    @staticmethod
+    def _notify(listeners, chunk: List[Any]) -> None:
+        for listener in listeners:
+            try:
+                listener(chunk)
+            except Exception as e:
+                logger.error(f"写入监听器执行失败: {e}")
+
+    async def upsert_chunked(
+        self, relationships: List[Dict[str, str]], chunk_size: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        分块写入关系，单块失败不影响其余块。
+
+        Returns:
+            Dict[str, Any]: {"chunks": [每块行数/尝试次数/耗时/吞吐/错误], "failed_rows": [...]}
+        """
+        return await self._run_chunked(relationships, chunk_size, self._write_chunk, self._notify_write, "写入")
+
+    async def delete_chunked(
+        self, relationships: List[Dict[str, str]], chunk_size: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """分块删除关系，报告格式与 upsert_chunked 相同。"""
+        return await self._run_chunked(relationships, chunk_size, self._delete_chunk, self._notify_delete, "删除")
+
+    async def _run_chunked(self, relationships, chunk_size, run_chunk, notify, action) -> Dict[str, Any]:
+        chunk_size = chunk_size or self.chunk_size
+        chunks, failed = [], []
+        for offset in range(0, len(relationships), chunk_size):
+            chunk = relationships[offset:offset + chunk_size]
+            attempts: List[float] = []
+            begin = time.perf_counter()
+            try:
+                await run_chunk(chunk, attempts)
+                self.generation += 1
+                notify(chunk)
+                error = None
+            except Exception as e:
+                error = str(e)
+                failed.extend(
+                    {"row": offset + i, "rel": rel, "error": error}
+                    for i, rel in enumerate(chunk)
+                )
+                logger.error(f"第 {offset // chunk_size} 块{action}失败: {error}")
+            elapsed = time.perf_counter() - begin
+            chunks.append({
+                "index": offset // chunk_size,
+                "rows": len(chunk),
+                "attempts": len(attempts),
+                "seconds": round(elapsed, 4),
+                "rows_per_sec": round(len(chunk) / elapsed, 1) if elapsed > 0 else None,
+                "error": error,
+            })
+        return {"chunks": chunks, "failed_rows": failed}
+
+
+_backends: Dict[str, GraphBackend] = {}
+# 已从快照热启动过的项目：热启动只在进程内首次创建后端时进行，删除项目后重建的实例不会把数据加载回来
+_warm_started: Set[str] = set()
+
+
+def get_backend(project: Optional[str] = None) -> GraphBackend:
+    """
+    按配置创建（并缓存）项目对应的图谱后端；Neo4j 后端的各项目共用一个驱动与连接池。
+
+    Raises:
+        ValueError: logic_graph.backend 配置了未知的后端类型，或项目名不合法
+    """
+    project = resolve_project(project)
+    backend = _backends.get(project)
+    if backend is None:
+        kind = get_config("logic_graph.backend", "neo4j")
+        if kind == "neo4j":
+            from core.neo4j_backend import Neo4jClient
+
+            backend = Neo4jClient(project)
+        elif kind == "memory":
+            from core.memory_graph import MemoryGraphBackend
+            from core.snapshot import snapshot_path
+
+            backend = MemoryGraphBackend(project)
+            snapshot = snapshot_path(project)
+            if (
+                get_config("logic_graph.snapshot.warm_start", False)
+                and project not in _warm_started
+                and os.path.exists(snapshot)
+            ):
+                _warm_started.add(project)
+                stats = backend.load_snapshot(snapshot)
+                logger.info(f"已从快照 {snapshot} 热加载 {stats['nodes']} 个任务、{stats['edges']} 条依赖")
+        else:
+            raise ValueError(f"未知的图谱后端类型: {kind}，可选值: neo4j, memory")
+        _backends[project] = backend
+        logger.info(f"逻辑图谱后端: {backend.name}，项目: {project}")
+    return backend
+
+
+def discard_backend(project: Optional[str] = None) -> None:
+    """丢弃项目的后端实例；下次 get_backend 时重新创建，挂在旧实例上的缓存与索引随之失效。"""
+    _backends.pop(resolve_project(project), None)
@@ -0,0 +1,221 @@
+"""
+增量维护的图谱统计，供 resources://graph_stats 以 O(1) 读取
+
+- GraphStats.ensure_loaded: 首次使用时拉取全图建立计数
+- GraphStats.on_write / on_delete / on_nodes: 写入 / 删除 / 节点监听，按新增 / 删除的关系
+  与新建的任务更新计数
+- GraphStats.snapshot: 任务数、关系数、入度 / 出度直方图、根任务与叶任务、深度估计
+- get_graph_stats: 返回挂在项目图谱后端上的统计实例（每个项目一个）
+
+方向约定与 DependsOn 一致：任务的出度是它依赖的前置任务数，入度是依赖它的后置任务数。
+根任务没有前置任务（可以立即开始），叶任务没有后置任务（路线图的终点）。
+
+深度为最长依赖链的跳数。逐边精确维护需要把新层级沿下游传播，代价与受影响区域
+成正比，这里只保留每个任务的层级下界：新增关系只抬高 post 自身的层级，删除关系
+后估计值不再下调。因此写入后的估计值可能偏小（exact=False），删除后可能偏大；
+估计值过期超过 logic_graph.graph_stats.depth_refresh_seconds 时，读取统计会顺带
+全量重算一次。
+"""
+
+import asyncio
+import time
+from itertools import islice
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from core.graph_algorithms import topological_order
+from core.graph_backend import GraphBackend, get_backend
+from core.graph_diff import edge_digest
+from modules.YA_Common.utils.config import get_config
+
+
+def _bucket(degree: int) -> str:
+    # 0、1、2、3-4、5-8、9-16 ……，按 2 的幂分桶
+    if degree <= 2:
+        return str(degree)
+    upper = 1 << (degree - 1).bit_length()
+    return f"{upper // 2 + 1}-{upper}"
+
+
+def _bucket_key(label: str) -> int:
+    return int(label.split("-")[0])
+
+
+class GraphStats:
+    def __init__(self, backend: GraphBackend, sample_size: int = 20, depth_refresh_seconds: float = 300):
+        self.backend = backend
+        self.sample_size = sample_size
+        self.depth_refresh_seconds = depth_refresh_seconds
+        self._edges: Set[int] = set()
+        self._out: Dict[str, int] = {}
+        self._in: Dict[str, int] = {}
+        self._out_hist: Dict[str, int] = {}
+        self._in_hist: Dict[str, int] = {}
+        self._roots: Set[str] = set()
+        self._leaves: Set[str] = set()
+        self._level: Dict[str, int] = {}
+        self._depth = 0
+        self._depth_exact = True
+        self._depth_computed = 0.0
+        self._loaded = False
+        self._pending: Optional[List[Tuple[Callable[[list], None], list]]] = None
+        self._lock = asyncio.Lock()
+        backend.add_write_listener(self.on_write)
+        backend.add_delete_listener(self.on_delete)
+        backend.add_node_listener(self.on_nodes)
+
+    async def ensure_loaded(self, reload: bool = False) -> None:
+        if self._loaded and not reload:
+            return
+        async with self._lock:
+            if self._loaded and not reload:
+                return
+            self._pending = []
+            try:
+                edges = await self.backend.fetch_edges()
+            finally:
+                pending, self._pending = self._pending, None
+            self._build(edges)
+            self._loaded = True
+            for listener, chunk in pending:
+                listener(chunk)
+
+    def _build(self, edges: Dict[str, List[str]]) -> None:
+        self._edges, self._out, self._in, self._level = set(), {}, {}, {}
+        self._out_hist, self._in_hist = {}, {}
+        self._roots, self._leaves = set(), set()
+        for post, pres in edges.items():
+            self._add_node(post)
+            for pre in pres:
+                self._add_node(pre)
+                self._edges.add(edge_digest(pre, post))
+                self._shift(self._out, self._out_hist, self._roots, post, 1)
+                self._shift(self._in, self._in_hist, self._leaves, pre, 1)
+        # 层级：最长前置链的跳数，按拓扑序一次算出；环上的任务没有拓扑序，层级记为 0
+        order, _ = topological_order(edges)
+        level = dict.fromkeys(self._out, 0)
+        for name in order:
+            for pre in edges.get(name, ()):
+                level[name] = max(level[name], level[pre] + 1)
+        self._level = level
+        self._depth = max(level.values(), default=0)
+        self._depth_exact = True
+        self._depth_computed = time.monotonic()
+
+    def _add_node(self, name: str) -> None:
+        if name in self._out:
+            return
+        self._out[name] = self._in[name] = 0
+        self._out_hist["0"] = self._out_hist.get("0", 0) + 1
+        self._in_hist["0"] = self._in_hist.get("0", 0) + 1
+        self._roots.add(name)
+        self._leaves.add(name)
+        self._level.setdefault(name, 0)
+
+    @staticmethod
+    def _shift(degrees: Dict[str, int], hist: Dict[str, int], zero: Set[str], name: str, delta: int) -> None:
+        # 度数变化时把任务从旧桶移到新桶，并维护度数为 0 的任务集合（根 / 叶）
+        old = degrees[name]
+        new = degrees[name] = old + delta
+        old_bucket, new_bucket = _bucket(old), _bucket(new)
+        if old_bucket != new_bucket:
+            hist[old_bucket] -= 1
+            if not hist[old_bucket]:
+                del hist[old_bucket]
+            hist[new_bucket] = hist.get(new_bucket, 0) + 1
+        if new == 0:
+            zero.add(name)
+        elif old == 0:
+            zero.discard(name)
+
+    def on_write(self, chunk: List[Dict[str, str]]) -> None:
+        if self._pending is not None:
+            self._pending.append((self.on_write, chunk))
+            return
+        if not self._loaded:
+            return
+        for rel in chunk:
+            pre, post = rel["pre"], rel["post"]
+            key = edge_digest(pre, post)
+            if key in self._edges:
+                continue
+            self._edges.add(key)
+            self._add_node(pre)
+            self._add_node(post)
+            self._shift(self._out, self._out_hist, self._roots, post, 1)
+            self._shift(self._in, self._in_hist, self._leaves, pre, 1)
+            level = self._level[pre] + 1
+            if level > self._level[post]:
+                self._level[post] = level
+                if level > self._depth:
+                    self._depth = level
+                # post 的下游没有随之抬高，最长链可能比记录的更长
+                if self._in[post]:
+                    self._depth_exact = False
+
+    def on_delete(self, chunk: List[Dict[str, str]]) -> None:
+        if self._pending is not None:
+            self._pending.append((self.on_delete, chunk))
+            return
+        if not self._loaded:
+            return
+        for rel in chunk:
+            pre, post = rel["pre"], rel["post"]
+            key = edge_digest(pre, post)
+            if key not in self._edges:
+                continue
+            self._edges.discard(key)
+            self._shift(self._out, self._out_hist, self._roots, post, -1)
+            self._shift(self._in, self._in_hist, self._leaves, pre, -1)
+            self._depth_exact = False
+
+    def on_nodes(self, names: List[str]) -> None:
+        # 通过 task_properties 创建、没有任何关系的孤立任务只经过节点监听
+        if self._pending is not None:
+            self._pending.append((self.on_nodes, names))
+            return
+        if not self._loaded:
+            return
+        for name in names:
+            self._add_node(name)
+
+    async def snapshot(self) -> Dict[str, Any]:
+        await self.ensure_loaded()
+        if not self._depth_exact and time.monotonic() - self._depth_computed > self.depth_refresh_seconds:
+            await self.ensure_loaded(reload=True)
+
+        def sample(names: Set[str]) -> List[str]:
+            return sorted(islice(names, self.sample_size))
+
+        def histogram(hist: Dict[str, int]) -> Dict[str, int]:
+            return {label: hist[label] for label in sorted(hist, key=_bucket_key)}
+
+        return {
+            "project": self.backend.project,
+            "graph_generation": self.backend.generation,
+            "tasks": len(self._out),
+            "dependencies": len(self._edges),
+            "out_degree_histogram": histogram(self._out_hist),
+            "in_degree_histogram": histogram(self._in_hist),
+            "roots": {"count": len(self._roots), "sample": sample(self._roots)},
+            "leaves": {"count": len(self._leaves), "sample": sample(self._leaves)},
+            "max_depth": {
+                "estimate": self._depth,
+                "exact": self._depth_exact,
+                "computed_seconds_ago": round(time.monotonic() - self._depth_computed, 1),
+            },
+        }
+
+
+_stats: Dict[str, GraphStats] = {}
+
+
+def get_graph_stats(project: Optional[str] = None) -> GraphStats:
+    backend = get_backend(project)
+    instance = _stats.get(backend.project)
+    if instance is None or instance.backend is not backend:
+        instance = _stats[backend.project] = GraphStats(
+            backend,
+            sample_size=get_config("logic_graph.graph_stats.sample_size", 20),
+            depth_refresh_seconds=get_config("logic_graph.graph_stats.depth_refresh_seconds", 300),
+        )
+    return instance
@@ -0,0 +1,358 @@
+"""
+进程内邻接表图谱引擎
+
+适用于几千到几十万任务的小型部署与无数据库测试，语义与 Neo4j 后端一致：
+- MemoryGraphBackend._write_chunk: MERGE 语义的幂等写入（节点与关系均去重）
+- MemoryGraphBackend._delete_chunk: 删除关系（保留任务节点）
+- MemoryGraphBackend.check_path: 双向 BFS 最短路径，跳数上限可配置（对应 DependsOn*1..N），带访问节点预算
+- MemoryGraphBackend.check_paths: 批量路径校验，同一起点的多个终点共用一次 BFS
+- MemoryGraphBackend.k_paths: Yen 算法求前 k 条最短链条，带时间预算
+- MemoryGraphBackend.get_context / neighbours: 直接上下游查询（单个 / 一批任务）
+- MemoryGraphBackend.neighbour_page: 按名称分页读取直接上下游
+- MemoryGraphBackend.fetch_edges: 全图或种子节点可达子图的邻接表
+- MemoryGraphBackend.search_tasks: 任务名与描述的全文检索（逐个任务打分的 BM25，对应 Neo4j 的全文索引）
+- MemoryGraphBackend.set_task_properties / fetch_task_properties: 任务属性读写
+- MemoryGraphBackend.load_snapshot: 从二进制快照热启动（替换当前全部数据）
+- MemoryGraphBackend.drop_project: 清空本项目
+
+每个项目一个独立实例，项目之间天然隔离。
+"""
+
+import heapq
+import math
+import re
+import time
+import unicodedata
+from collections import Counter
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from core.graph_backend import DEFAULT_MAX_DEPTH, DEFAULT_PROJECT, GraphBackend, PathSearchBudgetExceeded
+from modules.YA_Common.utils.config import get_config
+from core.snapshot import read_snapshot
+
+# 与 Lucene CJKAnalyzer 一致的切词：连续的汉字 / 假名 / 谚文切成重叠的二字组，其余按单词切分
+_CJK_RUN = re.compile(r"[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af\uf900-\ufaff]+")
+_WORD = re.compile(r"[^\W\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af\uf900-\ufaff]+")
+
+
+def _analyze(text: str) -> List[str]:
+    text = unicodedata.normalize("NFKC", text).lower()
+    terms = _WORD.findall(text)
+    for run in _CJK_RUN.findall(text):
+        terms.extend([run] if len(run) == 1 else (run[i:i + 2] for i in range(len(run) - 1)))
+    return terms
+
+
+class MemoryGraphBackend(GraphBackend):
+    name = "memory"
+
+    def __init__(self, project: str = DEFAULT_PROJECT):
+        super().__init__(project)
+        # post -> {pre}：沿 DependsOn 方向的出边
+        self._depends_on: Dict[str, Set[str]] = {}
+        # pre -> {post}：反向索引，用于查询下游
+        self._dependents: Dict[str, Set[str]] = {}
+        # name -> 节点属性（如 duration）
+        self._properties: Dict[str, Dict[str, Any]] = {}
+        # 单次路径搜索最多访问的节点数，防止不限跳数时在稠密图上失控
+        self.visit_budget = get_config("logic_graph.path_search.visit_budget", 1000000)
+
+    def load_snapshot(self, path: str) -> Dict[str, int]:
+        """
+        用快照替换当前数据，用于启动时热加载；不通知写入监听，应在索引加载前调用。
+        """
+        snapshot = read_snapshot(path)
+        names, indptr, indices = snapshot.names, snapshot.indptr, snapshot.indices
+        self._depends_on = {
+            name: {names[j] for j in indices[indptr[i]:indptr[i + 1]]}
+            for i, name in enumerate(names)
+        }
+        self._dependents = {name: set() for name in names}
+        for post, pres in self._depends_on.items():
+            for pre in pres:
+                self._dependents[pre].add(post)
+        self._properties = snapshot.properties
+        self.generation += 1
+        return {"nodes": len(names), "edges": snapshot.edge_count}
+
+    def _merge_node(self, name: str) -> None:
+        if name not in self._depends_on:
+            self._depends_on[name] = set()
+            self._dependents[name] = set()
+
+    async def _write_chunk(self, chunk, attempts):
+        attempts.append(0.0)
+        for rel in chunk:
+            self._merge_node(rel["pre"])
+            self._merge_node(rel["post"])
+            self._depends_on[rel["post"]].add(rel["pre"])
+            self._dependents[rel["pre"]].add(rel["post"])
+
+    async def _delete_chunk(self, chunk, attempts):
+        attempts.append(0.0)
+        for rel in chunk:
+            if rel["post"] in self._depends_on and rel["pre"] in self._dependents:
+                self._depends_on[rel["post"]].discard(rel["pre"])
+                self._dependents[rel["pre"]].discard(rel["post"])
+
+    def _bfs_paths(
+        self, start: str, targets: Set[str], max_depth: Optional[int], budget: int
+    ) -> Dict[str, List[str]]:
+        """从 start 出发做一次有界层序 BFS，返回到达 targets 中各节点的最短路径。"""
+        # 第 k 层即 k 跳；target 等于 start 时找的是经过自身的环
+        found: Dict[str, List[str]] = {}
+        parent: Dict[str, str] = {}
+        frontier = [start]
+        hops = 0
+        while frontier and (max_depth is None or hops < max_depth):
+            hops += 1
+            next_frontier = []
+            for node in frontier:
+                for pre in self._depends_on[node]:
+                    if pre in targets and pre not in found:
+                        found[pre] = self._unwind(parent, start, node) + [pre]
+                        if len(found) == len(targets):
+                            return found
+                    if pre in parent or pre == start:
+                        continue
+                    parent[pre] = node
+                    next_frontier.append(pre)
+            if len(parent) > budget:
+                raise PathSearchBudgetExceeded(f"从 {start} 出发的路径搜索访问了超过 {budget} 个任务")
+            frontier = next_frontier
+        return found
+
+    def _bidirectional_path(
+        self, start: str, end: str, max_depth: Optional[int], budget: int
+    ) -> Optional[List[str]]:
+        """
+        双向 BFS：从 start 沿 DependsOn、从 end 沿反向索引交替扩展较小的一侧，
+        两侧各走约一半跳数，访问量约为单向 BFS 的平方根量级。
+        """
+        if start == end:
+            return self._bfs_paths(start, {end}, max_depth, budget).get(end)
+        forward: Dict[str, Optional[str]] = {start: None}
+        backward: Dict[str, Optional[str]] = {end: None}
+        forward_dist, backward_dist = {start: 0}, {end: 0}
+        forward_frontier, backward_frontier = [start], [end]
+        forward_hops = backward_hops = 0
+        while forward_frontier and backward_frontier and (
+            max_depth is None or forward_hops + backward_hops < max_depth
+        ):
+            # 扩展完整一层后，在该层所有相遇点中取总跳数最小者即为最短路径
+            if len(forward_frontier) <= len(backward_frontier):
+                index, parents, dist, other = self._depends_on, forward, forward_dist, backward_dist
+                frontier, forward_hops = forward_frontier, forward_hops + 1
+            else:
+                index, parents, dist, other = self._dependents, backward, backward_dist, forward_dist
+                frontier, backward_hops = backward_frontier, backward_hops + 1
+            next_frontier, meet = [], None
+            for node in frontier:
+                for nxt in index[node]:
+                    if nxt in parents:
+                        continue
+                    parents[nxt] = node
+                    dist[nxt] = dist[node] + 1
+                    next_frontier.append(nxt)
+                    if nxt in other and (meet is None or dist[nxt] + other[nxt] < dist[meet] + other[meet]):
+                        meet = nxt
+            if meet is not None:
+                path = [meet]
+                while forward[path[-1]] is not None:
+                    path.append(forward[path[-1]])
+                path.reverse()
+                while backward[path[-1]] is not None:
+                    path.append(backward[path[-1]])
+                return path
+            if len(forward) + len(backward) > budget:
+                raise PathSearchBudgetExceeded(f"{start} -> {end} 的路径搜索访问了超过 {budget} 个任务")
+            if parents is forward:
+                forward_frontier = next_frontier
+            else:
+                backward_frontier = next_frontier
+        return None
+
+    def _spur_path(
+        self,
+        source: str,
+        target: str,
+        blocked: Set[str],
+        removed: Set[Tuple[str, str]],
+        max_hops: Optional[int],
+    ) -> Optional[List[str]]:
+        """避开 blocked 节点与 removed 边的最短路径，供 Yen 算法求偏离路径。"""
+        parent: Dict[str, str] = {}
+        frontier = [source]
+        hops = 0
+        while frontier and (max_hops is None or hops < max_hops):
+            hops += 1
+            next_frontier = []
+            for node in frontier:
+                for pre in self._depends_on[node]:
+                    if (node, pre) in removed:
+                        continue
+                    if pre == target:
+                        return self._unwind(parent, source, node) + [pre]
+                    if pre in parent or pre in blocked or pre == source:
+                        continue
+                    parent[pre] = node
+                    next_frontier.append(pre)
+            frontier = next_frontier
+        return None
+
+    async def k_paths(self, start, end, k, time_budget, max_depth=DEFAULT_MAX_DEPTH):
+        # Yen 算法：第 i 条链条由前面某条链条的前缀（root）加一段避开已用分叉边的偏离路径组成
+        if start not in self._depends_on or end not in self._depends_on:
+            return [], False
+        first = self._spur_path(start, end, set(), set(), max_depth)
+        if first is None:
+            return [], False
+        deadline = time.monotonic() + time_budget
+        paths, candidates, seen = [first], [], {tuple(first)}
+        while len(paths) < k:
+            last = paths[-1]
+            for i in range(len(last) - 1):
+                if time.monotonic() > deadline:
+                    return paths, True
+                root = last[:i + 1]
+                removed = {(p[i], p[i + 1]) for p in paths if len(p) > i + 1 and p[:i + 1] == root}
+                remaining = None if max_depth is None else max_depth - i
+                spur = self._spur_path(last[i], end, set(root[:-1]), removed, remaining)
+                if spur is not None:
+                    candidate = tuple(root[:-1] + spur)
+                    if candidate not in seen:
+                        seen.add(candidate)
+                        heapq.heappush(candidates, (len(candidate), candidate))
+            if not candidates:
+                break
+            paths.append(list(heapq.heappop(candidates)[1]))
+        return paths, False
+
+    async def check_path(self, start, end, max_depth=DEFAULT_MAX_DEPTH):
+        if start not in self._depends_on or end not in self._depends_on:
+            return None
+        return self._bidirectional_path(start, end, max_depth, self.visit_budget)
+
+    async def check_paths(self, pairs, max_depth=DEFAULT_MAX_DEPTH):
+        # 按起点分组：同一起点的多个终点共用一次单向 BFS，只有一个终点时走双向 BFS
+        targets_by_start: Dict[str, Set[str]] = {}
+        for start, end in pairs:
+            if start in self._depends_on and end in self._depends_on:
+                targets_by_start.setdefault(start, set()).add(end)
+        found = {}
+        for start, targets in targets_by_start.items():
+            if len(targets) == 1:
+                (end,) = targets
+                path = self._bidirectional_path(start, end, max_depth, self.visit_budget)
+                found[start] = {end: path} if path else {}
+            else:
+                found[start] = self._bfs_paths(start, targets, max_depth, self.visit_budget)
+        return [found.get(start, {}).get(end) for start, end in pairs]
+
+    @staticmethod
+    def _unwind(parent: Dict[str, str], start: str, end: str) -> List[str]:
+        path = [end]
+        while path[-1] != start:
+            path.append(parent[path[-1]])
+        path.reverse()
+        return path
+
+    async def get_context(self, name: str) -> Tuple[List[str], List[str]]:
+        if name not in self._depends_on:
+            return [], []
+        return list(self._depends_on[name]), list(self._dependents[name])
+
+    async def neighbours(self, names: List[str], direction: str) -> Dict[str, List[str]]:
+        index = self._depends_on if direction == "upstream" else self._dependents
+        return {name: list(index[name]) for name in names if name in index}
+
+    async def neighbour_page(self, name, direction, after, limit):
+        index = self._depends_on if direction == "upstream" else self._dependents
+        others = index.get(name, ())
+        # 只保留最小的 limit 个，不为一页结果排序整个邻居集合
+        return heapq.nsmallest(limit, (o for o in others if after is None or o > after))
+
+    async def fetch_edges(self, seeds: Optional[List[str]] = None) -> Dict[str, List[str]]:
+        if seeds is None:
+            return {name: list(pres) for name, pres in self._depends_on.items()}
+        edges: Dict[str, List[str]] = {}
+        stack = [name for name in seeds if name in self._depends_on]
+        while stack:
+            node = stack.pop()
+            if node in edges:
+                continue
+            edges[node] = list(self._depends_on[node])
+            stack.extend(pre for pre in edges[node] if pre not in edges)
+        return edges
+
+    async def fetch_task_names(self) -> List[str]:
+        return list(self._depends_on)
+
+    async def search_tasks(self, query: str, offset: int, limit: int) -> List[Dict[str, Any]]:
+        terms = set(_analyze(query))
+        if not terms:
+            return []
+        # 先用子串预筛出可能命中的任务，只对这些任务切词打分；
+        # 文档频率与平均长度也只在候选上统计，得分是 BM25 的近似
+        docs = []
+        for name in self._depends_on:
+            description = self._properties.get(name, {}).get("description") or ""
+            text = unicodedata.normalize("NFKC", f"{name}\n{description}").lower()
+            if any(term in text for term in terms):
+                docs.append((name, description, Counter(_analyze(name)), Counter(_analyze(description))))
+        if not docs:
+            return []
+        k1, b = 1.2, 0.75
+        total = len(self._depends_on)
+        df = {term: sum(1 for doc in docs if term in doc[2] or term in doc[3]) for term in terms}
+        idf = {term: math.log(1 + (total - n + 0.5) / (n + 0.5)) for term, n in df.items()}
+        avg_len = [max(sum(sum(doc[i].values()) for doc in docs) / len(docs), 1) for i in (2, 3)]
+        scored = []
+        for name, description, *fields in docs:
+            score = 0.0
+            for tf, avg in zip(fields, avg_len):
+                length = sum(tf.values())
+                for term in terms:
+                    if tf[term]:
+                        score += idf[term] * tf[term] * (k1 + 1) / (tf[term] + k1 * (1 - b + b * length / avg))
+            if score > 0:
+                scored.append((-score, name, description))
+        scored.sort()
+        return [
+            {"name": name, "description": description or None, "score": -score}
+            for score, name, description in scored[offset:offset + limit]
+        ]
+
+    async def set_task_properties(self, properties: Dict[str, Dict[str, Any]]) -> None:
+        for name, props in properties.items():
+            self._merge_node(name)
+            self._properties.setdefault(name, {}).update(props)
+        self._notify_nodes(list(properties))
+
+    async def fetch_task_properties(self, names: List[str], keys: List[str]) -> Dict[str, Dict[str, Any]]:
+        result = {}
+        for name in names:
+            if name in self._depends_on:
+                props = self._properties.get(name, {})
+                result[name] = {key: props[key] for key in keys if key in props}
+        return result
+
+    async def drop_project(self):
+        dropped = len(self._depends_on)
+        self._depends_on, self._dependents, self._properties = {}, {}, {}
+        self.generation += 1
+        return dropped
+
+    async def describe_schema(self) -> Dict[str, Any]:
+        return {
+            "backend": self.name,
+            "project": self.project,
+            "indexes": [
+                {"name": "task_project_name_lookup", "type": "HASH", "labelsOrTypes": ["Task"], "properties": ["project", "name"]},
+            ],
+            "constraints": [
+                {"name": "task_project_name_unique", "type": "UNIQUENESS", "labelsOrTypes": ["Task"], "properties": ["project", "name"]},
+            ],
+            "node_count": len(self._depends_on),
+            "relationship_count": sum(len(pres) for pres in self._depends_on.values()),
+        }
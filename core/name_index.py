@@ -0,0 +1,141 @@
+"""
+任务名模糊查找索引（字符 bigram 倒排）
+
+模型传入的任务名与库中略有出入时，精确匹配会静默落空。NameIndex 在进程内为项目的
+全部任务名建立 bigram 倒排表，查不到时给出按相似度排序的候选：
+- NameIndex.ensure_loaded: 首次使用时从后端拉取全部任务名
+- NameIndex.on_write / on_nodes: 写入监听与节点监听，增量加入新任务名
+- NameIndex.contains: 任务名是否存在
+- NameIndex.suggest: 返回至多 k 个相似任务名及得分（bigram Dice 系数）
+- get_name_index: 按 logic_graph.name_index 返回项目独立的索引；未启用时返回 None
+
+中文任务名通常只有几个字，trigram 太稀疏，这里用首尾加边界符的 bigram。查询时先按
+倒排表长度从短到长扫描稀有 gram 的倒排项（累计不超过 max_candidates 项）并计数，
+只对命中最多的少数任务计算完整得分；高频 gram（如“开发”“测试”）只参与打分，
+查询代价与任务总数无关，不会退化成全表扫描。代价是：查询名的每个 gram 都极其常见
+（例如大量任务只靠编号区分）时，候选只来自扫描到的那部分倒排项，结果是近似的。
+只通过 task_properties 创建、没有任何关系的孤立任务由节点监听（set_task_properties）计入。
+"""
+
+import asyncio
+import heapq
+from array import array
+from collections import Counter
+from typing import Dict, List, Optional, Set
+
+from core.graph_backend import GraphBackend, get_backend
+from modules.YA_Common.utils.config import get_config
+
+
+def _grams(name: str) -> Set[str]:
+    padded = f"\x02{name}\x03"
+    return {padded[i:i + 2] for i in range(len(padded) - 1)}
+
+
+class NameIndex:
+    def __init__(self, backend: GraphBackend, max_candidates: int = 5000, min_score: float = 0.3):
+        self.backend = backend
+        self.max_candidates = max_candidates
+        self.min_score = min_score
+        self._ids: Dict[str, int] = {}
+        self._names: List[str] = []
+        # gram -> 任务编号（array('I') 比 list[int] 省约 7 倍内存）
+        self._postings: Dict[str, array] = {}
+        self._loaded = False
+        self._pending: Optional[List[str]] = None
+        self._lock = asyncio.Lock()
+        backend.add_write_listener(self.on_write)
+        backend.add_node_listener(self.on_nodes)
+
+    async def ensure_loaded(self) -> None:
+        if self._loaded:
+            return
+        async with self._lock:
+            if self._loaded:
+                return
+            self._pending = []
+            try:
+                names = await self.backend.fetch_task_names()
+            finally:
+                pending, self._pending = self._pending, None
+            self.add(names)
+            self.add(pending)
+            self._loaded = True
+
+    def add(self, names) -> None:
+        for name in names:
+            if name in self._ids:
+                continue
+            task_id = self._ids[name] = len(self._names)
+            self._names.append(name)
+            for gram in _grams(name):
+                posting = self._postings.get(gram)
+                if posting is None:
+                    posting = self._postings[gram] = array("I")
+                posting.append(task_id)
+
+    def on_write(self, chunk) -> None:
+        self.on_nodes([name for rel in chunk for name in (rel["pre"], rel["post"])])
+
+    def on_nodes(self, names: List[str]) -> None:
+        if self._pending is not None:
+            self._pending.extend(names)
+        elif self._loaded:
+            self.add(names)
+
+    def contains(self, name: str) -> bool:
+        return name in self._ids
+
+    def suggest(self, name: str, k: int = 10) -> List[Dict[str, object]]:
+        """
+        返回与 name 最相似的至多 k 个任务名（不含 name 自身），得分低于 min_score 的不返回。
+
+        Returns:
+            List[Dict[str, object]]: [{"name": 任务名, "score": 0~1}]，按得分从高到低
+        """
+        query = _grams(name)
+        postings = sorted(
+            (self._postings[gram] for gram in query if gram in self._postings), key=len
+        )
+        # 从最稀有的 gram 开始累计命中次数，扫描的倒排项总数不超过 max_candidates；
+        # 命中越多的任务越可能相似，只对命中最多的一小批计算完整得分
+        hits: Counter = Counter()
+        budget = self.max_candidates
+        for posting in postings:
+            if hits and len(posting) > budget:
+                break
+            hits.update(posting[:budget])
+            budget -= min(len(posting), budget)
+        scored = []
+        for task_id, _ in hits.most_common(max(4 * k, 32)):
+            other = self._names[task_id]
+            if other == name:
+                continue
+            grams = _grams(other)
+            score = 2 * len(query & grams) / (len(query) + len(grams))
+            if score >= self.min_score:
+                scored.append((score, -abs(len(other) - len(name)), other))
+        return [
+            {"name": other, "score": round(score, 3)}
+            for score, _, other in heapq.nlargest(k, scored)
+        ]
+
+    def stats(self) -> Dict[str, object]:
+        return {"loaded": self._loaded, "names": len(self._names), "grams": len(self._postings)}
+
+
+_indexes: Dict[str, NameIndex] = {}
+
+
+def get_name_index(project: Optional[str] = None) -> Optional[NameIndex]:
+    if not get_config("logic_graph.name_index.enabled", True):
+        return None
+    backend = get_backend(project)
+    index = _indexes.get(backend.project)
+    if index is None or index.backend is not backend:
+        index = _indexes[backend.project] = NameIndex(
+            backend,
+            max_candidates=get_config("logic_graph.name_index.max_candidates", 5000),
+            min_score=get_config("logic_graph.name_index.min_score", 0.3),
+        )
+    return index
@@ -0,0 +1,86 @@
+"""
+任务名规范化与驻留
+
+同一个任务常以不同写法出现（全角 / 半角、多余空格、约定俗成的简称），直接 MERGE
+会产生重复节点并让路径校验误判为不通。写入与查询前统一经过：
+- Unicode NFKC 规范化（全角字母数字与空格转为半角、兼容字符统一）
+- 空白折叠：去掉首尾空白，连续空白合并为一个空格，汉字之间的空白直接去掉
+- 别名表：logic_graph.names.aliases 中配置的 {别名: 规范名}
+
+- NameNormalizer.normalize: 返回规范名，结果经 sys.intern 驻留并缓存
+- get_name_normalizer: 按 logic_graph.names 返回全局实例
+"""
+
+import re
+import sys
+import unicodedata
+from typing import Any, Dict, Mapping, Optional
+
+from modules.YA_Common.utils.config import get_config
+
+_WHITESPACE = re.compile(r"\s+")
+_CJK = "\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff"
+_CJK_GAP = re.compile(rf"(?<=[{_CJK}]) (?=[{_CJK}])")
+
+
+def fold_name(name: str) -> str:
+    """NFKC 规范化并折叠空白，不查别名表。"""
+    name = _WHITESPACE.sub(" ", unicodedata.normalize("NFKC", name)).strip()
+    return _CJK_GAP.sub("", name)
+
+
+class NameNormalizer:
+    def __init__(
+        self,
+        aliases: Optional[Mapping[str, str]] = None,
+        enabled: bool = True,
+        intern_max_size: int = 100000,
+    ):
+        self.enabled = enabled
+        # 别名表的两侧同样先折叠，配置里写成全角或带空格也能命中
+        self.aliases: Dict[str, str] = {
+            fold_name(alias): fold_name(canonical) for alias, canonical in (aliases or {}).items()
+        }
+        self.intern_max_size = intern_max_size
+        # 原始名 -> 规范名；ingest 中同一任务名会反复出现，命中后不必重复规范化
+        self._interned: Dict[str, str] = {}
+
+    def normalize(self, name: str) -> str:
+        """
+        返回规范名；同一规范名在进程内只保留一个字符串对象。
+
+        Raises:
+            ValueError: 规范化后为空字符串
+        """
+        canonical = self._interned.get(name)
+        if canonical is not None:
+            return canonical
+        if self.enabled:
+            folded = fold_name(name)
+            canonical = self.aliases.get(folded, folded)
+        else:
+            canonical = name
+        if not canonical:
+            raise ValueError(f"任务名 {name!r} 规范化后为空")
+        canonical = sys.intern(canonical)
+        if len(self._interned) >= self.intern_max_size:
+            self._interned.clear()
+        self._interned[name] = canonical
+        return canonical
+
+    def stats(self) -> Dict[str, Any]:
+        return {"enabled": self.enabled, "aliases": len(self.aliases), "interned": len(self._interned)}
+
+
+_normalizer: Optional[NameNormalizer] = None
+
+
+def get_name_normalizer() -> NameNormalizer:
+    global _normalizer
+    if _normalizer is None:
+        _normalizer = NameNormalizer(
+            aliases=get_config("logic_graph.names.aliases", {}) or {},
+            enabled=get_config("logic_graph.names.normalize", True),
+            intern_max_size=get_config("logic_graph.names.intern_max_size", 100000),
+        )
+    return _normalizer
@@ -0,0 +1,710 @@
+"""
+Neo4j 图谱后端
+
+基于 AsyncGraphDatabase 的异步驱动实现 GraphBackend：
+- Neo4jConnection.get_driver: 懒加载驱动，首次连接时执行 schema 迁移与连接池预热
+- Neo4jConnection.pool_stats: 连接池配置、会话并发与取连接等待时间统计
+- Neo4jConnection.execute: 所有查询的统一入口，记录墙钟时间、数据库侧耗时、行数与参数大小
+- Neo4jConnection.ensure_schema: 幂等补齐约束 / 索引并记录 schema 版本
+- Neo4jConnection.describe_schema: 列出当前的索引、约束与 schema 版本
+- get_connection: 所有项目共用的连接（一个驱动、一个连接池）
+- Neo4jClient: 单个项目的 GraphBackend，所有查询都限定在 (project, name) 复合键内
+- Neo4jClient.check_path / check_paths: 单对 / 批量（一次 UNWIND）最短依赖路径
+- Neo4jClient.k_paths: allShortestPaths 取至多 k 条最短链条，以事务超时作为时间预算
+- Neo4jClient.get_context / neighbours: 直接上下游查询（单个 / 一批任务）
+- Neo4jClient.neighbour_page: 按名称 keyset 分页逐条读取直接上下游
+- Neo4jClient.fetch_edges: 拉取全图或种子节点可达子图的邻接表
+- Neo4jClient.search_tasks: 基于全文索引（task_fulltext）检索任务名与描述
+- Neo4jClient.set_task_properties / fetch_task_properties: 任务属性（如工期、描述）读写
+- Neo4jClient._delete_chunk: 按块删除 DependsOn 关系
+- Neo4jClient.drop_project: 分批删除本项目的全部任务
+"""
+
+import os
+import json
+import time
+import asyncio
+import logging
+import re
+from collections import deque
+
+from neo4j import AsyncGraphDatabase
+from neo4j.exceptions import ClientError
+
+from core.graph_backend import DEFAULT_MAX_DEPTH, DEFAULT_PROJECT, TASK_PROPERTIES, GraphBackend
+from core.names import get_name_normalizer
+from core.query_stats import get_query_stats
+from modules.YA_Common.utils.config import get_config
+
+logger = logging.getLogger("LogicGuardian")
+
+
+async def _merge_task_tx(tx, project, old, new):
+    # 把旧任务的属性、前置与后置依赖并入规范名任务后删除旧任务；
+    # 新旧两个写法之间的依赖会变成自环，直接丢弃，旧任务原有的自环保留
+    props = ", ".join(f"new.{key} = coalesce(new.{key}, old.{key})" for key in TASK_PROPERTIES)
+    statements = [
+        f"""
+        MATCH (old:Task {{project: $project, name: $old}})
+        MERGE (new:Task {{project: $project, name: $new}})
+        SET {props}
+        """,
+        """
+        MATCH (old:Task {project: $project, name: $old})-[:DependsOn]->(pre)
+        MATCH (new:Task {project: $project, name: $new})
+        WHERE pre <> new
+        WITH new, CASE WHEN pre = old THEN new ELSE pre END AS target
+        MERGE (new)-[:DependsOn]->(target)
+        """,
+        """
+        MATCH (post)-[:DependsOn]->(old:Task {project: $project, name: $old})
+        MATCH (new:Task {project: $project, name: $new})
+        WHERE post <> old AND post <> new
+        MERGE (post)-[:DependsOn]->(new)
+        """,
+        "MATCH (old:Task {project: $project, name: $old}) DETACH DELETE old",
+    ]
+    for statement in statements:
+        await (await tx.run(statement, project=project, old=old, new=new)).consume()
+
+
+async def _merge_legacy_names(session):
+    """
+    规范化引入之前写入的任务名在规范化之后查不到，新写入还会另建一个节点。
+    逐个把规范化结果与原名不同的任务并入规范名任务，每个任务一个写事务；
+    中途失败时版本号不会记录，下次启动会继续处理剩下的任务。
+    """
+    normalizer = get_name_normalizer()
+    result = await session.run("MATCH (t:Task) RETURN t.project AS project, t.name AS name")
+    renames = []
+    async for record in result:
+        try:
+            canonical = normalizer.normalize(record["name"])
+        except ValueError:
+            # 规范化后为空的任务名无法合并，保持原样
+            continue
+        if canonical != record["name"]:
+            renames.append((record["project"], record["name"], canonical))
+    for project, old, new in renames:
+        await session.execute_write(_merge_task_tx, project, old, new)
+    if renames:
+        logger.info(f"已将 {len(renames)} 个旧任务名并入规范名任务")
+
+
+# 每次修改 SCHEMA_MIGRATIONS 时递增；库中记录的版本低于此值时会补齐缺失的迁移。
+# 迁移步骤可以是 Cypher 语句，也可以是接收 session 的协程函数
+SCHEMA_VERSION = 3
+SCHEMA_MIGRATIONS = {
+    1: [
+        "CREATE CONSTRAINT task_name_unique IF NOT EXISTS FOR (t:Task) REQUIRE t.name IS UNIQUE",
+    ],
+    # 引入项目命名空间：已有任务归入默认项目，唯一键改为 (project, name)，约束自带复合索引
+    2: [
+        "MATCH (t:Task) WHERE t.project IS NULL "
+        f"CALL {{ WITH t SET t.project = '{DEFAULT_PROJECT}' }} IN TRANSACTIONS OF 10000 ROWS",
+        "DROP CONSTRAINT task_name_unique IF EXISTS",
+        "CREATE CONSTRAINT task_project_name_unique IF NOT EXISTS "
+        "FOR (t:Task) REQUIRE (t.project, t.name) IS UNIQUE",
+    ],
+    # 引入任务名规范化：按当前的规范化规则与别名表合并旧写法的任务
+    3: [_merge_legacy_names],
+}
+
+# 全文索引不属于版本化的 schema：由 logic_graph.search.fulltext_index 控制，每次启动时幂等创建
+FULLTEXT_INDEX = "task_fulltext"
+_LUCENE_SPECIAL = re.compile(r'([+\-&|!(){}\[\]^"~*?:\\/])')
+
+
+def _lucene_query(text):
+    # 用户输入按普通词检索：转义 Lucene 语法字符，小写后 AND / OR / NOT 不再被当作运算符
+    return _LUCENE_SPECIAL.sub(r"\\\1", text.lower())
+
+class _CountingResult:
+    """转发 AsyncResult 的读取方法并统计读到的记录数。"""
+
+    def __init__(self, result):
+        self._result = result
+        self.rows = 0
+
+    async def _records(self):
+        async for record in self._result:
+            self.rows += 1
+            yield record
+
+    def __aiter__(self):
+        return self._records()
+
+    async def single(self):
+        record = await self._result.single()
+        self.rows += record is not None
+        return record
+
+    async def data(self):
+        rows = await self._result.data()
+        self.rows += len(rows)
+        return rows
+
+    async def consume(self):
+        return await self._result.consume()
+
+
+class _TimedTx:
+    """包装事务：记录参数大小，事务函数返回后读取各结果的数据库侧耗时。"""
+
+    def __init__(self, tx):
+        self._tx = tx
+        self._results = []
+        self.param_bytes = 0
+        self.rows = 0
+        self.available_after_ms = None
+        self.consumed_after_ms = None
+
+    async def run(self, query, parameters=None, **kwargs):
+        params = {**(parameters or {}), **kwargs}
+        self.param_bytes += len(json.dumps(params, ensure_ascii=False, default=str).encode("utf-8"))
+        if parameters is None:
+            result = await self._tx.run(query, **kwargs)
+        else:
+            result = await self._tx.run(query, parameters, **kwargs)
+        result = _CountingResult(result)
+        self._results.append(result)
+        return result
+
+    async def collect_summaries(self):
+        for result in self._results:
+            self.rows += result.rows
+            summary = await result.consume()
+            if summary is None:
+                continue
+            for attr in ("available_after_ms", "consumed_after_ms"):
+                value = getattr(summary, f"result_{attr[:-3]}", None)
+                if value is not None:
+                    setattr(self, attr, (getattr(self, attr) or 0) + value)
+
+    def __getattr__(self, name):
+        return getattr(self._tx, name)
+
+
+class Neo4jConnection:
+    def __init__(self):
+        self.uri = get_config("neo4j.uri", "bolt://127.0.0.1:7687")
+        self.user = get_config("neo4j.user", "neo4j")
+        # 密码不写入 config.yaml；默认值需与 Neo4j Desktop 实例密码一致
+        self.password = os.getenv("NEO4J_PASSWORD", "12345678")
+        self.max_retry_time = get_config("neo4j.max_transaction_retry_time", 30)
+        self.pool_config = {
+            "max_connection_pool_size": get_config("neo4j.pool.max_size", 100),
+            "connection_acquisition_timeout": get_config("neo4j.pool.acquisition_timeout", 60),
+            "max_connection_lifetime": get_config("neo4j.pool.max_lifetime", 3600),
+        }
+        self.warmup_connections = get_config("neo4j.pool.warmup_connections", 0)
+        self._driver = None
+        self._lock = asyncio.Lock()
+        # 会话级统计：等待时间为请求会话到事务函数开始执行的耗时（含取连接与 BEGIN）
+        self._active_sessions = 0
+        self._peak_sessions = 0
+        self._session_total = 0
+        self._waits = deque(maxlen=1000)
+        self.query_stats = get_query_stats()
+
+    async def get_driver(self):
+        if self._driver is not None:
+            return self._driver
+        async with self._lock:
+            if self._driver is not None:
+                return self._driver
+            driver = AsyncGraphDatabase.driver(
+                self.uri,
+                auth=(self.user, self.password),
+                max_transaction_retry_time=self.max_retry_time,
+                **self.pool_config,
+            )
+            try:
+                await driver.verify_connectivity()
+                logger.info(f"成功连接至 Neo4j: {self.uri}")
+            except Exception as e:
+                await driver.close()
+                logger.error(f"无法连接 Neo4j ({self.uri}): {str(e)}")
+                raise e
+            try:
+                await self.ensure_schema(driver)
+            except Exception as e:
+                # 约束创建失败（例如库中已有重名 Task）不影响读写，只是退化为标签扫描
+                logger.error(f"Schema 初始化失败: {str(e)}")
+            if self.warmup_connections > 0:
+                await self._warm_up(driver, self.warmup_connections)
+            self._driver = driver
+        return self._driver
+
+    async def _warm_up(self, driver, count):
+        """并发占用 count 个会话各执行一次 RETURN 1，使连接池预先建立 count 条连接。"""
+        async def ping():
+            async with driver.session() as session:
+                await (await session.run("RETURN 1")).consume()
+
+        results = await asyncio.gather(*(ping() for _ in range(count)), return_exceptions=True)
+        failed = [r for r in results if isinstance(r, Exception)]
+        if failed:
+            logger.warning(f"连接池预热: {count - len(failed)}/{count} 成功，首个错误: {failed[0]}")
+        else:
+            logger.info(f"连接池预热完成: {count} 条连接")
+
+    async def execute(self, kind, fn, *args, timeout=None):
+        driver = await self.get_driver()
+        requested = time.perf_counter()
+        started = []
+        attempt = []
+
+        async def work(tx, *tx_args):
+            if not started:
+                started.append(time.perf_counter())
+                self._waits.append(started[0] - requested)
+            # 每次（重）试使用新的包装，只统计最终成功那次尝试的结果
+            timed = _TimedTx(tx)
+            attempt[:] = [timed]
+            value = await fn(timed, *tx_args)
+            await timed.collect_summaries()
+            return value
+
+        if timeout is not None:
+            # 等价于 neo4j.unit_of_work(timeout=...)：由服务端在超时后终止事务
+            work.timeout = timeout
+
+        self._active_sessions += 1
+        self._session_total += 1
+        self._peak_sessions = max(self._peak_sessions, self._active_sessions)
+        error = None
+        try:
+            async with driver.session() as session:
+                if kind == "read":
+                    return await session.execute_read(work, *args)
+                return await session.execute_write(work, *args)
+        except Exception as e:
+            error = str(e)
+            raise
+        finally:
+            self._active_sessions -= 1
+            timed = attempt[0] if attempt else None
+            self.query_stats.record_query(
+                fn.__name__.strip("_").removesuffix("_tx"),
+                (time.perf_counter() - requested) * 1000,
+                available_after_ms=timed.available_after_ms if timed else None,
+                consumed_after_ms=timed.consumed_after_ms if timed else None,
+                rows=timed.rows if timed else 0,
+                param_bytes=timed.param_bytes if timed else 0,
+                error=error,
+            )
+
+    def pool_stats(self):
+        waits = sorted(self._waits)
+        stats = {
+            "config": {**self.pool_config, "warmup_connections": self.warmup_connections},
+            "connected": self._driver is not None,
+            "active_sessions": self._active_sessions,
+            "peak_active_sessions": self._peak_sessions,
+            "sessions_total": self._session_total,
+            "acquire_wait_ms": {
+                "samples": len(waits),
+                "avg": round(sum(waits) / len(waits) * 1000, 3) if waits else None,
+                "p95": round(waits[min(len(waits) - 1, int(len(waits) * 0.95))] * 1000, 3) if waits else None,
+                "max": round(waits[-1] * 1000, 3) if waits else None,
+            },
+        }
+        # 驱动未公开连接池指标，这里读取其内部结构；驱动升级导致结构变化时仅省略该项
+        try:
+            stats["connections"] = {
+                str(address): {
+                    "total": len(connections),
+                    "in_use": sum(1 for c in connections if c.in_use),
+                    "idle": sum(1 for c in connections if not c.in_use),
+                }
+                for address, connections in self._driver._pool.connections.items()
+            }
+        except Exception:
+            stats["connections"] = None
+        return stats
+
+    async def ensure_schema(self, driver):
+        """幂等地补齐 Task 图的约束与索引，并记录 schema 版本。"""
+        async with driver.session() as session:
+            result = await session.run(
+                "MATCH (s:LogicGuardianSchema {key: 'task_graph'}) RETURN s.version AS version"
+            )
+            record = await result.single()
+            current = record["version"] if record else 0
+            if current > SCHEMA_VERSION:
+                logger.warning(f"数据库 schema 版本 {current} 高于当前代码支持的版本 {SCHEMA_VERSION}")
+                return current
+            for version in range(current + 1, SCHEMA_VERSION + 1):
+                for statement in SCHEMA_MIGRATIONS[version]:
+                    if callable(statement):
+                        await statement(session)
+                    else:
+                        await (await session.run(statement)).consume()
+                result = await session.run(
+                    "MERGE (s:LogicGuardianSchema {key: 'task_graph'}) SET s.version = $version",
+                    version=version,
+                )
+                await result.consume()
+                logger.info(f"Schema 已升级至版本 {version}")
+            if get_config("logic_graph.search.fulltext_index", True):
+                analyzer = get_config("logic_graph.search.analyzer", "cjk")
+                result = await session.run(
+                    f"CREATE FULLTEXT INDEX {FULLTEXT_INDEX} IF NOT EXISTS "
+                    "FOR (t:Task) ON EACH [t.name, t.description] "
+                    f"OPTIONS {{indexConfig: {{`fulltext.analyzer`: '{analyzer}'}}}}"
+                )
+                await result.consume()
+            return max(current, SCHEMA_VERSION)
+
+    async def describe_schema(self):
+        driver = await self.get_driver()
+        async with driver.session() as session:
+            result = await session.run(
+                "SHOW INDEXES YIELD name, type, entityType, labelsOrTypes, properties, state"
+            )
+            indexes = await result.data()
+            result = await session.run(
+                "SHOW CONSTRAINTS YIELD name, type, labelsOrTypes, properties"
+            )
+            constraints = await result.data()
+            result = await session.run(
+                "MATCH (s:LogicGuardianSchema {key: 'task_graph'}) RETURN s.version AS version"
+            )
+            record = await result.single()
+        return {
+            "schema_version": record["version"] if record else 0,
+            "indexes": indexes,
+            "constraints": constraints,
+        }
+
+    async def close(self):
+        if self._driver is not None:
+            await self._driver.close()
+            self._driver = None
+
+
+_connection = None
+
+
+def get_connection() -> Neo4jConnection:
+    global _connection
+    if _connection is None:
+        _connection = Neo4jConnection()
+    return _connection
+
+
+class Neo4jClient(GraphBackend):
+    name = "neo4j"
+
+    def __init__(self, project: str = DEFAULT_PROJECT, connection: Neo4jConnection = None):
+        super().__init__(project)
+        self.connection = connection or get_connection()
+
+    async def get_driver(self):
+        return await self.connection.get_driver()
+
+    async def _execute(self, kind, fn, *args, timeout=None):
+        # 每个事务函数的第一个参数都是项目名
+        return await self.connection.execute(kind, fn, self.project, *args, timeout=timeout)
+
+    async def _read(self, fn, *args):
+        return await self._execute("read", fn, *args)
+
+    async def _write(self, fn, *args):
+        return await self._execute("write", fn, *args)
+
+    def pool_stats(self):
+        return self.connection.pool_stats()
+
+    async def describe_schema(self):
+        return await self.connection.describe_schema()
+
+    async def close(self):
+        # 连接为所有项目共用，关闭后其他项目下次查询时会重新建立
+        await self.connection.close()
+
+    async def drop_project(self):
+        # CALL ... IN TRANSACTIONS 只能在自动提交事务中执行；分批删除避免大项目撑爆事务内存
+        driver = await self.get_driver()
+        async with driver.session() as session:
+            result = await session.run(
+                "MATCH (t:Task {project: $project}) "
+                "CALL { WITH t DETACH DELETE t } IN TRANSACTIONS OF 10000 ROWS",
+                project=self.project,
+            )
+            summary = await result.consume()
+        self.generation += 1
+        return summary.counters.nodes_deleted
+
+    @staticmethod
+    def _hops(max_depth):
+        # 变长关系的上限不能作为参数传入，只能拼进查询；max_depth 已由 resolve_max_depth 校验为整数
+        return "*1.." if max_depth is None else f"*1..{int(max_depth)}"
+
+    @staticmethod
+    async def _check_path_tx(tx, project, start, end, max_depth):
+        if start == end:
+            return (await Neo4jClient._check_paths_tx(tx, project, [(start, end)], max_depth))[0]
+        hops = Neo4jClient._hops(max_depth)
+        query = f"""
+        MATCH (a:Task {{project: $project, name: $start}}), (b:Task {{project: $project, name: $end}})
+        MATCH p = shortestPath((a)-[:DependsOn{hops}]->(b))
+        RETURN [n in nodes(p) | n.name] as path_list
+        """
+        result = await tx.run(query, project=project, start=start, end=end)
+        record = await result.single()
+        return record["path_list"] if record else None
+
+    @staticmethod
+    async def _k_paths_tx(tx, project, start, end, k, max_depth):
+        hops = Neo4jClient._hops(max_depth)
+        if start == end:
+            # allShortestPaths 不允许首尾为同一节点；查环时按变长匹配取前 k 条，由事务超时兜底
+            query = f"""
+            MATCH p = (a:Task {{project: $project, name: $start}})-[:DependsOn{hops}]->(a)
+            RETURN [n in nodes(p) | n.name] as path_list LIMIT $k
+            """
+        else:
+            query = f"""
+            MATCH (a:Task {{project: $project, name: $start}}), (b:Task {{project: $project, name: $end}})
+            MATCH p = allShortestPaths((a)-[:DependsOn{hops}]->(b))
+            RETURN [n in nodes(p) | n.name] as path_list LIMIT $k
+            """
+        result = await tx.run(query, project=project, start=start, end=end, k=k)
+        return [record["path_list"] async for record in result]
+
+    @staticmethod
+    async def _check_paths_tx(tx, project, pairs, max_depth):
+        # OPTIONAL MATCH 保证每个下标都有一行返回，缺失节点或不连通时 path_list 为 null。
+        # shortestPath 不允许首尾为同一节点，查环（a = b）时先走一跳到每个直接前置 s，
+        # 再求 s 回到 a 的最短路，取最短的一条；自环单独判断。s 到 a 的最短路超过
+        # max_depth - 1 跳时不存在更短的，事后过滤即可
+        query = f"""
+        UNWIND range(0, size($pairs) - 1) AS i
+        OPTIONAL MATCH (a:Task {{project: $project, name: $pairs[i][0]}})
+        OPTIONAL MATCH (b:Task {{project: $project, name: $pairs[i][1]}})
+        OPTIONAL MATCH (a)-[:DependsOn]->(pre) WHERE a = b AND pre <> a
+        WITH i, a, b, CASE WHEN a = b THEN pre ELSE a END AS s
+        OPTIONAL MATCH p = shortestPath((s)-[:DependsOn{Neo4jClient._hops(max_depth)}]->(b))
+        WITH i, a, b, CASE
+            WHEN a = b AND $max_depth IS NOT NULL AND length(p) >= $max_depth THEN null
+            ELSE p
+        END AS p
+        ORDER BY i, length(p)
+        WITH i, a, b, collect(p)[0] AS p
+        RETURN i, CASE
+            WHEN a = b AND size([(a)-[:DependsOn]->(a) | a]) > 0 THEN [a.name, a.name]
+            WHEN p IS NULL THEN null
+            WHEN a = b THEN [a.name] + [n in nodes(p) | n.name]
+            ELSE [n in nodes(p) | n.name]
+        END AS path_list
+        """
+        result = await tx.run(query, project=project, pairs=[list(pair) for pair in pairs], max_depth=max_depth)
+        paths = [None] * len(pairs)
+        async for record in result:
+            paths[record["i"]] = record["path_list"]
+        return paths
+
+    @staticmethod
+    async def _fetch_edges_tx(tx, project, seeds):
+        if seeds is None:
+            query = """
+            MATCH (t:Task {project: $project})
+            OPTIONAL MATCH (t)-[:DependsOn]->(pre)
+            RETURN t.name AS name, collect(pre.name) AS pres
+            """
+            result = await tx.run(query, project=project)
+            return {record["name"]: record["pres"] async for record in result}
+
+        # 逐层扩展而不是 DependsOn*0..：可变长匹配会枚举所有路径，在稠密图上呈指数增长
+        query = """
+        MATCH (t:Task) WHERE t.project = $project AND t.name IN $names
+        OPTIONAL MATCH (t)-[:DependsOn]->(pre)
+        RETURN t.name AS name, collect(pre.name) AS pres
+        """
+        edges = {}
+        frontier = list(dict.fromkeys(seeds))
+        while frontier:
+            result = await tx.run(query, project=project, names=frontier)
+            next_frontier = []
+            async for record in result:
+                edges[record["name"]] = record["pres"]
+                next_frontier.extend(pre for pre in record["pres"] if pre not in edges)
+            frontier = list(dict.fromkeys(next_frontier))
+        return edges
+
+    @staticmethod
+    async def _upsert_tx(tx, project, relationships, attempts=None):
+        if attempts is not None:
+            attempts.append(time.perf_counter())
+        # 先按名称顺序 MERGE 本块涉及的全部节点，再建立关系：逐行 MERGE pre、post 时
+        # 加锁顺序随行交错，并发事务之间仍可能成环等锁
+        query = """
+        UNWIND $names AS name
+        MERGE (:Task {project: $project, name: name})
+        WITH count(*) AS merged
+        UNWIND $rels AS rel
+        MATCH (pre:Task {project: $project, name: rel.pre})
+        MATCH (post:Task {project: $project, name: rel.post})
+        MERGE (post)-[:DependsOn]->(pre)
+        """
+        names = sorted({name for rel in relationships for name in (rel["pre"], rel["post"])})
+        result = await tx.run(query, project=project, names=names, rels=relationships)
+        await result.consume()
+
+    @staticmethod
+    async def _delete_tx(tx, project, relationships, attempts=None):
+        if attempts is not None:
+            attempts.append(time.perf_counter())
+        query = """
+        UNWIND $rels AS rel
+        MATCH (post:Task {project: $project, name: rel.post})-[r:DependsOn]->(pre:Task {project: $project, name: rel.pre})
+        DELETE r
+        """
+        result = await tx.run(query, project=project, rels=relationships)
+        await result.consume()
+
+    @staticmethod
+    async def _context_tx(tx, project, name):
+        query = """
+        MATCH (t:Task {project: $project, name: $name})
+        OPTIONAL MATCH (t)-[:DependsOn]->(pre)
+        OPTIONAL MATCH (next)-[:DependsOn]->(t)
+        RETURN collect(DISTINCT pre.name) as upstream, collect(DISTINCT next.name) as downstream
+        """
+        result = await tx.run(query, project=project, name=name)
+        return await result.single()
+
+    @staticmethod
+    async def _neighbours_tx(tx, project, names, direction):
+        if direction == "upstream":
+            query = """
+            MATCH (t:Task)-[:DependsOn]->(n:Task) WHERE t.project = $project AND t.name IN $names
+            RETURN t.name AS name, collect(n.name) AS others
+            """
+        else:
+            query = """
+            MATCH (n:Task)-[:DependsOn]->(t:Task) WHERE t.project = $project AND t.name IN $names
+            RETURN t.name AS name, collect(n.name) AS others
+            """
+        result = await tx.run(query, project=project, names=names)
+        return {record["name"]: record["others"] async for record in result}
+
+    @staticmethod
+    async def _neighbour_page_tx(tx, project, name, direction, after, limit):
+        # 按名称做 keyset 分页，逐条读取记录而不是 collect 成一个大列表
+        if direction == "upstream":
+            query = """
+            MATCH (:Task {project: $project, name: $name})-[:DependsOn]->(n:Task)
+            WHERE $after IS NULL OR n.name > $after
+            RETURN DISTINCT n.name AS name ORDER BY name LIMIT $limit
+            """
+        else:
+            query = """
+            MATCH (n:Task)-[:DependsOn]->(:Task {project: $project, name: $name})
+            WHERE $after IS NULL OR n.name > $after
+            RETURN DISTINCT n.name AS name ORDER BY name LIMIT $limit
+            """
+        result = await tx.run(query, project=project, name=name, after=after, limit=limit)
+        return [record["name"] async for record in result]
+
+    async def check_path(self, start, end, max_depth=DEFAULT_MAX_DEPTH):
+        return await self._read(self._check_path_tx, start, end, max_depth)
+
+    async def k_paths(self, start, end, k, time_budget, max_depth=DEFAULT_MAX_DEPTH):
+        try:
+            paths = await self._execute(
+                "read", self._k_paths_tx, start, end, k, max_depth, timeout=time_budget
+            )
+        except ClientError as e:
+            if "TimedOut" not in (e.code or ""):
+                raise
+            return [], True
+        paths.sort(key=len)
+        return paths, False
+
+    async def check_paths(self, pairs, max_depth=DEFAULT_MAX_DEPTH):
+        if not pairs:
+            return []
+        return await self._read(self._check_paths_tx, pairs, max_depth)
+
+    async def neighbours(self, names, direction):
+        return await self._read(self._neighbours_tx, names, direction)
+
+    async def neighbour_page(self, name, direction, after, limit):
+        return await self._read(self._neighbour_page_tx, name, direction, after, limit)
+
+    async def fetch_edges(self, seeds=None):
+        return await self._read(self._fetch_edges_tx, seeds)
+
+    @staticmethod
+    async def _task_names_tx(tx, project):
+        result = await tx.run("MATCH (t:Task {project: $project}) RETURN t.name AS name", project=project)
+        return [record["name"] async for record in result]
+
+    async def fetch_task_names(self):
+        # 只取名称，不像 fetch_edges 那样为每个任务收集前置任务列表
+        return await self._read(self._task_names_tx)
+
+    @staticmethod
+    async def _search_tx(tx, project, query, offset, limit):
+        # 全文索引跨项目共用，按相关度流式返回；先按项目过滤再 SKIP / LIMIT，分页才不会错位
+        cypher = """
+        CALL db.index.fulltext.queryNodes($index, $query) YIELD node, score
+        WHERE node.project = $project
+        RETURN node.name AS name, node.description AS description, score
+        SKIP $offset LIMIT $limit
+        """
+        result = await tx.run(
+            cypher, index=FULLTEXT_INDEX, project=project, query=_lucene_query(query), offset=offset, limit=limit
+        )
+        return [record.data() async for record in result]
+
+    async def search_tasks(self, query, offset, limit):
+        if not get_config("logic_graph.search.fulltext_index", True):
+            raise ValueError("全文索引未启用（logic_graph.search.fulltext_index）")
+        return await self._read(self._search_tx, query, offset, limit)
+
+    @staticmethod
+    async def _set_properties_tx(tx, project, rows):
+        query = """
+        UNWIND $rows AS row
+        MERGE (t:Task {project: $project, name: row.name})
+        SET t += row.props
+        """
+        result = await tx.run(query, project=project, rows=rows)
+        await result.consume()
+
+    @staticmethod
+    async def _fetch_properties_tx(tx, project, names, keys):
+        query = """
+        MATCH (t:Task) WHERE t.project = $project AND t.name IN $names
+        RETURN t.name AS name, [key IN $keys | [key, t[key]]] AS props
+        """
+        result = await tx.run(query, project=project, names=names, keys=keys)
+        return {
+            record["name"]: {key: value for key, value in record["props"] if value is not None}
+            async for record in result
+        }
+
+    async def set_task_properties(self, properties):
+        rows = [{"name": name, "props": properties[name]} for name in sorted(properties)]
+        await self._write(self._set_properties_tx, rows)
+        self._notify_nodes(list(properties))
+
+    async def fetch_task_properties(self, names, keys):
+        return await self._read(self._fetch_properties_tx, names, keys)
+
+    async def _write_chunk(self, chunk, attempts):
+        # 受管写事务：TransientError 由驱动在 max_transaction_retry_time 内自动重试
+        await self._write(self._upsert_tx, chunk, attempts)
+
+    async def _delete_chunk(self, chunk, attempts):
+        await self._write(self._delete_tx, chunk, attempts)
+
+    async def get_context(self, name):
+        record = await self._read(self._context_tx, name)
+        if record is None:
+            return [], []
+        return record["upstream"], record["downstream"]
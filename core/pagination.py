@@ -0,0 +1,45 @@
+"""
+分页游标编解码
+
+游标是对调用方不透明的字符串（URL 安全的 base64 JSON），用于在多次工具调用
+之间传递续读位置：
+- encode_cursor: 将续读位置字典编码为游标
+- decode_cursor: 解码游标并校验其所属的查询类型
+"""
+
+import base64
+import json
+from typing import Any, Dict, Optional
+
+
+def encode_cursor(kind: str, position: Dict[str, Any]) -> str:
+    """
+    编码游标。
+
+    Args:
+        kind (str): 游标所属的查询类型，防止把 A 查询的游标传给 B 查询
+        position (Dict[str, Any]): 续读位置，必须可 JSON 序列化
+
+    Returns:
+        str: 游标字符串
+    """
+    raw = json.dumps({"k": kind, **position}, ensure_ascii=False, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(kind: str, cursor: Optional[str]) -> Optional[Dict[str, Any]]:
+    """
+    解码游标；cursor 为空时返回 None（从头读取）。
+
+    Raises:
+        ValueError: 游标格式错误或不属于该查询
+    """
+    if not cursor:
+        return None
+    try:
+        position = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8"))
+    except Exception:
+        raise ValueError("游标格式错误，请使用上一页返回的 next_cursor")
+    if not isinstance(position, dict) or position.pop("k", None) != kind:
+        raise ValueError("游标与当前查询不匹配，请使用上一页返回的 next_cursor")
+    return position
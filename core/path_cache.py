@@ -0,0 +1,101 @@
+"""
+validate_project_logic 的路径结果缓存
+
+- PathCache: 以 (起点, 终点, 跳数上限) 为键的 LRU + TTL 缓存，条目记录写入时的图谱代数，
+  后端每次写入都会递增代数，代数不一致的条目视为失效
+- get_path_cache: 按 config.yaml 的 logic_graph.path_cache 返回项目独立的缓存实例
+- path_cache_stats: 各项目缓存的统计
+"""
+
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+from core.graph_backend import GraphBackend, get_backend
+from modules.YA_Common.utils.config import get_config
+
+
+class PathCache:
+    def __init__(self, max_size: int = 4096, ttl_seconds: float = 300):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, Tuple[int, float, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key: Hashable, generation: int) -> Tuple[bool, Any]:
+        """
+        查询缓存。
+
+        Args:
+            key (Hashable): 缓存键，例如 (current_task, target_task)
+            generation (int): 后端当前的图谱代数
+
+        Returns:
+            Tuple[bool, Any]: (是否命中, 缓存值)；缓存值可以是 None（表示路径不存在）
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            entry_generation, expires_at, value = entry
+            if entry_generation == generation and expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True, value
+            del self._entries[key]
+            self.invalidations += 1
+        self.misses += 1
+        return False, None
+
+    def put(self, key: Hashable, generation: int, value: Any) -> None:
+        """写入缓存；generation 应取自发起查询之前，避免查询期间的写入被掩盖。"""
+        if self.max_size <= 0:
+            return
+        self._entries[key] = (generation, time.monotonic() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+
+_path_caches: Dict[str, Tuple[GraphBackend, PathCache]] = {}
+
+
+def get_path_cache(project: Optional[str] = None) -> PathCache:
+    """返回项目独立的路径缓存；项目的后端实例被替换（如项目被删除）后缓存随之重建。"""
+    backend = get_backend(project)
+    entry = _path_caches.get(backend.project)
+    if entry is None or entry[0] is not backend:
+        entry = _path_caches[backend.project] = (
+            backend,
+            PathCache(
+                max_size=get_config("logic_graph.path_cache.max_size", 4096),
+                ttl_seconds=get_config("logic_graph.path_cache.ttl_seconds", 300),
+            ),
+        )
+    return entry[1]
+
+
+def path_cache_stats() -> Dict[str, Dict[str, object]]:
+    """所有已创建的项目缓存的统计（附带所属后端的图谱代数），按项目名索引。"""
+    return {
+        project: {**cache.stats(), "graph_generation": backend.generation}
+        for project, (backend, cache) in sorted(_path_caches.items())
+    }
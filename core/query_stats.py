@@ -0,0 +1,157 @@
+"""
+查询与工具耗时统计
+
+- LatencyHistogram: 固定桶的延迟直方图（毫秒），附带次数、错误数、平均值与最大值
+- QueryStats.record_query: 记录一次数据库查询的墙钟时间、数据库侧耗时、行数与参数大小，
+  超过阈值时写入慢查询日志
+- QueryStats.record_tool: 记录一次工具调用的耗时
+- QueryStats.snapshot: 按查询 / 工具汇总的统计，供 resources://query_stats 展示
+- get_query_stats: 按 logic_graph.query_stats 返回全局统计实例
+"""
+
+import json
+import logging
+from bisect import bisect_left
+from collections import deque
+from typing import Any, Dict, Optional
+
+from modules.YA_Common.utils.config import get_config
+
+slow_logger = logging.getLogger("LogicGuardian.SlowQuery")
+
+BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class LatencyHistogram:
+    def __init__(self):
+        self.buckets = [0] * (len(BUCKETS_MS) + 1)
+        self.count = 0
+        self.errors = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, ms: float, error: bool = False) -> None:
+        self.buckets[bisect_left(BUCKETS_MS, ms)] += 1
+        self.count += 1
+        self.errors += error
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """以所在桶的上界估计分位数，不超过观测到的最大值。"""
+        if not self.count:
+            return None
+        rank, seen = q * self.count, 0
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if seen >= rank and n:
+                bound = BUCKETS_MS[i] if i < len(BUCKETS_MS) else self.max_ms
+                return round(min(bound, self.max_ms), 3)
+        return round(self.max_ms, 3)
+
+    def to_dict(self) -> Dict[str, Any]:
+        labels = [f"le_{b}ms" for b in BUCKETS_MS] + ["inf"]
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "avg_ms": round(self.total_ms / self.count, 3) if self.count else None,
+            "p50_ms": self.quantile(0.5),
+            "p95_ms": self.quantile(0.95),
+            "p99_ms": self.quantile(0.99),
+            "max_ms": round(self.max_ms, 3),
+            "histogram": {label: n for label, n in zip(labels, self.buckets) if n},
+        }
+
+
+class QueryStats:
+    def __init__(self, slow_query_ms: float = 200, slow_log_size: int = 100):
+        self.slow_query_ms = slow_query_ms
+        self._queries: Dict[str, LatencyHistogram] = {}
+        self._db: Dict[str, Dict[str, float]] = {}
+        self._tools: Dict[str, LatencyHistogram] = {}
+        self._slow = deque(maxlen=slow_log_size)
+
+    def record_query(
+        self,
+        name: str,
+        wall_ms: float,
+        available_after_ms: Optional[float] = None,
+        consumed_after_ms: Optional[float] = None,
+        rows: int = 0,
+        param_bytes: int = 0,
+        error: Optional[str] = None,
+    ) -> None:
+        """
+        记录一次查询。
+
+        Args:
+            name (str): 查询名（事务函数名）
+            wall_ms (float): 客户端视角的墙钟时间，包含取连接、网络、重试与结果解码
+            available_after_ms (Optional[float]): 数据库返回的首条结果可用耗时
+            consumed_after_ms (Optional[float]): 数据库返回的结果消费完成耗时
+            rows (int): 读取的记录数
+            param_bytes (int): 参数 JSON 序列化后的字节数
+            error (Optional[str]): 查询失败时的错误信息
+        """
+        self._queries.setdefault(name, LatencyHistogram()).observe(wall_ms, error is not None)
+        db = self._db.setdefault(name, {"db_samples": 0, "available_after_ms": 0, "consumed_after_ms": 0, "rows": 0, "param_bytes": 0})
+        if available_after_ms is not None:
+            db["db_samples"] += 1
+        db["available_after_ms"] += available_after_ms or 0
+        db["consumed_after_ms"] += consumed_after_ms or 0
+        db["rows"] += rows
+        db["param_bytes"] += param_bytes
+        if wall_ms >= self.slow_query_ms:
+            entry = {
+                "query": name,
+                "wall_ms": round(wall_ms, 3),
+                "available_after_ms": available_after_ms,
+                "consumed_after_ms": consumed_after_ms,
+                "rows": rows,
+                "param_bytes": param_bytes,
+                "error": error,
+            }
+            self._slow.append(entry)
+            slow_logger.warning(json.dumps(entry, ensure_ascii=False))
+
+    def record_tool(self, name: str, wall_ms: float, error: bool = False) -> None:
+        self._tools.setdefault(name, LatencyHistogram()).observe(wall_ms, error)
+
+    def snapshot(self) -> Dict[str, Any]:
+        queries = {}
+        for name, histogram in sorted(self._queries.items()):
+            stats = histogram.to_dict()
+            db, count = self._db[name], histogram.count
+            # 墙钟时间与数据库侧耗时之差即驱动、网络与 Python 解码所占的部分
+            samples = db["db_samples"]
+            stats["db_avg_ms"] = {
+                "available_after": round(db["available_after_ms"] / samples, 3) if samples else None,
+                "consumed_after": round(db["consumed_after_ms"] / samples, 3) if samples else None,
+            }
+            stats["avg_rows"] = round(db["rows"] / count, 1)
+            stats["avg_param_bytes"] = round(db["param_bytes"] / count, 1)
+            queries[name] = stats
+        return {
+            "slow_query_ms": self.slow_query_ms,
+            "tools": {name: h.to_dict() for name, h in sorted(self._tools.items())},
+            "queries": queries,
+            "slow_queries": list(self._slow),
+        }
+
+
+_stats: Optional[QueryStats] = None
+
+
+def get_query_stats() -> QueryStats:
+    global _stats
+    if _stats is None:
+        log_file = get_config("logic_graph.query_stats.slow_log_file", None)
+        if log_file:
+            handler = logging.FileHandler(log_file, encoding="utf-8")
+            handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+            slow_logger.addHandler(handler)
+        _stats = QueryStats(
+            slow_query_ms=get_config("logic_graph.query_stats.slow_query_ms", 200),
+            slow_log_size=get_config("logic_graph.query_stats.slow_log_size", 100),
+        )
+    return _stats
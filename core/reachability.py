@@ -0,0 +1,186 @@
+"""
+可达性索引（位图传递闭包），让“A 是否依赖 B”的判断不必每次遍历图
+
+- ReachabilityIndex.ensure_loaded: 首次使用时从后端拉取全图建立闭包
+- ReachabilityIndex.reaches: O(1) 判断 start 是否沿 DependsOn 可达 end
+- ReachabilityIndex.on_write: 写入监听，增量合并新边带来的可达对
+- ReachabilityIndex.on_delete: 删除监听；闭包无法廉价地扣除可达对，索引标记为过期，下次使用时重建
+- get_reachability_index: 按 logic_graph.reachability_index 返回项目独立的索引；未启用时返回 None
+- reachability_stats: 已创建的各项目索引的统计
+
+每个节点一个整数位图：desc[x] 为 x 沿 DependsOn 可达的节点集合，anc[x] 为可达 x
+的节点集合。新增边 u -> v 时，新增的可达对恰好是 (anc*(u), desc*(v))，只需更新这
+两个集合中的节点。内存为 O(n^2 / 8) 字节，因此通过 max_nodes 限制规模。
+
+索引只能感知本进程经由后端写入的关系。其他进程（core.bulk_import、另一个服务实例）
+写入后，索引会把新连通的任务对误判为不可达，因此加载超过 max_age_seconds 后，下次
+使用前整体重建；多进程写入同一个库时，在这段时间内仍可能得到过期的否定结论。
+"""
+
+import asyncio
+import logging
+import time
+from typing import Dict, List, Optional, Tuple
+
+from core.graph_algorithms import topological_order
+from core.graph_backend import GraphBackend, get_backend
+from modules.YA_Common.utils.config import get_config
+
+logger = logging.getLogger("LogicGuardian")
+
+
+def _iter_bits(bits: int):
+    while bits:
+        low = bits & -bits
+        yield low.bit_length() - 1
+        bits ^= low
+
+
+class ReachabilityIndex:
+    def __init__(self, backend: GraphBackend, max_nodes: int = 50000, max_age_seconds: float = 300):
+        self.backend = backend
+        self.max_nodes = max_nodes
+        self.max_age_seconds = max_age_seconds
+        self._loaded_at = 0.0
+        self._ids: Dict[str, int] = {}
+        self._desc: List[int] = []
+        self._anc: List[int] = []
+        self._loaded = False
+        # 超过 max_nodes 后停用，所有查询回退到图遍历
+        self.disabled = False
+        # 加载期间到达的写入 / 删除按顺序缓存为 (是否删除, 关系)
+        self._pending: Optional[List[Tuple[bool, Dict[str, str]]]] = None
+        self._lock = asyncio.Lock()
+        backend.add_write_listener(self.on_write)
+        backend.add_delete_listener(self.on_delete)
+
+    async def ensure_loaded(self) -> bool:
+        """加载索引；返回索引当前是否可用。"""
+        if self._loaded and self.max_age_seconds and time.monotonic() - self._loaded_at > self.max_age_seconds:
+            # 过期后重建，纳入其他进程写入的关系
+            self._loaded = False
+        if self._loaded or self.disabled:
+            return self._loaded
+        async with self._lock:
+            if self._loaded or self.disabled:
+                return self._loaded
+            self._loaded_at = time.monotonic()
+            self._pending = []
+            try:
+                edges = await self.backend.fetch_edges()
+            finally:
+                pending, self._pending = self._pending, None
+            if len(edges) > self.max_nodes:
+                self._disable(len(edges))
+                return False
+            self._build(edges)
+            self._loaded = True
+            for removed, rel in pending:
+                (self.on_delete if removed else self.on_write)([rel])
+                if not self._loaded:
+                    break
+            return self._loaded
+
+    def _disable(self, size: int) -> None:
+        logger.warning(f"任务数 {size} 超过可达性索引上限 {self.max_nodes}，索引停用")
+        self.disabled = True
+        self._loaded = False
+        self._ids, self._desc, self._anc = {}, [], []
+
+    def _node(self, name: str) -> int:
+        node = self._ids.get(name)
+        if node is None:
+            node = self._ids[name] = len(self._desc)
+            self._desc.append(0)
+            self._anc.append(0)
+        return node
+
+    def _build(self, edges: Dict[str, List[str]]) -> None:
+        self._ids, self._desc, self._anc = {}, [], []
+        order, blocked = topological_order(edges)
+        for name in order + blocked:
+            self._node(name)
+        ids, desc, anc = self._ids, self._desc, self._anc
+        # DAG 部分按拓扑序一次性求闭包：前置任务的闭包总是先算好
+        for name in order:
+            node = ids[name]
+            for pre in edges.get(name, ()):
+                desc[node] |= desc[ids[pre]] | (1 << ids[pre])
+        for name in reversed(order):
+            node = ids[name]
+            for pre in edges.get(name, ()):
+                anc[ids[pre]] |= anc[node] | (1 << node)
+        # 环上及依赖环的节点逐边增量合并，保证结果与一般有向图的闭包一致
+        for name in blocked:
+            for pre in edges.get(name, ()):
+                self._add_edge(name, pre)
+
+    def _add_edge(self, post: str, pre: str) -> None:
+        u, v = self._node(post), self._node(pre)
+        targets = self._desc[v] | (1 << v)
+        if self._desc[u] & targets == targets:
+            return
+        sources = self._anc[u] | (1 << u)
+        for a in _iter_bits(sources):
+            self._desc[a] |= targets
+        for d in _iter_bits(targets):
+            self._anc[d] |= sources
+
+    def on_write(self, chunk: List[Dict[str, str]]) -> None:
+        if self._pending is not None:
+            self._pending.extend((False, rel) for rel in chunk)
+            return
+        if not self._loaded:
+            return
+        for rel in chunk:
+            self._add_edge(rel["post"], rel["pre"])
+        if len(self._ids) > self.max_nodes:
+            self._disable(len(self._ids))
+
+    def on_delete(self, chunk: List[Dict[str, str]]) -> None:
+        if self._pending is not None:
+            self._pending.extend((True, rel) for rel in chunk)
+            return
+        # 删除后旧闭包会把已断开的任务对误判为可达，必须在下次使用前重建
+        self._loaded = False
+
+    def contains(self, name: str) -> bool:
+        return name in self._ids
+
+    def reaches(self, start: str, end: str) -> bool:
+        """start 是否沿 DependsOn（至少一跳）到达 end；调用前需 ensure_loaded。"""
+        u, v = self._ids.get(start), self._ids.get(end)
+        if u is None or v is None:
+            return False
+        return bool(self._desc[u] >> v & 1)
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "enabled": not self.disabled,
+            "loaded": self._loaded,
+            "nodes": len(self._ids),
+            "max_nodes": self.max_nodes,
+            "reachable_pairs": sum(bin(bits).count("1") for bits in self._desc),
+        }
+
+
+_indexes: Dict[str, ReachabilityIndex] = {}
+
+
+def get_reachability_index(project: Optional[str] = None) -> Optional[ReachabilityIndex]:
+    if not get_config("logic_graph.reachability_index.enabled", False):
+        return None
+    backend = get_backend(project)
+    index = _indexes.get(backend.project)
+    if index is None or index.backend is not backend:
+        index = _indexes[backend.project] = ReachabilityIndex(
+            backend,
+            max_nodes=get_config("logic_graph.reachability_index.max_nodes", 50000),
+            max_age_seconds=get_config("logic_graph.reachability_index.max_age_seconds", 300),
+        )
+    return index
+
+
+def reachability_stats() -> Dict[str, Dict[str, object]]:
+    """所有已创建的项目索引的统计，按项目名索引。"""
+    return {project: index.stats() for project, index in sorted(_indexes.items())}
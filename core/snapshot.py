@@ -0,0 +1,203 @@
+"""
+Task 图的紧凑二进制快照
+
+- write_snapshot / read_snapshot: 快照文件的序列化与（mmap）加载
+- GraphSnapshot: 已加载的快照，提供邻接表与属性视图
+- export_snapshot: 从任意后端导出快照
+- import_snapshot: 以 MERGE 语义把快照合并进任意后端（会通知写入监听）
+- snapshot_path: 项目的默认快照路径（logic_graph.snapshot.path，可含 {project} 占位符）
+- resolve_snapshot_path: 校验工具传入的快照路径，只允许落在默认快照所在的目录内
+
+文件布局（小端序）：
+    header    magic(8) version(u16) flags(u16) nodes(u32) edges(u32) names_len(u64) props_len(u64)
+    body      name_offsets u32[n+1] | indptr u32[n+1] | indices u32[m] | names utf-8 | properties JSON
+
+任务名只存一次（interned），边以 CSR 形式存储：节点 i 依赖的前置任务为
+indices[indptr[i]:indptr[i+1]]。未压缩的快照用 mmap 映射后直接把数组视图转换为
+u32 序列，不做逐字节解析；FLAG_ZLIB 表示 body 整体经过 zlib 压缩，加载时需先解压。
+"""
+
+import json
+import mmap
+import os
+import struct
+import sys
+import zlib
+from array import array
+from typing import Any, Dict, Iterable, List, Mapping, Optional
+
+from modules.YA_Common.utils.config import get_config
+
+MAGIC = b"LGSNAP\x00\x01"
+VERSION = 1
+FLAG_ZLIB = 1
+_HEADER = struct.Struct("<8sHHIIQQ")
+
+
+class GraphSnapshot:
+    def __init__(self, names: List[str], indptr, indices, properties: Dict[str, Dict[str, Any]]):
+        self.names = names
+        self.indptr = indptr
+        self.indices = indices
+        self.properties = properties
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.indices)
+
+    def adjacency(self) -> Dict[str, List[str]]:
+        """{post: [pre, ...]}，与 GraphBackend.fetch_edges 的返回格式一致（含孤立节点）。"""
+        names, indptr, indices = self.names, self.indptr, self.indices
+        return {
+            name: [names[j] for j in indices[indptr[i]:indptr[i + 1]]]
+            for i, name in enumerate(names)
+        }
+
+
+def snapshot_path(project: str) -> str:
+    return get_config("logic_graph.snapshot.path", "data/{project}.snap").format(project=project)
+
+
+def resolve_snapshot_path(path: Optional[str], project: str) -> str:
+    """
+    解析 export_graph / import_graph 使用的快照路径；为空时取项目的默认快照。
+
+    Raises:
+        ValueError: path 解析（含 .. 与符号链接）后不在默认快照所在的目录内
+    """
+    default = snapshot_path(project)
+    if not path:
+        return default
+    root = os.path.realpath(os.path.dirname(os.path.abspath(default)))
+    resolved = os.path.realpath(path)
+    if os.path.commonpath([root, resolved]) != root:
+        raise ValueError(f"快照路径必须位于 {root} 目录内: {path}")
+    return resolved
+
+
+def write_snapshot(
+    path: str,
+    depends_on: Mapping[str, Iterable[str]],
+    properties: Optional[Mapping[str, Dict[str, Any]]] = None,
+    compress: bool = False,
+) -> Dict[str, int]:
+    """
+    写入快照（先写临时文件再替换，避免留下半截快照）。
+
+    Returns:
+        Dict[str, int]: 节点数、关系数与文件字节数
+    """
+    ids: Dict[str, int] = {}
+    for post, pres in depends_on.items():
+        ids.setdefault(post, len(ids))
+        for pre in pres:
+            ids.setdefault(pre, len(ids))
+    for name in properties or {}:
+        ids.setdefault(name, len(ids))
+    names = list(ids)
+
+    name_offsets, blob = array("I", [0]), bytearray()
+    for name in names:
+        blob += name.encode("utf-8")
+        name_offsets.append(len(blob))
+    if len(blob) > 0xFFFFFFFF:
+        raise ValueError("任务名总长度超出快照格式上限（4 GiB）")
+
+    indptr, indices = array("I", [0]), array("I")
+    for name in names:
+        indices.extend(sorted({ids[pre] for pre in depends_on.get(name, ())}))
+        indptr.append(len(indices))
+
+    props = {name: dict(value) for name, value in (properties or {}).items() if value}
+    props_blob = json.dumps(props, ensure_ascii=False, separators=(",", ":")).encode("utf-8") if props else b""
+
+    if sys.byteorder != "little":
+        for arr in (name_offsets, indptr, indices):
+            arr.byteswap()
+    body = b"".join([name_offsets.tobytes(), indptr.tobytes(), indices.tobytes(), bytes(blob), props_blob])
+    flags = 0
+    if compress:
+        body = zlib.compress(body, 6)
+        flags |= FLAG_ZLIB
+    header = _HEADER.pack(MAGIC, VERSION, flags, len(names), len(indices), len(blob), len(props_blob))
+
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(header)
+        f.write(body)
+    os.replace(tmp, path)
+    return {"nodes": len(names), "edges": len(indices), "bytes": len(header) + len(body)}
+
+
+def _u32(buffer: memoryview, start: int, count: int):
+    view = buffer[start:start + 4 * count]
+    if sys.byteorder == "little":
+        return view.cast("I")
+    swapped = array("I", view.tobytes())
+    swapped.byteswap()
+    return swapped
+
+
+def read_snapshot(path: str) -> GraphSnapshot:
+    """
+    加载快照。
+
+    Raises:
+        ValueError: 文件不是快照或版本不受支持
+    """
+    with open(path, "rb") as f:
+        raw = f.read(_HEADER.size)
+        if len(raw) < _HEADER.size:
+            raise ValueError(f"{path} 不是有效的图快照文件")
+        magic, version, flags, n, m, names_len, props_len = _HEADER.unpack(raw)
+        if magic != MAGIC:
+            raise ValueError(f"{path} 不是有效的图快照文件")
+        if version != VERSION:
+            raise ValueError(f"不支持的快照版本: {version}")
+        if flags & FLAG_ZLIB:
+            body = memoryview(zlib.decompress(f.read()))
+        else:
+            body = memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))[_HEADER.size:]
+
+    name_offsets = _u32(body, 0, n + 1)
+    indptr = _u32(body, 4 * (n + 1), n + 1)
+    indices = _u32(body, 8 * (n + 1), m)
+    names_start = 4 * (2 * (n + 1) + m)
+    blob = body[names_start:names_start + names_len].tobytes()
+    names = [blob[name_offsets[i]:name_offsets[i + 1]].decode("utf-8") for i in range(n)]
+    props_start = names_start + names_len
+    properties = json.loads(body[props_start:props_start + props_len].tobytes()) if props_len else {}
+    return GraphSnapshot(names, indptr, indices, properties)
+
+
+async def export_snapshot(backend, path: str, compress: bool = False) -> Dict[str, int]:
+    """从后端拉取全图与任务属性并写入快照。"""
+    from core.graph_backend import TASK_PROPERTIES
+
+    edges = await backend.fetch_edges()
+    properties = await backend.fetch_task_properties(list(edges), list(TASK_PROPERTIES))
+    return write_snapshot(path, edges, properties, compress)
+
+
+async def import_snapshot(backend, path: str, chunk_size: Optional[int] = None) -> Dict[str, Any]:
+    """
+    把快照以 MERGE 语义合并进后端：关系走 upsert_chunked（缓存与索引随之更新），
+    孤立节点与任务属性走 set_task_properties。
+
+    Returns:
+        Dict[str, Any]: upsert_chunked 的报告，附带快照的节点数与关系数
+    """
+    snapshot = read_snapshot(path)
+    names, indptr, indices = snapshot.names, snapshot.indptr, snapshot.indices
+    relationships = [
+        {"pre": names[j], "post": post}
+        for i, post in enumerate(names)
+        for j in indices[indptr[i]:indptr[i + 1]]
+    ]
+    report = await backend.upsert_chunked(relationships, chunk_size)
+    connected = {rel["pre"] for rel in relationships} | {rel["post"] for rel in relationships}
+    properties = {name: {} for name in names if name not in connected}
+    properties.update(snapshot.properties)
+    if properties:
+        await backend.set_task_properties(properties)
+    return {"nodes": len(names), "edges": snapshot.edge_count, **report}
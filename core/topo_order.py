@@ -0,0 +1,174 @@
+"""
+动态拓扑序索引（Pearce–Kelly），用于严格入库模式下拒绝会形成环的关系
+
+- DynamicTopologicalOrder.ensure_loaded: 首次使用时从后端拉取全图并建立拓扑序
+- DynamicTopologicalOrder.try_add: 尝试加入一条依赖，会形成环时拒绝并返回已有的反向链条
+- DynamicTopologicalOrder.remove: 撤销一条依赖（删除边不会破坏拓扑序）
+- DynamicTopologicalOrder.on_write / on_delete: 写入 / 删除监听，同步后端的关系变化
+- get_topo_order: 返回挂在项目图谱后端上的索引实例（每个项目一个）
+
+执行方向上 pre 必须排在 post 之前，即维护 ord[pre] < ord[post]。加入新边时只有
+ord[post] < ord[pre] 才需要调整，且只访问序号落在 [ord[post], ord[pre]] 区间内的
+节点，代价与受影响区域成正比，而不是每条边一次全图遍历。
+"""
+
+import asyncio
+from typing import Dict, List, Optional, Set, Tuple
+
+from core.graph_algorithms import topological_order
+from core.graph_backend import GraphBackend, get_backend
+
+
+class DynamicTopologicalOrder:
+    def __init__(self, backend: GraphBackend):
+        self.backend = backend
+        self._ord: Dict[str, int] = {}
+        self._next_ord = 0
+        # 执行方向：pre -> {post}，以及反向 post -> {pre}
+        self._succ: Dict[str, Set[str]] = {}
+        self._pred: Dict[str, Set[str]] = {}
+        self._loaded = False
+        # 加载期间到达的写入 / 删除按顺序缓存为 (是否删除, 关系)，加载完成后补放，
+        # 避免拉取全图与写入交错时漏边
+        self._pending: Optional[List[Tuple[bool, Dict[str, str]]]] = None
+        self._lock = asyncio.Lock()
+        backend.add_write_listener(self.on_write)
+        backend.add_delete_listener(self.on_delete)
+
+    async def ensure_loaded(self) -> None:
+        """
+        从后端加载全图并建立初始拓扑序。
+
+        Raises:
+            ValueError: 图中已存在循环依赖，无法建立拓扑序
+        """
+        if self._loaded:
+            return
+        async with self._lock:
+            if self._loaded:
+                return
+            self._pending = []
+            try:
+                edges = await self.backend.fetch_edges()
+            finally:
+                pending, self._pending = self._pending, None
+            order, blocked = topological_order(edges)
+            if blocked:
+                raise ValueError(
+                    f"图中已存在循环依赖，无法启用严格模式，涉及任务: {', '.join(blocked[:20])}"
+                )
+            self._ord = {name: i for i, name in enumerate(order)}
+            self._next_ord = len(order)
+            self._succ = {name: set() for name in order}
+            self._pred = {name: set() for name in order}
+            for post, pres in edges.items():
+                for pre in pres:
+                    self._succ[pre].add(post)
+                    self._pred[post].add(pre)
+            self._loaded = True
+            for removed, rel in pending:
+                (self.on_delete if removed else self.on_write)([rel])
+                if not self._loaded:
+                    break
+            if not self._loaded:
+                raise ValueError("加载期间写入了循环依赖，无法启用严格模式")
+
+    def on_write(self, chunk: List[Dict[str, str]]) -> None:
+        # 非严格模式的写入也要同步进来；一旦出现环，索引失效，下次使用时重新加载
+        if self._pending is not None:
+            self._pending.extend((False, rel) for rel in chunk)
+            return
+        if not self._loaded:
+            return
+        for rel in chunk:
+            if self.try_add(rel["pre"], rel["post"]) is not None:
+                self._loaded = False
+                return
+
+    def on_delete(self, chunk: List[Dict[str, str]]) -> None:
+        if self._pending is not None:
+            self._pending.extend((True, rel) for rel in chunk)
+            return
+        if not self._loaded:
+            return
+        for rel in chunk:
+            self.remove(rel["pre"], rel["post"])
+
+    def _add_node(self, name: str) -> None:
+        if name not in self._ord:
+            self._ord[name] = self._next_ord
+            self._next_ord += 1
+            self._succ[name] = set()
+            self._pred[name] = set()
+
+    def try_add(self, pre: str, post: str) -> Optional[List[str]]:
+        """
+        加入依赖 (post)-[:DependsOn]->(pre)。
+
+        Returns:
+            Optional[List[str]]: 成功时返回 None；会形成环时不做修改，返回已存在的
+                pre 依赖 post 的链条（沿 DependsOn 方向，从 pre 到 post）
+        """
+        if pre == post:
+            return [post, pre]
+        self._add_node(pre)
+        self._add_node(post)
+        if post in self._succ[pre]:
+            return None
+        lower, upper = self._ord[post], self._ord[pre]
+        if lower < upper:
+            # post 排在 pre 之前：先检查 post 是否（经执行方向）能到达 pre
+            parent: Dict[str, str] = {post: post}
+            stack = [post]
+            forward: List[str] = []
+            while stack:
+                node = stack.pop()
+                forward.append(node)
+                for nxt in self._succ[node]:
+                    if nxt == pre:
+                        chain = [node]
+                        while chain[-1] != post:
+                            chain.append(parent[chain[-1]])
+                        return [pre] + chain
+                    if nxt not in parent and self._ord[nxt] < upper:
+                        parent[nxt] = node
+                        stack.append(nxt)
+            backward: List[str] = []
+            seen = {pre}
+            stack = [pre]
+            while stack:
+                node = stack.pop()
+                backward.append(node)
+                for prv in self._pred[node]:
+                    if prv not in seen and self._ord[prv] > lower:
+                        seen.add(prv)
+                        stack.append(prv)
+            self._reorder(backward, forward)
+        self._succ[pre].add(post)
+        self._pred[post].add(pre)
+        return None
+
+    def _reorder(self, backward: List[str], forward: List[str]) -> None:
+        # 受影响节点复用原有的序号集合：先放 pre 一侧（backward），再放 post 一侧（forward）
+        backward.sort(key=self._ord.__getitem__)
+        forward.sort(key=self._ord.__getitem__)
+        slots = sorted(self._ord[name] for name in backward + forward)
+        for name, slot in zip(backward + forward, slots):
+            self._ord[name] = slot
+
+    def remove(self, pre: str, post: str) -> None:
+        if pre in self._succ:
+            self._succ[pre].discard(post)
+        if post in self._pred:
+            self._pred[post].discard(pre)
+
+
+_topo_orders: Dict[str, DynamicTopologicalOrder] = {}
+
+
+def get_topo_order(project: Optional[str] = None) -> DynamicTopologicalOrder:
+    backend = get_backend(project)
+    instance = _topo_orders.get(backend.project)
+    if instance is None or instance.backend is not backend:
+        instance = _topo_orders[backend.project] = DynamicTopologicalOrder(backend)
+    return instance
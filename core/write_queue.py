@@ -0,0 +1,137 @@
+"""
+并发写入合并队列
+
+多个调用方同时写入时，各自开事务会在同一批 Task 节点上互相等锁，甚至死锁重试。
+WriteCoalescer 把一个时间窗口内到达的写入合并成一批：
+- 去重：多个调用方提交的同一关系只写一次
+- 排序：按 (pre, post) 排序后写入，结果与提交顺序无关（节点的加锁顺序由后端保证，
+  Neo4j 后端在每块内先按名称 MERGE 全部节点）
+- 串行：同一项目同一时刻只有一批在写，批次之间不再争锁
+
+- WriteCoalescer.submit: 提交一批关系，等到这些关系所在的块提交（或失败）后返回
+  与 GraphBackend.upsert_chunked 格式相同的报告，失败行的行号相对调用方自己的输入
+- get_write_queue: 返回挂在项目图谱后端上的合并队列（每个项目一个）
+- write_queue_stats: 已创建的各项目队列的合并统计
+"""
+
+import asyncio
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from core.graph_backend import GraphBackend, get_backend
+from modules.YA_Common.utils.config import get_config
+
+
+class WriteCoalescer:
+    def __init__(self, backend: GraphBackend, window_ms: float = 5, max_batch: int = 10000):
+        self.backend = backend
+        self.window = window_ms / 1000
+        self.max_batch = max_batch
+        self._pending: List[Tuple[List[Dict[str, str]], asyncio.Future]] = []
+        self._pending_rows = 0
+        self._timer: Optional[asyncio.Task] = None
+        self._tasks: Set[asyncio.Task] = set()
+        self._lock = asyncio.Lock()
+        self.batches = 0
+        self.callers = 0
+        self.rows_submitted = 0
+        self.rows_written = 0
+
+    async def submit(self, relationships: List[Dict[str, str]]) -> Dict[str, Any]:
+        """
+        提交关系并等待写入完成。
+
+        Returns:
+            Dict[str, Any]: {"chunks": [...], "failed_rows": [...], "coalesced": {...}}，
+                chunks 为合并后整批的分块报告，failed_rows 只包含本调用方的行
+        """
+        if not relationships:
+            return {"chunks": [], "failed_rows": [], "coalesced": {"callers": 0, "rows": 0}}
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((relationships, future))
+        self._pending_rows += len(relationships)
+        if self._pending_rows >= self.max_batch:
+            self._spawn(self._flush())
+        elif self._timer is None:
+            self._timer = self._spawn(self._flush_after(self.window))
+        return await future
+
+    def _spawn(self, coro) -> asyncio.Task:
+        # 持有任务引用，防止尚未完成的后台写入被回收
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def _flush_after(self, delay: float) -> None:
+        await asyncio.sleep(delay)
+        await self._flush()
+
+    async def _flush(self) -> None:
+        async with self._lock:
+            # 拿到锁时才取走待写入的请求：等锁期间到达的写入也并入这一批
+            batch, self._pending, self._pending_rows, self._timer = self._pending, [], 0, None
+            if not batch:
+                return
+            owners: Dict[Tuple[str, str], List[Tuple[int, int]]] = {}
+            for caller, (relationships, _) in enumerate(batch):
+                for row, rel in enumerate(relationships):
+                    owners.setdefault((rel["pre"], rel["post"]), []).append((caller, row))
+            rows = [{"pre": pre, "post": post} for pre, post in sorted(owners)]
+            try:
+                report = await self.backend.upsert_chunked(rows)
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                return
+
+            failed: List[List[Dict[str, Any]]] = [[] for _ in batch]
+            for f in report["failed_rows"]:
+                for caller, row in owners[(f["rel"]["pre"], f["rel"]["post"])]:
+                    failed[caller].append({"row": row, "rel": f["rel"], "error": f["error"]})
+            self.batches += 1
+            self.callers += len(batch)
+            self.rows_submitted += sum(len(relationships) for relationships, _ in batch)
+            self.rows_written += len(rows) - len(report["failed_rows"])
+            coalesced = {"callers": len(batch), "rows": len(rows)}
+            for caller, (_, future) in enumerate(batch):
+                if not future.done():
+                    future.set_result({
+                        "chunks": report["chunks"],
+                        "failed_rows": sorted(failed[caller], key=lambda f: f["row"]),
+                        "coalesced": coalesced,
+                    })
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "window_ms": self.window * 1000,
+            "max_batch": self.max_batch,
+            "batches": self.batches,
+            "callers": self.callers,
+            "avg_callers_per_batch": round(self.callers / self.batches, 2) if self.batches else None,
+            "rows_submitted": self.rows_submitted,
+            "rows_written": self.rows_written,
+            "pending_rows": self._pending_rows,
+        }
+
+
+_queues: Dict[str, WriteCoalescer] = {}
+
+
+def get_write_queue(project: Optional[str] = None) -> Optional[WriteCoalescer]:
+    """返回项目的合并队列；logic_graph.write_queue.enabled 为 false 时返回 None。"""
+    if not get_config("logic_graph.write_queue.enabled", True):
+        return None
+    backend = get_backend(project)
+    queue = _queues.get(backend.project)
+    if queue is None or queue.backend is not backend:
+        queue = _queues[backend.project] = WriteCoalescer(
+            backend,
+            window_ms=get_config("logic_graph.write_queue.window_ms", 5),
+            max_batch=get_config("logic_graph.write_queue.max_batch", 10000),
+        )
+    return queue
+
+
+def write_queue_stats() -> Dict[str, Dict[str, Any]]:
+    return {project: queue.stats() for project, queue in sorted(_queues.items())}
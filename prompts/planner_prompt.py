@@ -19,11 +19,12 @@ async def planner_prompt(text_content: str) -> str:
        - 提取完成后，**立即调用**工具 `batch_upsert_logic` 将这些关系批量同步到 Neo4j 数据库。
 
     2. **逻辑校验与冲突检测阶段**：
-       - 在同步完成后，调用 `validate_project_logic` 检查是否存在逻辑闭环或断裂。
+       - 在同步完成后，调用 `validate_project_logic` 检查是否存在逻辑闭环或断裂；需要校验多组任务时，使用 `batch_validate_project_logic` 一次提交。
+       - 调用 `detect_logic_cycles` 一次性检测全部循环依赖，不要逐对探测。
        - 如果发现文本中的描述与已有逻辑冲突，必须在回复中明确标注【逻辑矛盾点】。
 
     3. **基于图谱的回复**：
-       - 根据数据库中的拓扑结构，为用户生成一份结构化的任务路线图。
+       - 根据数据库中的拓扑结构，为用户生成一份结构化的任务路线图；调用 `compute_schedule` 一次获取分层、关键路径与最早开始时间。
        - 严禁仅凭记忆回答，所有回答必须基于 `query_project_context` 查询到的事实。
 
     请开始处理上述文本，并首先通过调用工具完成数据入库。
@@ -2,6 +2,11 @@ import json
 from resources import YA_MCPServer_Resource
 from typing import Any
 
+from core.path_cache import path_cache_stats
+from core.query_stats import get_query_stats as _get_query_stats
+from core.reachability import reachability_stats
+from core.write_queue import write_queue_stats
+
 @YA_MCPServer_Resource(
     "resources://project_sop",
     name="project_sop",
@@ -28,16 +33,89 @@ def get_project_sop() -> str:
     "resources://neo4j_schema",
     name="neo4j_schema",
     title="Neo4j 图数据库 Schema 描述",
-    description="描述了数据库中 Task 节点和 DependsOn 关系的结构。"
+    description="描述了数据库中 Task 节点和 DependsOn 关系的结构，以及当前存在的索引与约束。"
 )
-def get_neo4j_schema() -> str:
+async def get_neo4j_schema() -> str:
     schema = {
-        "node_labels": {"Task": {"properties": ["name"]}},
+        "node_labels": {"Task": {"properties": ["project", "name"], "unique": [["project", "name"]]}},
         "relationship_types": {
             "DependsOn": "从后置任务指向前置任务 (Post)-[:DependsOn]->(Pre)"
         }
     }
-    return json.dumps(schema, ensure_ascii=False, indent=2)
+    try:
+        from core.graph_backend import get_backend
+        schema.update(await get_backend().describe_schema())
+    except Exception as e:
+        schema["indexes"] = {"error": f"无法读取索引信息: {e}"}
+    return json.dumps(schema, ensure_ascii=False, indent=2, default=str)
+
+@YA_MCPServer_Resource(
+    "resources://path_cache_stats",
+    name="path_cache_stats",
+    title="路径校验缓存统计",
+    description="按项目列出 validate_project_logic 路径结果缓存的命中 / 未命中次数、容量与失效情况，以及可达性索引的状态。"
+)
+def get_path_cache_stats() -> str:
+    stats = path_cache_stats()
+    indexes = reachability_stats()
+    # 只列出已经创建过缓存的项目，不为查看统计而新建后端
+    for project, project_stats in stats.items():
+        project_stats["reachability_index"] = indexes.get(project, {"enabled": False})
+    return json.dumps(stats, ensure_ascii=False, indent=2)
+
+@YA_MCPServer_Resource(
+    "resources://neo4j_pool_stats",
+    name="neo4j_pool_stats",
+    title="Neo4j 连接池状态",
+    description="连接池配置、当前使用中 / 空闲连接数、并发会话数与取连接等待时间。"
+)
+def get_neo4j_pool_stats() -> str:
+    try:
+        from core.graph_backend import get_backend
+        backend = get_backend()
+        stats = backend.pool_stats()
+        if stats is None:
+            stats = {"backend": backend.name, "message": "当前后端不使用连接池"}
+    except Exception as e:
+        stats = {"error": f"无法读取连接池状态: {e}"}
+    return json.dumps(stats, ensure_ascii=False, indent=2, default=str)
+
+@YA_MCPServer_Resource(
+    "resources://query_stats",
+    name="query_stats",
+    title="查询耗时统计",
+    description="每个工具的调用延迟直方图、每类数据库查询的墙钟 / 数据库侧耗时、行数与参数大小、最近的慢查询，以及各项目写入合并队列的合批情况。"
+)
+def get_query_stats() -> str:
+    stats = _get_query_stats().snapshot()
+    stats["write_queues"] = write_queue_stats()
+    return json.dumps(stats, ensure_ascii=False, indent=2, default=str)
+
+async def _graph_stats(project=None) -> str:
+    try:
+        from core.graph_stats import get_graph_stats
+        stats = await get_graph_stats(project).snapshot()
+    except Exception as e:
+        stats = {"error": f"无法读取图谱统计: {e}"}
+    return json.dumps(stats, ensure_ascii=False, indent=2)
+
+@YA_MCPServer_Resource(
+    "resources://graph_stats",
+    name="graph_stats",
+    title="图谱规模统计",
+    description="默认项目的任务数、依赖数、入度 / 出度直方图、根任务与叶任务、最长依赖链深度估计；计数随写入增量维护，读取无需扫描全图。"
+)
+async def get_graph_stats() -> str:
+    return await _graph_stats()
+
+@YA_MCPServer_Resource(
+    "resources://graph_stats/{project}",
+    name="project_graph_stats",
+    title="项目图谱规模统计",
+    description="指定项目的 graph_stats。"
+)
+async def get_project_graph_stats(project: str) -> str:
+    return await _graph_stats(project)
 
 @YA_MCPServer_Resource(
     "resources://demo_json",
@@ -0,0 +1,91 @@
+"""
+测试公用工具：随机图生成、内存后端搭建与暴力参考实现
+
+邻接表与后端一致，为 {post: {pre, ...}}，即沿 DependsOn 方向。
+"""
+
+import random
+from collections import deque
+from typing import Dict, Iterator, List, Optional, Set
+
+from core import graph_backend
+from core.memory_graph import MemoryGraphBackend
+
+Adjacency = Dict[str, Set[str]]
+
+
+def random_graph(rng: random.Random, nodes: int, edges: int, acyclic: bool = False) -> Adjacency:
+    """随机有向图；acyclic=True 时只从编号大的任务指向编号小的任务。"""
+    names = [f"t{i}" for i in range(nodes)]
+    adj: Adjacency = {name: set() for name in names}
+    for _ in range(edges):
+        a, b = rng.sample(range(nodes), 2)
+        if acyclic and a < b:
+            a, b = b, a
+        adj[names[a]].add(names[b])
+    return adj
+
+
+def relationships(adj: Adjacency) -> List[Dict[str, str]]:
+    return [{"pre": pre, "post": post} for post, pres in sorted(adj.items()) for pre in sorted(pres)]
+
+
+async def memory_backend(adj: Adjacency, project: str = "test") -> MemoryGraphBackend:
+    backend = MemoryGraphBackend(project)
+    await backend.upsert_chunked(relationships(adj))
+    # 没有关系的孤立任务也要存在
+    await backend.set_task_properties({name: {} for name in adj})
+    return backend
+
+
+def install_backend(project: str) -> MemoryGraphBackend:
+    """为工具层测试注册项目的内存后端；挂在旧实例上的缓存与索引会随之重建。"""
+    backend = graph_backend._backends[project] = MemoryGraphBackend(project)
+    return backend
+
+
+def distance(adj: Adjacency, start: str, end: str) -> Optional[int]:
+    """start 沿 DependsOn 到 end 的最少跳数（至少一跳），不可达时为 None。"""
+    seen = {start}
+    queue = deque([(start, 0)])
+    while queue:
+        node, hops = queue.popleft()
+        for pre in adj.get(node, ()):
+            if pre == end:
+                return hops + 1
+            if pre not in seen:
+                seen.add(pre)
+                queue.append((pre, hops + 1))
+    return None
+
+
+def reachable(adj: Adjacency, start: str) -> Set[str]:
+    """start 沿 DependsOn（至少一跳）可达的全部任务。"""
+    seen: Set[str] = set()
+    stack = list(adj.get(start, ()))
+    while stack:
+        node = stack.pop()
+        if node not in seen:
+            seen.add(node)
+            stack.extend(adj.get(node, ()))
+    return seen
+
+
+def simple_paths(adj: Adjacency, start: str, end: str) -> Iterator[List[str]]:
+    """start 到 end（start != end）的全部简单路径。"""
+    path = [start]
+
+    def walk(node: str) -> Iterator[List[str]]:
+        for pre in sorted(adj.get(node, ())):
+            if pre == end:
+                yield path + [end]
+            elif pre not in path:
+                path.append(pre)
+                yield from walk(pre)
+                path.pop()
+
+    yield from walk(start)
+
+
+def is_path(adj: Adjacency, path: List[str]) -> bool:
+    return all(pre in adj.get(post, ()) for post, pre in zip(path, path[1:]))
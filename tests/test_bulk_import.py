@@ -0,0 +1,46 @@
+import csv
+import tempfile
+import unittest
+from pathlib import Path
+
+from core.bulk_import import ImportProgress, dedupe_edges, iter_edges, write_admin_files
+
+
+class BulkImportTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.dir.cleanup)
+
+    def write(self, name, text):
+        path = Path(self.dir.name) / name
+        path.write_text(text, encoding="utf-8")
+        return path
+
+    def test_csv_and_jsonl_read_the_same_edges(self):
+        csv_path = self.write("edges.csv", "pre,post\n设计,开发\n开发,测试\n,测试\n设计,开发\n")
+        jsonl_path = self.write(
+            "edges.jsonl",
+            '{"pre": "设计", "post": "开发"}\n\n{"pre": "开发", "post": "测试"}\nnot json\n{"pre": "设计", "post": "开发"}\n',
+        )
+        for path, fmt, malformed in ((csv_path, "csv", (4, None, "测试")), (jsonl_path, "jsonl", (4, None, None))):
+            rows = list(iter_edges(path, fmt))
+            self.assertIn(malformed, rows)
+            progress = ImportProgress()
+            edges = list(dedupe_edges(rows, progress))
+            self.assertEqual([(pre, post) for _, pre, post in edges], [("设计", "开发"), ("开发", "测试")])
+            self.assertEqual((progress.rows, progress.malformed, progress.duplicates), (4, 1, 1))
+
+    def test_admin_files(self):
+        progress = ImportProgress()
+        out = write_admin_files(
+            [(2, "设计", "开发"), (3, "开发", "测试")], progress, Path(self.dir.name) / "admin", "alpha"
+        )
+        with open(out["nodes"], encoding="utf-8") as f:
+            self.assertEqual(list(csv.reader(f))[1:], [["设计", "alpha", "Task"], ["开发", "alpha", "Task"], ["测试", "alpha", "Task"]])
+        with open(out["relationships"], encoding="utf-8") as f:
+            self.assertEqual(list(csv.reader(f))[1:], [["开发", "设计", "DependsOn"], ["测试", "开发", "DependsOn"]])
+        self.assertEqual(progress.loaded, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
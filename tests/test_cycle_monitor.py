@@ -0,0 +1,66 @@
+import random
+import unittest
+
+from core.cycle_monitor import CycleMonitor
+from core.graph_algorithms import find_cycles
+from tests.helpers import memory_backend, random_graph
+
+
+class CycleMonitorTest(unittest.IsolatedAsyncioTestCase):
+    async def test_incremental_matches_full_scan(self):
+        rng = random.Random(13)
+        for _ in range(100):
+            adj = random_graph(rng, 10, rng.randint(0, 12))
+            backend = await memory_backend(adj)
+            monitor = CycleMonitor(backend)
+            self.assertEqual((await monitor.check())["mode"], "full")
+            for _ in range(8):
+                pre, post = rng.sample(list(adj), 2)
+                await backend.upsert_chunked([{"pre": pre, "post": post}])
+                adj[post].add(pre)
+                report = await monitor.check()
+                self.assertEqual(report["mode"], "incremental")
+                self.assertEqual(report["cycles"], find_cycles(await backend.fetch_edges()))
+            self.assertEqual((await monitor.check())["mode"], "cached")
+
+    async def test_deleting_a_cycle_edge_clears_the_cycle(self):
+        backend = await memory_backend({"A": {"B"}, "B": {"C"}, "C": {"A"}, "D": {"A"}})
+        monitor = CycleMonitor(backend)
+        self.assertEqual([c["tasks"] for c in (await monitor.check())["cycles"]], [["A", "B", "C"]])
+        await backend.delete_chunked([{"pre": "A", "post": "C"}])
+        report = await monitor.check()
+        self.assertEqual((report["mode"], report["cycles"]), ("incremental", []))
+
+    async def test_deleting_an_edge_keeps_the_remaining_cycle(self):
+        # P->X->Y->X 与 Y->P：删掉 P->X 后 P 不在环上，但 X<->Y 仍成环
+        backend = await memory_backend({"P": {"X"}, "X": {"Y"}, "Y": {"X", "P"}})
+        monitor = CycleMonitor(backend)
+        self.assertEqual([c["tasks"] for c in (await monitor.check())["cycles"]], [["P", "X", "Y"]])
+        await backend.delete_chunked([{"post": "P", "pre": "X"}])
+        report = await monitor.check()
+        self.assertEqual(report["mode"], "incremental")
+        self.assertEqual([c["tasks"] for c in report["cycles"]], [["X", "Y"]])
+
+    async def test_incremental_matches_full_scan_with_deletes(self):
+        rng = random.Random(29)
+        for _ in range(100):
+            adj = random_graph(rng, 8, rng.randint(4, 16))
+            backend = await memory_backend(adj)
+            monitor = CycleMonitor(backend)
+            await monitor.check()
+            for _ in range(10):
+                edges = [(post, pre) for post, pres in adj.items() for pre in pres]
+                if edges and rng.random() < 0.5:
+                    post, pre = rng.choice(edges)
+                    await backend.delete_chunked([{"pre": pre, "post": post}])
+                    adj[post].discard(pre)
+                else:
+                    pre, post = rng.sample(list(adj), 2)
+                    await backend.upsert_chunked([{"pre": pre, "post": post}])
+                    adj[post].add(pre)
+                report = await monitor.check()
+                self.assertEqual(report["cycles"], find_cycles(await backend.fetch_edges()))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+import random
+import unittest
+
+from core import graph_backend
+from core.graph_algorithms import CyclicDependencyError, find_cycles, schedule, topological_order
+from tests.helpers import install_backend, is_path, random_graph, reachable
+from tools import logic_guardian
+
+
+def brute_cycles(adj):
+    closure = {name: reachable(adj, name) for name in adj}
+    components = set()
+    for name in adj:
+        if name in closure[name]:
+            components.add(tuple(sorted(other for other in closure[name] if name in closure[other])))
+    return sorted(list(component) for component in components)
+
+
+class FindCyclesTest(unittest.TestCase):
+    def test_matches_mutual_reachability(self):
+        rng = random.Random(4)
+        for _ in range(200):
+            adj = random_graph(rng, 10, rng.randint(0, 25))
+            if rng.random() < 0.2:
+                node = rng.choice(list(adj))
+                adj[node].add(node)
+            cycles = find_cycles(adj)
+            self.assertEqual([c["tasks"] for c in cycles], brute_cycles(adj))
+            for cycle in cycles:
+                chain = cycle["chain"]
+                self.assertEqual(chain[0], chain[-1])
+                self.assertTrue(is_path(adj, chain))
+                self.assertTrue(set(chain) <= set(cycle["tasks"]))
+
+    def test_long_chain_does_not_recurse(self):
+        adj = {f"t{i}": {f"t{i + 1}"} for i in range(20000)}
+        adj["t20000"] = {"t0"}
+        self.assertEqual(len(find_cycles(adj)[0]["tasks"]), 20001)
+
+
+class TopologicalOrderTest(unittest.TestCase):
+    def test_order_respects_dependencies(self):
+        rng = random.Random(5)
+        for _ in range(200):
+            adj = random_graph(rng, 10, rng.randint(0, 25), acyclic=rng.random() < 0.5)
+            order, blocked = topological_order(adj)
+            self.assertEqual(sorted(order + blocked), sorted(adj))
+            position = {name: i for i, name in enumerate(order)}
+            for post in order:
+                for pre in adj[post]:
+                    self.assertLess(position[pre], position[post])
+            # 无法排序的恰好是环上的任务以及（间接）依赖环的任务
+            on_cycle = {name for c in brute_cycles(adj) for name in c}
+            expected = sorted(
+                name for name in adj if name in on_cycle or reachable(adj, name) & on_cycle
+            )
+            self.assertEqual(blocked, expected)
+
+
+class ScheduleTest(unittest.TestCase):
+    def test_critical_path(self):
+        adj = {"联调": {"前端", "后端"}, "前端": {"设计"}, "后端": {"设计"}, "设计": set()}
+        plan = schedule(adj, {"设计": 2, "前端": 1, "后端": 3, "联调": 1})
+        self.assertEqual(plan["total_duration"], 6)
+        self.assertEqual(plan["critical_path"], ["设计", "后端", "联调"])
+        self.assertEqual(plan["layers"], [["设计"], ["前端", "后端"], ["联调"]])
+        self.assertEqual(plan["tasks"]["前端"]["slack"], 2)
+
+    def test_cycle_raises(self):
+        with self.assertRaises(CyclicDependencyError) as caught:
+            schedule({"A": {"B"}, "B": {"A"}}, {})
+        self.assertEqual(caught.exception.blocked, ["A", "B"])
+
+
+class ComputeScheduleToolTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.project = "schedule"
+        install_backend(self.project)
+
+    def tearDown(self):
+        graph_backend.discard_backend(self.project)
+
+    async def test_only_real_cycles_are_cyclic(self):
+        await logic_guardian.batch_upsert_logic(
+            [{"pre": "设计", "post": "开发"}, {"pre": "开发", "post": "设计"}], project=self.project
+        )
+        cyclic = await logic_guardian.compute_schedule(project=self.project)
+        self.assertEqual(cyclic["status"], "CYCLIC")
+        bad_project = await logic_guardian.compute_schedule(project="not a project")
+        self.assertEqual(bad_project["status"], "ERROR")
+        blank_name = await logic_guardian.compute_schedule(task_names=["设计", " "], project=self.project)
+        self.assertEqual(blank_name["status"], "ERROR")
+
+
+if __name__ == "__main__":
+    unittest.main()
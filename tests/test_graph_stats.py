@@ -0,0 +1,57 @@
+import random
+import unittest
+
+from core.graph_stats import GraphStats
+from tests.helpers import memory_backend, random_graph
+
+COUNTED = ("tasks", "dependencies", "out_degree_histogram", "in_degree_histogram")
+
+
+class GraphStatsTest(unittest.IsolatedAsyncioTestCase):
+    async def test_incremental_counts_match_a_fresh_load(self):
+        rng = random.Random(17)
+        for _ in range(30):
+            adj = random_graph(rng, 12, rng.randint(0, 20), acyclic=True)
+            backend = await memory_backend(adj)
+            stats = GraphStats(backend, sample_size=100)
+            await stats.snapshot()
+            for _ in range(15):
+                a, b = sorted(rng.sample(range(14), 2), reverse=True)
+                rel = {"pre": f"t{b}", "post": f"t{a}"}
+                if rng.random() < 0.4:
+                    await backend.delete_chunked([rel])
+                else:
+                    await backend.upsert_chunked([rel])
+            incremental = await stats.snapshot()
+            fresh = await GraphStats(backend, sample_size=100).snapshot()
+            for key in COUNTED + ("roots", "leaves"):
+                self.assertEqual(incremental[key], fresh[key], key)
+
+    async def test_isolated_tasks_are_counted(self):
+        backend = await memory_backend({"B": {"A"}})
+        stats = GraphStats(backend)
+        self.assertEqual((await stats.snapshot())["tasks"], 2)
+        await backend.set_task_properties({"孤立任务": {"description": "没有任何依赖"}, "A": {"duration": 2}})
+        snapshot = await stats.snapshot()
+        self.assertEqual((snapshot["tasks"], snapshot["dependencies"]), (3, 1))
+        self.assertEqual((snapshot["roots"]["count"], snapshot["leaves"]["count"]), (2, 2))
+        fresh = await GraphStats(backend).snapshot()
+        for key in COUNTED:
+            self.assertEqual(snapshot[key], fresh[key], key)
+
+    async def test_depth_estimate_is_a_lower_bound_after_writes(self):
+        backend = await memory_backend({"B": {"A"}, "D": {"C"}})
+        stats = GraphStats(backend, depth_refresh_seconds=3600)
+        self.assertEqual((await stats.snapshot())["max_depth"]["estimate"], 1)
+        # C 抬高到第 2 层，但它的下游 D 没有随之更新
+        await backend.upsert_chunked([{"pre": "B", "post": "C"}])
+        depth = (await stats.snapshot())["max_depth"]
+        self.assertEqual((depth["estimate"], depth["exact"]), (2, False))
+
+        stats.depth_refresh_seconds = 0
+        depth = (await stats.snapshot())["max_depth"]
+        self.assertEqual((depth["estimate"], depth["exact"]), (3, True))
+
+
+if __name__ == "__main__":
+    unittest.main()
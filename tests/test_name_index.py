@@ -0,0 +1,75 @@
+import random
+import unittest
+
+from core import graph_backend
+from core.name_index import NameIndex, _grams
+from tests.helpers import install_backend, memory_backend
+from tools import logic_guardian
+
+WORDS = ["系统", "设计", "后端", "前端", "开发", "测试", "联调", "部署", "验收", "文档", "接口", "数据库"]
+
+
+def dice(a, b):
+    ga, gb = _grams(a), _grams(b)
+    return 2 * len(ga & gb) / (len(ga) + len(gb))
+
+
+class NameIndexTest(unittest.IsolatedAsyncioTestCase):
+    async def test_suggest_matches_brute_force_dice(self):
+        rng = random.Random(18)
+        names = sorted({"".join(rng.sample(WORDS, rng.randint(1, 3))) for _ in range(300)})
+        backend = await memory_backend({name: set() for name in names})
+        index = NameIndex(backend, min_score=0.3)
+        await index.ensure_loaded()
+        for _ in range(50):
+            query = "".join(rng.sample(WORDS, rng.randint(1, 3)))
+            expected = sorted(
+                (round(dice(query, other), 3) for other in names if other != query and dice(query, other) >= 0.3),
+                reverse=True,
+            )[:5]
+            self.assertEqual([s["score"] for s in index.suggest(query, 5)], expected, query)
+            self.assertEqual(index.contains(query), query in names)
+
+    async def test_picks_up_new_names_from_writes(self):
+        backend = await memory_backend({"后端开发": {"系统设计"}})
+        index = NameIndex(backend)
+        await index.ensure_loaded()
+        await backend.upsert_chunked([{"pre": "后端开发", "post": "后端联调"}])
+        self.assertTrue(index.contains("后端联调"))
+        self.assertEqual(index.suggest("后端联调测试", 1)[0]["name"], "后端联调")
+        # 只通过属性创建的孤立任务同样要进入索引
+        await backend.set_task_properties({"验收文档": {}})
+        self.assertTrue(index.contains("验收文档"))
+
+
+class UnknownTaskTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.project = "name_index"
+        install_backend(self.project)
+
+    def tearDown(self):
+        graph_backend.discard_backend(self.project)
+
+    async def test_typo_is_reported_with_suggestions(self):
+        await logic_guardian.batch_upsert_logic([{"pre": "系统设计", "post": "后端开发"}], project=self.project)
+        result = await logic_guardian.validate_project_logic("后端开发", "系统设", project=self.project)
+        self.assertEqual(result["status"], "INVALID")
+        self.assertEqual(list(result["unknown_tasks"]), ["系统设"])
+        self.assertEqual(result["unknown_tasks"]["系统设"][0]["name"], "系统设计")
+
+        found = await logic_guardian.suggest_task_names("后端 开发", project=self.project)
+        self.assertTrue(found["exists"])
+
+    async def test_task_created_through_properties_is_not_unknown(self):
+        await logic_guardian.batch_upsert_logic([{"pre": "系统设计", "post": "后端开发"}], project=self.project)
+        await logic_guardian.suggest_task_names("后端开发", project=self.project)
+        await logic_guardian.batch_upsert_logic(
+            [], task_properties={"验收文档": {"duration": 1}}, project=self.project
+        )
+        result = await logic_guardian.validate_project_logic("验收文档", "系统设计", project=self.project)
+        self.assertEqual(result["status"], "INVALID")
+        self.assertNotIn("unknown_tasks", result)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+import unittest
+
+from core import graph_backend
+from core.names import NameNormalizer, fold_name
+from tests.helpers import install_backend
+from tools import logic_guardian
+
+
+class FoldNameTest(unittest.TestCase):
+    def test_nfkc_and_whitespace(self):
+        self.assertEqual(fold_name("ＡＰＩ　设计"), "API 设计")
+        self.assertEqual(fold_name("  前端\t 开发  "), "前端开发")
+        self.assertEqual(fold_name("系统 设计 v2"), "系统设计 v2")
+        self.assertEqual(fold_name("Code  Review"), "Code Review")
+
+
+class NameNormalizerTest(unittest.TestCase):
+    def test_aliases_are_folded_too(self):
+        normalizer = NameNormalizer(aliases={"ＱＡ": "测试 验收"})
+        self.assertEqual(normalizer.normalize(" QA "), "测试验收")
+        self.assertEqual(normalizer.normalize("QA"), "测试验收")
+
+    def test_interning(self):
+        normalizer = NameNormalizer(intern_max_size=2)
+        first = normalizer.normalize("后端 开发")
+        self.assertIs(normalizer.normalize("后端开发"), first)
+        normalizer.normalize("a")
+        normalizer.normalize("b")
+        # 超过上限后缓存整体清空，不会无限增长
+        self.assertLessEqual(normalizer.stats()["interned"], 2)
+
+    def test_empty_and_disabled(self):
+        with self.assertRaises(ValueError):
+            NameNormalizer().normalize(" 　 ")
+        self.assertEqual(NameNormalizer(enabled=False).normalize("系统 设计"), "系统 设计")
+
+
+class IngestNormalizationTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.project = "names"
+        self.backend = install_backend(self.project)
+
+    def tearDown(self):
+        graph_backend.discard_backend(self.project)
+
+    async def test_variants_collapse_to_one_task(self):
+        result = await logic_guardian.batch_upsert_logic(
+            [
+                {"pre": "系统 设计", "post": "后端开发"},
+                {"pre": "系统设计", "post": "后端　开发"},
+                {"pre": " ", "post": "后端开发"},
+            ],
+            project=self.project,
+        )
+        self.assertEqual(result["status"], "PARTIAL")
+        self.assertEqual(result["deduplicated_rows"], 1)
+        self.assertEqual([f["row"] for f in result["failed_rows"]], [2])
+        self.assertEqual(result["renamed"], {"系统 设计": "系统设计", "后端　开发": "后端开发"})
+        self.assertEqual(await self.backend.fetch_edges(), {"后端开发": ["系统设计"], "系统设计": []})
+
+        valid = await logic_guardian.validate_project_logic("后端 开发", "系统　设计", project=self.project)
+        self.assertEqual(valid["status"], "VALID")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,116 @@
+import random
+import unittest
+
+from core import graph_backend
+from core.pagination import decode_cursor, encode_cursor
+from tests.helpers import install_backend, memory_backend, random_graph, relationships
+from tools import logic_guardian
+
+
+class CursorTest(unittest.TestCase):
+    def test_round_trip_and_kind_check(self):
+        cursor = encode_cursor("context", {"after": [0, 1, "任务"]})
+        self.assertEqual(decode_cursor("context", cursor), {"after": [0, 1, "任务"]})
+        self.assertIsNone(decode_cursor("context", None))
+        with self.assertRaises(ValueError):
+            decode_cursor("search", cursor)
+        with self.assertRaises(ValueError):
+            decode_cursor("context", "not a cursor")
+
+
+class NeighbourPageTest(unittest.IsolatedAsyncioTestCase):
+    async def test_pages_concatenate_to_sorted_neighbours(self):
+        adj = random_graph(random.Random(15), 30, 200)
+        backend = await memory_backend(adj)
+        for name in ("t0", "t7"):
+            for direction, expected in (
+                ("upstream", sorted(adj[name])),
+                ("downstream", sorted(post for post, pres in adj.items() if name in pres)),
+            ):
+                for limit in (1, 4, 100):
+                    seen, after = [], None
+                    while True:
+                        page = await backend.neighbour_page(name, direction, after, limit)
+                        self.assertLessEqual(len(page), limit)
+                        seen.extend(page)
+                        if len(page) < limit:
+                            break
+                        after = page[-1]
+                    self.assertEqual(seen, expected)
+
+
+class PagingTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.project = "paging"
+        install_backend(self.project)
+        rng = random.Random(11)
+        adj = random_graph(rng, 40, 160)
+        # 枢纽任务：大量直接上下游
+        adj["hub"] = {f"t{i}" for i in range(0, 40, 2)}
+        for i in range(1, 40, 2):
+            adj[f"t{i}"].add("hub")
+        await logic_guardian.batch_upsert_logic(relationships(adj), chunk_size=500, project=self.project)
+
+    def tearDown(self):
+        graph_backend.discard_backend(self.project)
+
+    async def read_all(self, tool, **kwargs):
+        pages, cursor = [], None
+        while True:
+            result = await tool(cursor=cursor, project=self.project, **kwargs)
+            self.assertNotEqual(result.get("status"), "ERROR", result)
+            pages.append(result)
+            cursor = result["next_cursor"]
+            if cursor is None:
+                return pages
+
+    async def test_context_pages_concatenate_to_full_result(self):
+        for depth in (1, 2, 3):
+            for direction in ("upstream", "downstream", "both"):
+                full = await logic_guardian.query_project_context(
+                    "hub", depth=depth, direction=direction, page_size=10000, project=self.project
+                )
+                self.assertIsNone(full["next_cursor"])
+                for page_size in (1, 3, 7):
+                    pages = await self.read_all(
+                        logic_guardian.query_project_context,
+                        task_name="hub", depth=depth, direction=direction, page_size=page_size,
+                    )
+                    self.assertTrue(all(len(p["nodes"]) <= page_size for p in pages))
+                    self.assertEqual([n for p in pages for n in p["nodes"]], full["nodes"])
+                    edges = [tuple(e) for p in pages for e in p["edges"]]
+                    self.assertEqual(len(edges), len(set(edges)))
+                    self.assertEqual(sorted(edges), sorted(tuple(e) for e in full["edges"]))
+
+    async def test_direct_context_agrees_with_default_query(self):
+        legacy = await logic_guardian.query_project_context("hub", project=self.project)
+        paged = await self.read_all(logic_guardian.query_project_context, task_name="hub", page_size=4)
+        nodes = [n for p in paged for n in p["nodes"]]
+        self.assertEqual(sorted(n["name"] for n in nodes if n["direction"] == "upstream"), sorted(legacy["pre_tasks"]))
+        self.assertEqual(sorted(n["name"] for n in nodes if n["direction"] == "downstream"), sorted(legacy["next_tasks"]))
+
+    async def test_cursor_bound_to_request(self):
+        first = await logic_guardian.query_project_context("hub", page_size=2, project=self.project)
+        # 每页大小可以变，查询本身（任务、跳数、方向、项目）不能变
+        resized = await logic_guardian.query_project_context(
+            "hub", page_size=3, cursor=first["next_cursor"], project=self.project
+        )
+        self.assertNotIn("status", resized)
+        other = await logic_guardian.query_project_context(
+            "hub", depth=2, page_size=2, cursor=first["next_cursor"], project=self.project
+        )
+        self.assertEqual(other["status"], "ERROR")
+
+    async def test_default_query_honours_direction(self):
+        upstream = await logic_guardian.query_project_context("hub", direction="upstream", project=self.project)
+        downstream = await logic_guardian.query_project_context("hub", direction="downstream", project=self.project)
+        both = await logic_guardian.query_project_context("hub", project=self.project)
+        self.assertEqual((set(upstream), set(downstream)), ({"task", "pre_tasks"}, {"task", "next_tasks"}))
+        self.assertEqual(sorted(upstream["pre_tasks"]), sorted(both["pre_tasks"]))
+        self.assertEqual(sorted(downstream["next_tasks"]), sorted(both["next_tasks"]))
+        bogus = await logic_guardian.query_project_context("hub", direction="sideways", project=self.project)
+        self.assertEqual(bogus["status"], "ERROR")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,41 @@
+import unittest
+
+from core.path_cache import PathCache
+from tests.helpers import memory_backend
+
+
+class PathCacheTest(unittest.IsolatedAsyncioTestCase):
+    async def test_write_invalidates_cached_result(self):
+        backend = await memory_backend({"B": {"A"}, "A": set()})
+        cache = PathCache(max_size=8, ttl_seconds=60)
+        generation = backend.generation
+        cache.put(("A", "B"), generation, None)
+        self.assertEqual(cache.get(("A", "B"), backend.generation), (True, None))
+
+        await backend.upsert_chunked([{"pre": "B", "post": "A"}])
+        self.assertEqual(cache.get(("A", "B"), backend.generation), (False, None))
+        self.assertEqual(cache.stats()["invalidations"], 1)
+        self.assertEqual(await backend.check_path("A", "B"), ["A", "B"])
+
+    def test_lru_eviction_and_ttl(self):
+        cache = PathCache(max_size=2, ttl_seconds=60)
+        cache.put("a", 0, ["a"])
+        cache.put("b", 0, ["b"])
+        cache.get("a", 0)
+        cache.put("c", 0, ["c"])
+        self.assertEqual(cache.get("b", 0), (False, None))
+        self.assertEqual(cache.get("a", 0), (True, ["a"]))
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+        expired = PathCache(max_size=2, ttl_seconds=0)
+        expired.put("a", 0, ["a"])
+        self.assertEqual(expired.get("a", 0), (False, None))
+
+    def test_disabled_when_size_is_zero(self):
+        cache = PathCache(max_size=0)
+        cache.put("a", 0, ["a"])
+        self.assertEqual(cache.stats()["size"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,139 @@
+import random
+import unittest
+
+from core.graph_backend import PathSearchBudgetExceeded, resolve_max_depth
+from tests.helpers import distance, is_path, memory_backend, random_graph, simple_paths
+
+
+class CheckPathTest(unittest.IsolatedAsyncioTestCase):
+    async def test_shortest_path_matches_bfs(self):
+        rng = random.Random(1)
+        for _ in range(60):
+            adj = random_graph(rng, 10, rng.randint(5, 25))
+            backend = await memory_backend(adj)
+            for start in adj:
+                for end in adj:
+                    for max_depth in (None, 2):
+                        expected = distance(adj, start, end)
+                        if expected is not None and max_depth is not None and expected > max_depth:
+                            expected = None
+                        path = await backend.check_path(start, end, max_depth)
+                        if expected is None:
+                            self.assertIsNone(path, (start, end, max_depth))
+                        else:
+                            self.assertEqual(len(path) - 1, expected, (start, end, max_depth))
+                            self.assertEqual((path[0], path[-1]), (start, end))
+                            self.assertTrue(is_path(adj, path))
+
+    async def test_unknown_task_has_no_path(self):
+        backend = await memory_backend({"B": {"A"}, "A": set()})
+        self.assertIsNone(await backend.check_path("B", "缺失任务"))
+        self.assertIsNone(await backend.check_path("缺失任务", "A"))
+
+    async def test_unbounded_depth_and_visit_budget(self):
+        chain = {f"t{i}": {f"t{i + 1}"} for i in range(30)}
+        backend = await memory_backend(chain)
+        self.assertIsNone(await backend.check_path("t0", "t30"))
+        self.assertEqual(len(await backend.check_path("t0", "t30", resolve_max_depth(0))), 31)
+        backend.visit_budget = 5
+        with self.assertRaises(PathSearchBudgetExceeded):
+            await backend.check_path("t0", "t30", None)
+        with self.assertRaises(ValueError):
+            resolve_max_depth(-1)
+
+    async def test_batch_matches_single(self):
+        rng = random.Random(2)
+        for _ in range(40):
+            adj = random_graph(rng, 9, rng.randint(5, 20))
+            backend = await memory_backend(adj)
+            names = list(adj) + ["missing"]
+            pairs = [(rng.choice(names), rng.choice(names)) for _ in range(30)]
+            for max_depth in (None, 3):
+                paths = await backend.check_paths(pairs, max_depth)
+                for (start, end), path in zip(pairs, paths):
+                    single = await backend.check_path(start, end, max_depth)
+                    self.assertEqual(path is None, single is None, (start, end))
+                    if path is not None:
+                        self.assertEqual(len(path), len(single))
+                        self.assertTrue(is_path(adj, path))
+
+
+class ContextTest(unittest.IsolatedAsyncioTestCase):
+    async def test_direct_neighbours(self):
+        rng = random.Random(12)
+        adj = random_graph(rng, 15, 40)
+        backend = await memory_backend(adj)
+        for name in adj:
+            pres, posts = await backend.get_context(name)
+            self.assertEqual(sorted(pres), sorted(adj[name]))
+            self.assertEqual(sorted(posts), sorted(post for post, p in adj.items() if name in p))
+
+    async def test_expand_matches_bfs_layers(self):
+        rng = random.Random(14)
+        for _ in range(40):
+            adj = random_graph(rng, 12, rng.randint(5, 30))
+            backend = await memory_backend(adj)
+            downstream = {name: {post for post, pres in adj.items() if name in pres} for name in adj}
+            for direction, index in (("upstream", adj), ("downstream", downstream)):
+                start = rng.choice(list(adj))
+                for depth in (1, 2, 4):
+                    hops, edges, truncated = await backend.expand(start, depth, direction, 1000)
+                    self.assertFalse(truncated)
+                    expected = {start: 0}
+                    frontier = [start]
+                    for hop in range(1, depth + 1):
+                        frontier = [o for n in frontier for o in sorted(index[n]) if o not in expected]
+                        expected.update((o, hop) for o in frontier)
+                    del expected[start]
+                    self.assertEqual(hops, expected)
+                    expected_edges = {
+                        (node, other) if direction == "upstream" else (other, node)
+                        for node in [start, *hops] if hops.get(node, 0) < depth
+                        for other in index[node]
+                    }
+                    self.assertEqual(len(edges), len(expected_edges))
+                    self.assertEqual(set(edges), expected_edges)
+
+    async def test_expand_stops_at_max_visit(self):
+        backend = await memory_backend({"B": {"A1", "A2", "A3"}})
+        hops, _, truncated = await backend.expand("B", 3, "upstream", 2)
+        self.assertTrue(truncated)
+        self.assertEqual(len(hops), 2)
+
+    async def test_rewrites_are_idempotent(self):
+        adj = {"B": {"A"}, "C": {"A", "B"}, "A": set()}
+        backend = await memory_backend(adj)
+        report = await backend.upsert_chunked([{"pre": "A", "post": "B"}] * 3, chunk_size=2)
+        self.assertEqual([c["rows"] for c in report["chunks"]], [2, 1])
+        self.assertEqual(report["failed_rows"], [])
+        schema = await backend.describe_schema()
+        self.assertEqual((schema["node_count"], schema["relationship_count"]), (3, 3))
+
+
+class KPathsTest(unittest.IsolatedAsyncioTestCase):
+    async def test_k_shortest_simple_paths(self):
+        rng = random.Random(3)
+        for _ in range(60):
+            adj = random_graph(rng, 8, rng.randint(8, 20))
+            backend = await memory_backend(adj)
+            start, end = rng.sample(list(adj), 2)
+            for max_depth in (None, 3):
+                everything = [
+                    p for p in simple_paths(adj, start, end)
+                    if max_depth is None or len(p) - 1 <= max_depth
+                ]
+                k = rng.randint(1, 6)
+                paths, timed_out = await backend.k_paths(start, end, k, 5.0, max_depth)
+                self.assertFalse(timed_out)
+                self.assertEqual(
+                    [len(p) for p in paths], sorted(len(p) for p in everything)[:k], (start, end, max_depth)
+                )
+                self.assertEqual(len({tuple(p) for p in paths}), len(paths))
+                for path in paths:
+                    self.assertEqual((path[0], path[-1]), (start, end))
+                    self.assertEqual(len(set(path)), len(path))
+                    self.assertTrue(is_path(adj, path))
+
+
+if __name__ == "__main__":
+    unittest.main()
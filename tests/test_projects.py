@@ -0,0 +1,54 @@
+import unittest
+
+from core import graph_backend
+from core.graph_backend import resolve_project
+from tests.helpers import install_backend
+from tools import logic_guardian
+
+
+class ProjectIsolationTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.projects = ("alpha", "beta")
+        for project in self.projects:
+            install_backend(project)
+
+    def tearDown(self):
+        for project in self.projects:
+            graph_backend.discard_backend(project)
+
+    async def test_same_names_in_different_projects(self):
+        await logic_guardian.batch_upsert_logic([{"pre": "设计", "post": "开发"}], project="alpha")
+        await logic_guardian.batch_upsert_logic([{"pre": "开发", "post": "设计"}], project="beta")
+
+        alpha = await logic_guardian.validate_project_logic("开发", "设计", project="alpha")
+        beta = await logic_guardian.validate_project_logic("开发", "设计", project="beta")
+        self.assertEqual((alpha["status"], beta["status"]), ("VALID", "INVALID"))
+        # 跨项目的两条边放在一起会成环，分开时两个项目都无环
+        for project in self.projects:
+            report = await logic_guardian.detect_logic_cycles(project=project)
+            self.assertEqual(report["status"], "ACYCLIC", project)
+
+    async def test_drop_project_requires_confirm_and_keeps_others(self):
+        for project in self.projects:
+            await logic_guardian.batch_upsert_logic([{"pre": "设计", "post": "开发"}], project=project)
+        alpha = graph_backend.get_backend("alpha")
+        refused = await logic_guardian.drop_project("alpha")
+        self.assertEqual(refused["status"], "ERROR")
+        self.assertEqual(len(await alpha.fetch_edges()), 2)
+
+        dropped = await logic_guardian.drop_project("alpha", confirm=True)
+        self.assertEqual(dropped["status"], "SUCCESS")
+        self.assertEqual(await alpha.fetch_edges(), {})
+        # 实例被丢弃，挂在其上的缓存与索引不会再被复用
+        self.assertNotIn("alpha", graph_backend._backends)
+        self.assertEqual(len(await graph_backend.get_backend("beta").fetch_edges()), 2)
+
+    async def test_invalid_project_name(self):
+        with self.assertRaises(ValueError):
+            resolve_project("../etc")
+        result = await logic_guardian.validate_project_logic("开发", "设计", project="a b")
+        self.assertEqual(result["status"], "ERROR")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+import unittest
+
+from core.query_stats import LatencyHistogram, QueryStats
+
+
+class LatencyHistogramTest(unittest.TestCase):
+    def test_quantiles_use_bucket_upper_bounds(self):
+        histogram = LatencyHistogram()
+        for ms in [0.5] * 90 + [30] * 9 + [20000]:
+            histogram.observe(ms)
+        histogram.observe(3, error=True)
+        stats = histogram.to_dict()
+        self.assertEqual((stats["count"], stats["errors"]), (101, 1))
+        self.assertEqual(stats["p50_ms"], 1)
+        self.assertEqual(stats["p95_ms"], 50)
+        # 最后一个桶没有上界，以观测到的最大值代替
+        self.assertEqual(stats["p99_ms"], 50)
+        self.assertEqual(histogram.quantile(1.0), 20000)
+        self.assertEqual(stats["histogram"], {"le_1ms": 90, "le_5ms": 1, "le_50ms": 9, "inf": 1})
+
+    def test_quantile_never_exceeds_max(self):
+        histogram = LatencyHistogram()
+        histogram.observe(3)
+        self.assertEqual(histogram.quantile(0.5), 3)
+        self.assertIsNone(LatencyHistogram().quantile(0.5))
+
+
+class QueryStatsTest(unittest.TestCase):
+    def test_slow_log_is_bounded_and_aggregates_db_timings(self):
+        stats = QueryStats(slow_query_ms=100, slow_log_size=2)
+        with self.assertLogs("LogicGuardian.SlowQuery", "WARNING") as logs:
+            for i in range(3):
+                stats.record_query("_check_path_tx", 150 + i, available_after_ms=4, consumed_after_ms=6, rows=2)
+        stats.record_query("_check_path_tx", 10, rows=1, error="timeout")
+        stats.record_tool("validate_project_logic", 12)
+        self.assertEqual(len(logs.output), 3)
+
+        snapshot = stats.snapshot()
+        self.assertEqual([e["wall_ms"] for e in snapshot["slow_queries"]], [151, 152])
+        query = snapshot["queries"]["_check_path_tx"]
+        self.assertEqual((query["count"], query["errors"]), (4, 1))
+        # 没有返回数据库侧耗时的样本不计入平均值
+        self.assertEqual(query["db_avg_ms"], {"available_after": 4, "consumed_after": 6})
+        self.assertEqual(query["avg_rows"], 1.8)
+        self.assertEqual(snapshot["tools"]["validate_project_logic"]["count"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
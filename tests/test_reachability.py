@@ -0,0 +1,60 @@
+import random
+import unittest
+
+from core.reachability import ReachabilityIndex
+from tests.helpers import memory_backend, random_graph, reachable
+
+
+class ReachabilityIndexTest(unittest.IsolatedAsyncioTestCase):
+    def assertMatches(self, index, adj):
+        for start in adj:
+            closure = reachable(adj, start)
+            for end in adj:
+                self.assertEqual(index.reaches(start, end), end in closure, (start, end))
+
+    async def test_bulk_build_matches_closure(self):
+        rng = random.Random(7)
+        for _ in range(50):
+            adj = random_graph(rng, 12, rng.randint(0, 30))
+            index = ReachabilityIndex(await memory_backend(adj))
+            self.assertTrue(await index.ensure_loaded())
+            self.assertMatches(index, adj)
+
+    async def test_incremental_writes_and_deletes(self):
+        rng = random.Random(8)
+        for _ in range(30):
+            adj = random_graph(rng, 10, rng.randint(0, 15))
+            backend = await memory_backend(adj)
+            index = ReachabilityIndex(backend)
+            await index.ensure_loaded()
+            for _ in range(10):
+                pre, post = rng.sample(list(adj), 2)
+                if pre in adj[post] and rng.random() < 0.5:
+                    await backend.delete_chunked([{"pre": pre, "post": post}])
+                    adj[post].discard(pre)
+                else:
+                    await backend.upsert_chunked([{"pre": pre, "post": post}])
+                    adj[post].add(pre)
+                self.assertTrue(await index.ensure_loaded())
+                self.assertMatches(index, adj)
+
+    async def test_rebuilds_after_max_age(self):
+        backend = await memory_backend({"B": {"A"}, "C": set()})
+        index = ReachabilityIndex(backend, max_age_seconds=60)
+        await index.ensure_loaded()
+        # 绕过写入监听，模拟 bulk_import 等其他进程写入同一个库
+        await backend._write_chunk([{"pre": "B", "post": "C"}], [])
+        await index.ensure_loaded()
+        self.assertFalse(index.reaches("C", "A"))
+        index._loaded_at -= 61
+        await index.ensure_loaded()
+        self.assertTrue(index.reaches("C", "A"))
+
+    async def test_disabled_above_max_nodes(self):
+        index = ReachabilityIndex(await memory_backend({"B": {"A"}, "C": set()}), max_nodes=2)
+        self.assertFalse(await index.ensure_loaded())
+        self.assertTrue(index.disabled)
+
+
+if __name__ == "__main__":
+    unittest.main()
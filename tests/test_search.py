@@ -0,0 +1,64 @@
+import unittest
+
+from core import graph_backend
+from core.memory_graph import _analyze
+from tests.helpers import install_backend
+from tools import logic_guardian
+
+
+class AnalyzerTest(unittest.TestCase):
+    def test_cjk_bigrams_and_words(self):
+        self.assertEqual(_analyze("ＡＰＩ接口测试"), ["api", "接口", "口测", "测试"])
+        self.assertEqual(_analyze("部署 v2"), ["v2", "部署"])
+        self.assertEqual(_analyze("测"), ["测"])
+
+
+class SearchTasksTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.project = "search"
+        install_backend(self.project)
+        await logic_guardian.batch_upsert_logic(
+            [{"pre": "系统设计", "post": "接口测试"}, {"pre": "接口测试", "post": "上线"}],
+            task_properties={
+                "上线": {"description": "通过回归测试后发布"},
+                **{f"任务{i}": {"description": f"测试任务 {i}"} for i in range(40)},
+            },
+            project=self.project,
+        )
+
+    def tearDown(self):
+        graph_backend.discard_backend(self.project)
+
+    async def read_all(self, **kwargs):
+        pages, cursor = [], None
+        while True:
+            result = await logic_guardian.search_tasks(cursor=cursor, project=self.project, **kwargs)
+            self.assertEqual(result["status"], "SUCCESS", result)
+            pages.append(result)
+            cursor = result["next_cursor"]
+            if cursor is None:
+                return pages
+
+    async def test_name_and_description_matches(self):
+        result = await logic_guardian.search_tasks("接口", project=self.project)
+        self.assertEqual([r["name"] for r in result["results"]], ["接口测试"])
+        result = await logic_guardian.search_tasks("回归", project=self.project)
+        self.assertEqual([r["name"] for r in result["results"]], ["上线"])
+
+    async def test_pages_concatenate_to_full_result(self):
+        full = await logic_guardian.search_tasks("测试", top_k=200, project=self.project)
+        self.assertEqual(len(full["results"]), 42)
+        scores = [r["score"] for r in full["results"]]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+        pages = await self.read_all(query="测试", top_k=6)
+        self.assertEqual([r for p in pages for r in p["results"]], full["results"])
+
+    async def test_cursor_bound_to_query(self):
+        first = await logic_guardian.search_tasks("测试", top_k=2, project=self.project)
+        other = await logic_guardian.search_tasks("任务", top_k=2, cursor=first["next_cursor"], project=self.project)
+        self.assertEqual(other["status"], "ERROR")
+        self.assertEqual((await logic_guardian.search_tasks("  ", project=self.project))["status"], "ERROR")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+import os
+import random
+import tempfile
+import unittest
+
+from core import graph_backend
+from core.memory_graph import MemoryGraphBackend
+from core.snapshot import (
+    export_snapshot, import_snapshot, read_snapshot, resolve_snapshot_path, snapshot_path, write_snapshot,
+)
+from tests.helpers import install_backend, memory_backend, random_graph
+from tools import logic_guardian
+
+
+def normalized(edges):
+    return {name: sorted(pres) for name, pres in edges.items()}
+
+
+class SnapshotTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.dir.cleanup)
+
+    def test_round_trip(self):
+        rng = random.Random(9)
+        for compress in (False, True):
+            for trial in range(20):
+                adj = random_graph(rng, rng.randint(2, 15), rng.randint(0, 30))
+                # 非 ASCII 名称与孤立任务
+                adj["孤立任务"] = set()
+                adj["后端开发"] = {"系统设计"}
+                adj["系统设计"] = set()
+                properties = {"后端开发": {"duration": 3, "description": "订单接口"}}
+                path = os.path.join(self.dir.name, f"{compress}-{trial}.snap")
+                stats = write_snapshot(path, adj, properties, compress)
+                snapshot = read_snapshot(path)
+                self.assertEqual(normalized(snapshot.adjacency()), normalized(adj))
+                self.assertEqual(snapshot.properties, properties)
+                self.assertEqual(stats["edges"], sum(len(pres) for pres in adj.values()))
+
+    def test_rejects_other_files(self):
+        path = os.path.join(self.dir.name, "not.snap")
+        with open(path, "wb") as f:
+            f.write(b"x" * 64)
+        with self.assertRaises(ValueError):
+            read_snapshot(path)
+
+    async def test_export_import_and_warm_load(self):
+        adj = random_graph(random.Random(10), 30, 60)
+        adj["孤立任务"] = set()
+        source = await memory_backend(adj)
+        await source.set_task_properties({"t1": {"duration": 2}})
+        path = os.path.join(self.dir.name, "graph.snap")
+        await export_snapshot(source, path)
+
+        imported = MemoryGraphBackend()
+        report = await import_snapshot(imported, path)
+        self.assertEqual(report["failed_rows"], [])
+        loaded = MemoryGraphBackend()
+        loaded.load_snapshot(path)
+        for backend in (imported, loaded):
+            self.assertEqual(normalized(await backend.fetch_edges()), normalized(adj))
+            self.assertEqual(await backend.fetch_task_properties(["t1"], ["duration"]), {"t1": {"duration": 2}})
+
+
+class SnapshotPathTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.project = "snapshot_paths"
+        install_backend(self.project)
+
+    def tearDown(self):
+        graph_backend.discard_backend(self.project)
+
+    def test_paths_stay_inside_the_snapshot_directory(self):
+        root = os.path.dirname(os.path.realpath(snapshot_path(self.project)))
+        self.assertEqual(resolve_snapshot_path(None, self.project), snapshot_path(self.project))
+        self.assertEqual(
+            resolve_snapshot_path(os.path.join(root, "backup", "a.snap"), self.project),
+            os.path.join(root, "backup", "a.snap"),
+        )
+        for path in (os.path.join(root, "..", "a.snap"), "/etc/passwd", os.path.join(tempfile.gettempdir(), "a.snap")):
+            with self.assertRaises(ValueError):
+                resolve_snapshot_path(path, self.project)
+
+    async def test_tools_reject_outside_paths(self):
+        with tempfile.TemporaryDirectory() as outside:
+            target = os.path.join(outside, "sub", "graph.snap")
+            exported = await logic_guardian.export_graph(target, project=self.project)
+            self.assertEqual(exported["status"], "ERROR")
+            self.assertFalse(os.path.exists(os.path.dirname(target)))
+            imported = await logic_guardian.import_graph(os.path.join(outside, "graph.snap"), project=self.project)
+            self.assertEqual(imported["status"], "ERROR")
+
+
+if __name__ == "__main__":
+    unittest.main()
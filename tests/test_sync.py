@@ -0,0 +1,105 @@
+import random
+import unittest
+
+from core import graph_backend
+from core.graph_diff import diff_edges
+from tests.helpers import install_backend, random_graph, relationships
+from tools import logic_guardian
+
+
+class DiffEdgesTest(unittest.TestCase):
+    def test_matches_set_difference(self):
+        rng = random.Random(16)
+        for _ in range(100):
+            stored = random_graph(rng, 8, rng.randint(0, 20))
+            submitted = [(rel["pre"], rel["post"]) for rel in relationships(random_graph(rng, 8, rng.randint(0, 20)))]
+            submitted += submitted[: rng.randint(0, len(submitted))]
+            creates, deletes, unchanged = diff_edges(submitted, stored)
+            old = {(pre, post) for post, pres in stored.items() for pre in pres}
+            new = set(submitted)
+            self.assertEqual([(r["pre"], r["post"]) for r in creates], list(dict.fromkeys(e for e in submitted if e not in old)))
+            self.assertEqual({(r["pre"], r["post"]) for r in deletes}, old - new)
+            self.assertEqual(len(deletes), len(old - new))
+            self.assertEqual(unchanged, len(old & new))
+
+
+class SyncProjectLogicTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.project = "sync"
+        self.backend = install_backend(self.project)
+
+    def tearDown(self):
+        graph_backend.discard_backend(self.project)
+
+    async def edges(self):
+        return {post: sorted(pres) for post, pres in (await self.backend.fetch_edges()).items() if pres}
+
+    async def test_tasks_scope_only_touches_submitted_posts(self):
+        await logic_guardian.batch_upsert_logic(
+            [{"pre": "设计", "post": "开发"}, {"pre": "评审", "post": "开发"}, {"pre": "开发", "post": "测试"}],
+            project=self.project,
+        )
+        preview = await logic_guardian.sync_project_logic(
+            [{"pre": "设计", "post": "开发"}, {"pre": "原型", "post": "开发"}], dry_run=True, project=self.project
+        )
+        self.assertEqual(preview["to_create"], [{"pre": "原型", "post": "开发"}])
+        self.assertEqual(preview["to_delete"], [{"pre": "评审", "post": "开发"}])
+        self.assertEqual(len(await self.edges()), 2)
+
+        result = await logic_guardian.sync_project_logic(
+            [{"pre": "设计", "post": "开发"}, {"pre": "原型", "post": "开发"}], project=self.project
+        )
+        self.assertEqual((result["status"], result["created"], result["deleted"], result["unchanged"]), ("SUCCESS", 1, 1, 1))
+        # 未提交的任务（测试）保持原样
+        self.assertEqual(await self.edges(), {"开发": ["原型", "设计"], "测试": ["开发"]})
+
+        again = await logic_guardian.sync_project_logic(
+            [{"pre": "设计", "post": "开发"}, {"pre": "原型", "post": "开发"}], project=self.project
+        )
+        self.assertEqual((again["created"], again["deleted"], again["unchanged"]), (0, 0, 2))
+
+    async def test_project_scope_replaces_everything(self):
+        await logic_guardian.batch_upsert_logic(
+            [{"pre": "设计", "post": "开发"}, {"pre": "开发", "post": "测试"}], project=self.project
+        )
+        result = await logic_guardian.sync_project_logic(
+            [{"pre": "设计", "post": "测试"}], scope="project", project=self.project
+        )
+        self.assertEqual((result["created"], result["deleted"]), (1, 2))
+        self.assertEqual(await self.edges(), {"测试": ["设计"]})
+        # 删除后缓存与索引不会继续给出旧链条
+        self.assertEqual(
+            (await logic_guardian.validate_project_logic("测试", "开发", project=self.project))["status"], "INVALID"
+        )
+
+    async def test_malformed_rows_reject_the_whole_sync(self):
+        await logic_guardian.batch_upsert_logic([{"pre": "设计", "post": "开发"}], project=self.project)
+        result = await logic_guardian.sync_project_logic(
+            [{"pre": "原型", "post": "开发"}, {"pre": "设计"}], scope="project", project=self.project
+        )
+        self.assertEqual(result["status"], "ERROR")
+        self.assertEqual(await self.edges(), {"开发": ["设计"]})
+
+    async def test_empty_project_sync_is_rejected(self):
+        await logic_guardian.batch_upsert_logic([{"pre": "设计", "post": "开发"}], project=self.project)
+        for dry_run in (True, False):
+            result = await logic_guardian.sync_project_logic([], scope="project", dry_run=dry_run, project=self.project)
+            self.assertEqual(result["status"], "ERROR")
+        self.assertEqual(await self.edges(), {"开发": ["设计"]})
+        # scope="tasks" 的空提交不涉及任何任务，照常成功
+        result = await logic_guardian.sync_project_logic([], project=self.project)
+        self.assertEqual((result["status"], result["created"], result["deleted"]), ("SUCCESS", 0, 0))
+
+    async def test_strict_sync_deletes_before_checking_cycles(self):
+        await logic_guardian.batch_upsert_logic([{"pre": "设计", "post": "开发"}], project=self.project)
+        # 反转依赖：旧关系被删除后新关系不再成环
+        result = await logic_guardian.sync_project_logic(
+            [{"pre": "开发", "post": "设计"}], scope="project", strict=True, project=self.project
+        )
+        self.assertEqual(result["status"], "SUCCESS")
+        self.assertEqual(result["rejected_rows"], [])
+        self.assertEqual(await self.edges(), {"设计": ["开发"]})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+import random
+import unittest
+
+from core import graph_backend
+from core.memory_graph import MemoryGraphBackend
+from core.topo_order import DynamicTopologicalOrder
+from tests.helpers import install_backend, memory_backend, reachable
+from tools import logic_guardian
+
+
+class WriteDuringFetchBackend(MemoryGraphBackend):
+    """拉取全图时恰好有一次写入提交：返回的是写入之前的快照。"""
+
+    async def fetch_edges(self, seeds=None):
+        edges = await super().fetch_edges(seeds)
+        await self.upsert_chunked([{"pre": "C", "post": "B"}])
+        return edges
+
+
+class DynamicTopologicalOrderTest(unittest.IsolatedAsyncioTestCase):
+    async def test_rejects_exactly_the_cycle_creating_edges(self):
+        rng = random.Random(6)
+        for _ in range(100):
+            adj = {f"t{i}": set() for i in range(12)}
+            order = DynamicTopologicalOrder(await memory_backend({}))
+            await order.ensure_loaded()
+            for _ in range(40):
+                pre, post = rng.sample(list(adj), 2)
+                # 加入 post -> pre 会成环，当且仅当 pre 已经（间接）依赖 post
+                creates_cycle = post in reachable(adj, pre)
+                chain = order.try_add(pre, post)
+                self.assertEqual(chain is not None, creates_cycle, (pre, post))
+                if chain is None:
+                    adj[post].add(pre)
+                else:
+                    self.assertEqual((chain[0], chain[-1]), (pre, post))
+            position = order._ord
+            for post, pres in adj.items():
+                for pre in pres:
+                    self.assertLess(position[pre], position[post])
+
+    async def test_existing_cycle_blocks_loading(self):
+        order = DynamicTopologicalOrder(await memory_backend({"A": {"B"}, "B": {"A"}}))
+        with self.assertRaises(ValueError):
+            await order.ensure_loaded()
+
+
+    async def test_replays_writes_and_deletes(self):
+        backend = await memory_backend({"B": {"A"}})
+        order = DynamicTopologicalOrder(backend)
+        await order.ensure_loaded()
+        await backend.delete_chunked([{"pre": "A", "post": "B"}])
+        self.assertIsNone(order.try_add("B", "A"))
+        self.assertIsNotNone(order.try_add("A", "B"))
+
+    async def test_replays_writes_committed_while_loading(self):
+        backend = WriteDuringFetchBackend()
+        await backend.upsert_chunked([{"pre": "A", "post": "B"}])
+        order = DynamicTopologicalOrder(backend)
+        await order.ensure_loaded()
+        self.assertIsNotNone(order.try_add("B", "C"))
+
+
+class StrictIngestTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.project = "strict_ingest"
+        install_backend(self.project)
+
+    def tearDown(self):
+        graph_backend.discard_backend(self.project)
+
+    async def test_rejects_cycle_rows_and_stores_the_rest(self):
+        result = await logic_guardian.batch_upsert_logic(
+            [
+                {"pre": "设计", "post": "开发"},
+                {"pre": "开发", "post": "测试"},
+                {"pre": "测试", "post": "设计"},
+                {"pre": "设计", "post": "文档"},
+            ],
+            strict=True,
+            project=self.project,
+        )
+        self.assertEqual(result["status"], "PARTIAL")
+        self.assertEqual([r["row"] for r in result["rejected_rows"]], [2])
+        edges = await graph_backend.get_backend(self.project).fetch_edges()
+        self.assertEqual(edges["设计"], [])
+        self.assertEqual(sorted(edges["文档"]), ["设计"])
+
+        # 已入库的关系同样参与判断
+        result = await logic_guardian.batch_upsert_logic(
+            [{"pre": "文档", "post": "设计"}], strict=True, project=self.project
+        )
+        self.assertEqual(result["status"], "ERROR")
+        self.assertEqual(len(result["rejected_rows"]), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+import asyncio
+import unittest
+
+from core.memory_graph import MemoryGraphBackend
+from core.write_queue import WriteCoalescer
+
+
+class FailingBackend(MemoryGraphBackend):
+    """任何包含 pre == "bad" 的块都写入失败。"""
+
+    def __init__(self, project):
+        super().__init__(project)
+        self.batches = []
+
+    async def _write_chunk(self, chunk, attempts):
+        self.batches.append([(rel["pre"], rel["post"]) for rel in chunk])
+        if any(rel["pre"] == "bad" for rel in chunk):
+            raise RuntimeError("写入失败")
+        await super()._write_chunk(chunk, attempts)
+
+
+class WriteCoalescerTest(unittest.IsolatedAsyncioTestCase):
+    async def test_concurrent_submissions_share_one_sorted_batch(self):
+        backend = FailingBackend("queue")
+        queue = WriteCoalescer(backend, window_ms=20)
+        submissions = [
+            [{"pre": "B", "post": "C"}, {"pre": "A", "post": "B"}],
+            [{"pre": "A", "post": "B"}],
+            [{"pre": "C", "post": "D"}],
+        ]
+        reports = await asyncio.gather(*(queue.submit(rels) for rels in submissions))
+        self.assertEqual(backend.batches, [[("A", "B"), ("B", "C"), ("C", "D")]])
+        for report in reports:
+            self.assertEqual(report["coalesced"], {"callers": 3, "rows": 3})
+            self.assertEqual(report["failed_rows"], [])
+        self.assertEqual(sorted((await backend.fetch_edges())["C"]), ["B"])
+
+    async def test_failed_rows_map_back_to_each_caller(self):
+        backend = FailingBackend("queue")
+        backend.chunk_size = 1
+        queue = WriteCoalescer(backend, window_ms=20)
+        first, second = await asyncio.gather(
+            queue.submit([{"pre": "A", "post": "B"}, {"pre": "bad", "post": "X"}]),
+            queue.submit([{"pre": "bad", "post": "X"}]),
+        )
+        self.assertEqual([f["row"] for f in first["failed_rows"]], [1])
+        self.assertEqual([f["row"] for f in second["failed_rows"]], [0])
+        self.assertEqual((await backend.fetch_edges())["B"], ["A"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,8 +1,24 @@
 import os
 import sys
+import time
 import logging
+import functools
 from pathlib import Path
-from neo4j import GraphDatabase
+from typing import Optional
+from modules.YA_Common.utils.config import get_config
+from core.graph_backend import TASK_PROPERTIES, discard_backend, get_backend, resolve_max_depth, resolve_project
+from core.topo_order import get_topo_order
+from core.path_cache import get_path_cache
+from core.reachability import get_reachability_index
+from core.pagination import decode_cursor, encode_cursor
+from core.cycle_monitor import get_cycle_monitor
+from core.graph_algorithms import CyclicDependencyError, find_cycles, schedule, topological_order
+from core.graph_diff import diff_edges
+from core.name_index import get_name_index
+from core.names import get_name_normalizer
+from core.snapshot import export_snapshot, import_snapshot, resolve_snapshot_path
+from core.query_stats import get_query_stats
+from core.write_queue import get_write_queue
 from tools import YA_MCPServer_Tool
 
 os.environ["PYTHONIOENCODING"] = "utf-8"
@@ -16,89 +32,723 @@ if not logger.handlers:
     h.setFormatter(logging.Formatter('%(levelname)s: %(message)s'))
     logger.addHandler(h)
 
-class Neo4jClient:
-    def __init__(self):
-        self.uri = "bolt://127.0.0.1:7687"
-        self.user = "neo4j"
-        self.password = "12345678"  # 确保这与你的 Neo4j Desktop 密码一致
-        self._driver = None
-
-    def get_driver(self):
-        if self._driver is None:
-            try:
-                self._driver = GraphDatabase.driver(self.uri, auth=(self.user, self.password))
-                self._driver.verify_connectivity()
-                logger.info(f"成功连接至本地 Neo4j")
-            except Exception as e:
-                logger.error(f"无法连接本地 Neo4j: {str(e)}")
-                raise e
-        return self._driver
-
-    def check_path(self, start, end):
-        driver = self.get_driver()
-        with driver.session() as session:
-            query = """
-            MATCH (a:Task {name: $start}), (b:Task {name: $end})
-            MATCH p = shortestPath((a)-[:DependsOn*1..15]->(b))
-            RETURN [n in nodes(p) | n.name] as path_list
-            """
-            result = session.run(query, start=start, end=end)
-            record = result.single()
-            return record["path_list"] if record else None
-
-client = Neo4jClient()
+# 后端、缓存与索引按项目懒加载：每个工具调用时按 project 参数取对应实例
+query_stats = get_query_stats()
+
+
+def _timed(func):
+    # 按工具名记录调用耗时，返回 status 为 ERROR 时计为一次错误
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        begin = time.perf_counter()
+        result = None
+        try:
+            result = await func(*args, **kwargs)
+            return result
+        finally:
+            failed = not isinstance(result, dict) or result.get("status") == "ERROR"
+            query_stats.record_tool(func.__name__, (time.perf_counter() - begin) * 1000, failed)
+
+    return wrapper
+
+def _name_mapper():
+    # 返回 (规范化函数, {原始名: 规范名})，后者只记录被改写的任务名，用于告知调用方
+    normalize = get_name_normalizer().normalize
+    renamed = {}
+
+    def canonical(name):
+        name_ = normalize(name)
+        if name_ != name:
+            renamed[name] = name_
+        return name_
+
+    return canonical, renamed
+
+def _canonical_relationships(relationships, canonical):
+    """
+    校验格式并规范化任务名，规范化后重复的关系只保留首次出现的一行。
+
+    Returns:
+        (List[Tuple[int, str, str]], List[dict], int): ([(行号, pre, post)], 失败行, 去重行数)
+    """
+    edges, failed, seen, duplicates = [], [], set(), 0
+    for i, rel in enumerate(relationships):
+        if not (isinstance(rel, dict) and isinstance(rel.get("pre"), str) and isinstance(rel.get("post"), str)):
+            failed.append({"row": i, "rel": rel, "error": "格式错误，需包含字符串字段 pre 与 post"})
+            continue
+        try:
+            pre, post = canonical(rel["pre"]), canonical(rel["post"])
+        except ValueError as e:
+            failed.append({"row": i, "rel": rel, "error": str(e)})
+            continue
+        if (pre, post) in seen:
+            duplicates += 1
+            continue
+        seen.add((pre, post))
+        edges.append((i, pre, post))
+    return edges, failed, duplicates
+
+async def _upsert(project, client, relationships, chunk_size):
+    # 未指定 chunk_size 时经合并队列写入，与同一窗口内其他调用方的写入合成一批；
+    # 指定时按调用方的分块直接写入
+    queue = None if chunk_size else get_write_queue(project)
+    if queue is None:
+        return await client.upsert_chunked(relationships, chunk_size)
+    return await queue.submit(relationships)
+
+def _normalize_names(names):
+    # 查询类工具的任务名与写入时一样先规范化，否则带空格或全角的写法会查不到
+    if not names:
+        return names
+    normalize = get_name_normalizer().normalize
+    return [normalize(name) for name in names]
 
 @YA_MCPServer_Tool(
     name="batch_upsert_logic",
-    description="""批量同步逻辑链条。输入格式: [{"pre": "A", "post": "B"}]"""
+    description="""批量同步逻辑链条。输入格式: [{"pre": "A", "post": "B"}]。
+    大批量数据会按 chunk_size 分块、逐块事务写入，并返回每块吞吐与失败行；
+    未指定 chunk_size 时，短时间窗口内多个调用方的写入会合并为一批去重、按任务名排序后写入（见 coalesced）。
+    project 为项目命名空间（默认取 logic_graph.default_project），不同项目的同名任务互不影响。
+    strict=True 时会拒绝与已有依赖（或同批中更早的行）形成循环的关系。
+    可选 task_properties 为任务附加属性，例如 {"后端开发": {"duration": 5, "description": "实现订单接口"}}。
+    任务名写入前会规范化（全角转半角、折叠空白、按 logic_graph.names.aliases 替换别名），
+    规范化后重复的关系只写入一次；被改写的任务名在 renamed 中列出。"""
+)
+@_timed
+async def batch_upsert_logic(
+    relationships: list,
+    chunk_size: Optional[int] = None,
+    strict: Optional[bool] = None,
+    task_properties: Optional[dict] = None,
+    project: Optional[str] = None,
+) -> dict:
+    try:
+        client = get_backend(project)
+        canonical, renamed = _name_mapper()
+        properties = {}
+        for name, props in (task_properties or {}).items():
+            if not isinstance(props, dict):
+                return {"status": "ERROR", "message": f"任务 {name} 的属性必须是对象"}
+            for key, value in props.items():
+                if key not in TASK_PROPERTIES or not TASK_PROPERTIES[key](value):
+                    return {"status": "ERROR", "message": f"任务 {name} 的属性 {key}={value!r} 不合法，可用属性: {', '.join(TASK_PROPERTIES)}"}
+            properties.setdefault(canonical(name), {}).update(props)
+
+        if strict is None:
+            strict = get_config("logic_graph.strict_ingest", False)
+        if strict:
+            topo_order = get_topo_order(project)
+            await topo_order.ensure_loaded()
+
+        valid, rows, rejected = [], [], []
+        # 规范化后相同的关系只发送一次，重复行计入 deduplicated_rows
+        edges, failed, duplicates = _canonical_relationships(relationships, canonical)
+        for i, pre, post in edges:
+            if strict:
+                chain = topo_order.try_add(pre, post)
+                if chain is not None:
+                    rejected.append({
+                        "row": i,
+                        "rel": relationships[i],
+                        "error": f"会形成循环依赖: {' -> '.join([post, *chain])}",
+                    })
+                    continue
+            valid.append({"pre": pre, "post": post})
+            rows.append(i)
+
+        report = await _upsert(project, client, valid, chunk_size)
+        if properties:
+            await client.set_task_properties(properties)
+        # upsert_chunked 的行号相对 valid 列表，这里换算回原始输入行号
+        for f in report["failed_rows"]:
+            if strict:
+                # 未能入库的边要从拓扑序索引中撤回，否则会误拒后续的合法关系
+                topo_order.remove(f["rel"]["pre"], f["rel"]["post"])
+            f["row"] = rows[f["row"]]
+        failed.extend(report["failed_rows"])
+
+        stored = len(valid) - len(report["failed_rows"])
+        status = "SUCCESS" if not failed and not rejected else ("PARTIAL" if stored else "ERROR")
+        result = {
+            "status": status,
+            "message": f"已存入 {stored} 组逻辑，失败 {len(failed)} 组。",
+            "chunks": report["chunks"],
+            "failed_rows": sorted(failed, key=lambda f: f["row"]),
+            "deduplicated_rows": duplicates,
+            "renamed": renamed,
+        }
+        if "coalesced" in report:
+            result["coalesced"] = report["coalesced"]
+        if strict:
+            result["message"] = f"已存入 {stored} 组逻辑，失败 {len(failed)} 组，因循环依赖拒绝 {len(rejected)} 组。"
+            result["rejected_rows"] = rejected
+        return result
+    except Exception as e:
+        return {"status": "ERROR", "message": str(e)}
+
+@YA_MCPServer_Tool(
+    name="sync_project_logic",
+    description="""以提交的关系列表为准同步依赖：补齐缺失的关系，删除不再出现的旧关系。
+    scope="tasks"（默认）时只同步提交中作为 post 出现的任务的直接前置依赖；scope="project" 时整个项目以提交为准，
+    此时不接受空列表（清空项目请用 drop_project）。
+    差异在服务端按关系摘要计算，只写入真正变化的关系：重新提交未变化的文档只有一次读取、没有写入。
+    dry_run=True 时只返回待新增 / 待删除的关系而不写入；任务名的规范化与 batch_upsert_logic 相同。"""
 )
-async def batch_upsert_logic(relationships: list) -> dict:
+@_timed
+async def sync_project_logic(
+    relationships: list,
+    scope: str = "tasks",
+    dry_run: bool = False,
+    chunk_size: Optional[int] = None,
+    strict: Optional[bool] = None,
+    project: Optional[str] = None,
+) -> dict:
     try:
-        driver = client.get_driver()
-        with driver.session() as session:
-            query = """
-            UNWIND $rels AS rel
-            MERGE (pre:Task {name: rel.pre})
-            MERGE (post:Task {name: rel.post})
-            MERGE (post)-[:DependsOn]->(pre)
-            """
-            session.run(query, rels=relationships)
-        return {"status": "SUCCESS", "message": f"已存入 {len(relationships)} 组逻辑。"}
+        if scope not in ("tasks", "project"):
+            return {"status": "ERROR", "message": "scope 只能是 tasks 或 project"}
+        if scope == "project" and not relationships:
+            # 空提交会删光整个项目，多半是调用方出错；确需清空时走带确认的 drop_project
+            return {"status": "ERROR", "message": "scope=project 时关系列表不能为空，清空项目请使用 drop_project"}
+        client = get_backend(project)
+        canonical, renamed = _name_mapper()
+        edges, failed, duplicates = _canonical_relationships(relationships, canonical)
+        if failed:
+            # 提交不完整时按它删除旧关系会误删，整批拒绝
+            return {"status": "ERROR", "message": f"{len(failed)} 行格式错误，未做任何修改", "failed_rows": failed}
+
+        if scope == "project":
+            stored = await client.fetch_edges()
+        else:
+            stored = await client.neighbours(list(dict.fromkeys(post for _, _, post in edges)), "upstream")
+        creates, deletes, unchanged = diff_edges(((pre, post) for _, pre, post in edges), stored)
+        summary = {"unchanged": unchanged, "deduplicated_rows": duplicates, "renamed": renamed}
+        if dry_run:
+            return {"status": "SUCCESS", "dry_run": True, "to_create": creates, "to_delete": deletes, **summary}
+
+        if strict is None:
+            strict = get_config("logic_graph.strict_ingest", False)
+        if strict:
+            topo_order = get_topo_order(project)
+            await topo_order.ensure_loaded()
+
+        # 先删后增：被删除的旧关系可能正是新关系在严格模式下会成环的原因
+        delete_report = await client.delete_chunked(deletes, chunk_size)
+        rows = {(pre, post): i for i, pre, post in edges}
+        rejected = []
+        if strict:
+            accepted = []
+            for rel in creates:
+                chain = topo_order.try_add(rel["pre"], rel["post"])
+                if chain is None:
+                    accepted.append(rel)
+                else:
+                    rejected.append({
+                        "row": rows[(rel["pre"], rel["post"])],
+                        "rel": rel,
+                        "error": f"会形成循环依赖: {' -> '.join([rel['post'], *chain])}",
+                    })
+            creates = accepted
+        create_report = await _upsert(project, client, creates, chunk_size)
+
+        for f in create_report["failed_rows"]:
+            if strict:
+                topo_order.remove(f["rel"]["pre"], f["rel"]["post"])
+            f["row"] = rows[(f["rel"]["pre"], f["rel"]["post"])]
+            f["op"] = "create"
+        for f in delete_report["failed_rows"]:
+            # 待删除的关系来自库中而非提交，没有对应的输入行
+            f.pop("row")
+            f["op"] = "delete"
+        failed = delete_report["failed_rows"] + create_report["failed_rows"]
+        created = len(creates) - len(create_report["failed_rows"])
+        deleted = len(deletes) - len(delete_report["failed_rows"])
+        if not failed and not rejected:
+            status = "SUCCESS"
+        else:
+            status = "PARTIAL" if created or deleted else "ERROR"
+        result = {
+            "status": status,
+            "message": f"新增 {created} 组、删除 {deleted} 组、保持 {unchanged} 组逻辑，失败 {len(failed)} 组。",
+            "created": created,
+            "deleted": deleted,
+            **summary,
+            "chunks": {"delete": delete_report["chunks"], "create": create_report["chunks"]},
+            "failed_rows": failed,
+        }
+        if strict:
+            result["rejected_rows"] = rejected
+        return result
     except Exception as e:
         return {"status": "ERROR", "message": str(e)}
 
+# 可达性索引确认可达、但调用方不需要展开链条时的占位结果
+REACHABLE = ()
+
+async def _resolve_paths(project, keys, need_chain=True, max_depth=None):
+    """按 缓存 -> 可达性索引 -> 图遍历 的顺序解析项目内的一批 (起点, 终点)。"""
+    client = get_backend(project)
+    path_cache = get_path_cache(project)
+    reachability = get_reachability_index(project)
+    # 先取代数再查询：查询期间发生的写入会让这批结果在下次读取时失效
+    generation = client.generation
+    depth = resolve_max_depth(max_depth)
+    paths, misses = {}, []
+    for key in dict.fromkeys(keys):
+        # 同一对任务在不同跳数上限下的结论可能不同，缓存键带上跳数
+        hit, path = path_cache.get((*key, depth), generation)
+        if hit:
+            paths[key] = path
+        else:
+            misses.append(key)
+    if misses and reachability is not None and await reachability.ensure_loaded():
+        pending = []
+        for key in misses:
+            # 闭包不计跳数：不可达在任何跳数上限下都成立，可达只在不限跳数时才能直接回答
+            if not reachability.reaches(*key):
+                paths[key] = None
+                path_cache.put((*key, depth), generation, None)
+            elif not need_chain and depth is None:
+                paths[key] = REACHABLE
+            else:
+                pending.append(key)
+        misses = pending
+    if len(misses) == 1:
+        paths[misses[0]] = await client.check_path(*misses[0], depth)
+        path_cache.put((*misses[0], depth), generation, paths[misses[0]])
+    elif misses:
+        for key, path in zip(misses, await client.check_paths(misses, depth)):
+            path_cache.put((*key, depth), generation, path)
+            paths[key] = path
+    return paths
+
+async def _unknown_tasks(project, names):
+    # 查询落空时给出相似任务名：{不存在的任务名: [{"name", "score"}]}；未启用名称索引时为空
+    index = get_name_index(project)
+    if index is None:
+        return {}
+    await index.ensure_loaded()
+    limit = get_config("logic_graph.name_index.suggestions", 5)
+    return {
+        name: index.suggest(name, limit)
+        for name in dict.fromkeys(names) if not index.contains(name)
+    }
+
+async def _with_suggestions(project, names, result):
+    if result.get("status") == "INVALID":
+        unknown = await _unknown_tasks(project, names)
+        if unknown:
+            result["message"] = f"任务不存在: {', '.join(unknown)}。"
+            result["unknown_tasks"] = unknown
+    return result
+
+def _path_result(path):
+    if path == REACHABLE:
+        return {"status": "VALID", "chain": None, "message": "存在依赖路径（未展开链条）。"}
+    if path:
+        return {"status": "VALID", "chain": " -> ".join(path)}
+    return {"status": "INVALID", "message": "逻辑链条不通。"}
+
 @YA_MCPServer_Tool(
     name="validate_project_logic",
-    description="校验任务 A 到 B 是否存在合法的依赖路径。"
+    description="""校验任务 A 到 B 是否存在合法的依赖路径。
+    只需要是 / 否结论时传 need_chain=False，启用可达性索引后无需遍历图即可回答。
+    k > 1 时一次返回至多 k 条不同的依赖链条（chains，按跳数从短到长），用于解释 A 为何依赖 B；
+    计算受 time_budget_ms 限制，超时时返回已找到的链条并标记 complete=False。
+    max_depth 为链条的最大跳数，默认取 logic_graph.path_search.max_depth，0 表示不限。
+    project 为项目命名空间，默认取 logic_graph.default_project。"""
+)
+@_timed
+async def validate_project_logic(
+    current_task: str,
+    target_task: str,
+    need_chain: bool = True,
+    k: int = 1,
+    time_budget_ms: Optional[int] = None,
+    max_depth: Optional[int] = None,
+    project: Optional[str] = None,
+) -> dict:
+    try:
+        normalize = get_name_normalizer().normalize
+        key = current_task, target_task = normalize(current_task), normalize(target_task)
+        if k <= 1:
+            paths = await _resolve_paths(project, [key], need_chain, max_depth)
+            return await _with_suggestions(project, key, _path_result(paths[key]))
+        max_k = get_config("logic_graph.k_paths.max_k", 20)
+        if k > max_k:
+            return {"status": "ERROR", "message": f"k 不能超过 {max_k}"}
+        client = get_backend(project)
+        reachability = get_reachability_index(project)
+        # 可达性索引能直接否定时不必搜索
+        if reachability is not None and await reachability.ensure_loaded() and not reachability.reaches(*key):
+            return await _with_suggestions(project, key, _path_result(None))
+        budget = (time_budget_ms or get_config("logic_graph.k_paths.time_budget_ms", 2000)) / 1000
+        chains, timed_out = await client.k_paths(
+            current_task, target_task, k, budget, resolve_max_depth(max_depth)
+        )
+        if not chains:
+            if timed_out:
+                return {"status": "ERROR", "message": f"在 {budget * 1000:.0f}ms 的时间预算内未能完成搜索"}
+            return await _with_suggestions(project, key, _path_result(None))
+        return {
+            "status": "VALID",
+            "chain": " -> ".join(chains[0]),
+            "chains": [" -> ".join(chain) for chain in chains],
+            "complete": not timed_out,
+        }
+    except Exception as e:
+        return {"status": "ERROR", "message": str(e)}
+
+@YA_MCPServer_Tool(
+    name="batch_validate_project_logic",
+    description="""批量校验多组任务之间是否存在合法的依赖路径，一次调用完成整份路线图的校验。
+    输入格式: [{"current_task": "A", "target_task": "B"}] 或 [["A", "B"]]；need_chain=False 时不展开链条。
+    max_depth 为链条的最大跳数，默认取 logic_graph.path_search.max_depth，0 表示不限；project 为项目命名空间。"""
 )
-async def validate_project_logic(current_task: str, target_task: str) -> dict:
+@_timed
+async def batch_validate_project_logic(
+    pairs: list,
+    need_chain: bool = True,
+    max_depth: Optional[int] = None,
+    project: Optional[str] = None,
+) -> dict:
     try:
-        path = client.check_path(current_task, target_task)
-        if path:
-            return {"status": "VALID", "chain": " -> ".join(path)}
-        return {"status": "INVALID", "message": "逻辑链条不通。"}
+        keys = []
+        for i, pair in enumerate(pairs):
+            if isinstance(pair, dict):
+                pair = (pair.get("current_task"), pair.get("target_task"))
+            if not (isinstance(pair, (list, tuple)) and len(pair) == 2 and all(isinstance(x, str) for x in pair)):
+                return {"status": "ERROR", "message": f"第 {i} 组格式错误，需包含 current_task 与 target_task"}
+            keys.append(tuple(pair))
+        normalize = get_name_normalizer().normalize
+        keys = [(normalize(start), normalize(end)) for start, end in keys]
+
+        paths = await _resolve_paths(project, keys, need_chain, max_depth)
+        results = [
+            {"current_task": current_task, "target_task": target_task, **_path_result(paths[(current_task, target_task)])}
+            for current_task, target_task in keys
+        ]
+        valid = sum(1 for item in results if item["status"] == "VALID")
+        unknown = await _unknown_tasks(project, [
+            name for item in results if item["status"] == "INVALID"
+            for name in (item["current_task"], item["target_task"])
+        ]) if valid < len(results) else {}
+        report = {
+            "status": "SUCCESS",
+            "summary": {"total": len(results), "valid": valid, "invalid": len(results) - valid},
+            "results": results,
+        }
+        if unknown:
+            report["unknown_tasks"] = unknown
+        return report
     except Exception as e:
         return {"status": "ERROR", "message": str(e)}
 
 @YA_MCPServer_Tool(
     name="query_project_context",
-    description="查询任务的上下游关系。"
+    description="""查询任务的上下游关系。
+    默认只返回直接前置 / 后置任务（direction=upstream / downstream 时只返回 pre_tasks / next_tasks）；传入 page_size 或 cursor 时按名称分页读取直接上下游，适合依赖数量很大的枢纽任务；
+    depth > 1 时返回 k 跳内的上游（upstream）/ 下游（downstream）/ 双向（both）子图（节点列表 + 边列表）。
+    分页时每页最多 page_size 个节点，用返回的 next_cursor 继续读取；project 为项目命名空间。"""
+)
+@_timed
+async def query_project_context(
+    task_name: str,
+    depth: int = 1,
+    direction: str = "both",
+    page_size: Optional[int] = None,
+    cursor: Optional[str] = None,
+    project: Optional[str] = None,
+) -> dict:
+    try:
+        project = resolve_project(project)
+        client = get_backend(project)
+        task_name = get_name_normalizer().normalize(task_name)
+        if direction not in ("upstream", "downstream", "both"):
+            return {"status": "ERROR", "message": "direction 只能是 upstream、downstream 或 both"}
+        if depth == 1 and cursor is None and page_size is None:
+            upstream, downstream = await client.get_context(task_name)
+            result = {"task": task_name}
+            if direction != "downstream":
+                result["pre_tasks"] = upstream
+            if direction != "upstream":
+                result["next_tasks"] = downstream
+            if not upstream and not downstream:
+                # 没有任何上下游时区分“孤立任务”与“任务名写错了”
+                unknown = await _unknown_tasks(project, [task_name])
+                if unknown:
+                    result["suggestions"] = unknown[task_name]
+            return result
+        if depth < 1:
+            return {"status": "ERROR", "message": "depth 必须大于等于 1"}
+        page_size = page_size or get_config("logic_graph.context.page_size", 200)
+        if page_size < 1:
+            return {"status": "ERROR", "message": "page_size 必须大于等于 1"}
+        max_visit = get_config("logic_graph.context.max_visit", 10000)
+        request = {"p": project, "t": task_name, "d": depth, "dir": direction}
+        position = decode_cursor("context", cursor)
+        if position is not None and position.pop("req", None) != request:
+            return {"status": "ERROR", "message": "游标与本次查询参数不一致"}
+        after = tuple(position["after"]) if position else None
+        sections = ["upstream", "downstream"] if direction == "both" else [direction]
+        if depth == 1:
+            return await _direct_context_page(client, task_name, sections, page_size, after, request)
+
+        # 节点按 (方向, 跳数, 名称) 排序，游标记录上一页最后一个节点的键
+        nodes, edge_keys, truncated = [], {}, False
+        for section_index, section in enumerate(sections):
+            hops, section_edges, cut = await client.expand(task_name, depth, section, max_visit)
+            truncated = truncated or cut
+            key = {name: (section_index, hop, name) for name, hop in hops.items()}
+            key[task_name] = (section_index, 0, task_name)
+            nodes.extend((key[name], section) for name in hops)
+            # 每条边归入其较晚出现的端点所在的页，各页的边互不重复；
+            # direction=both 时同一条边可能在上下游两侧都被走到，只保留先出现的一侧
+            for edge in section_edges:
+                edge_keys.setdefault(edge, max(key[edge[0]], key[edge[1]]))
+        edges = [(edge_key, list(edge)) for edge, edge_key in edge_keys.items()]
+        nodes.sort()
+        if after is not None:
+            nodes = [node for node in nodes if node[0] > after]
+        page, rest = nodes[:page_size], nodes[page_size:]
+        last = page[-1][0] if page else None
+        page_edges = [
+            edge for edge_key, edge in edges
+            if (after is None or edge_key > after) and (last is not None and (not rest or edge_key <= last))
+        ]
+        return {
+            "task": task_name,
+            "depth": depth,
+            "direction": direction,
+            "nodes": [{"name": k[2], "hop": k[1], "direction": section} for k, section in page],
+            "edges": page_edges,
+            "truncated": truncated,
+            "next_cursor": encode_cursor("context", {"req": request, "after": list(last)}) if rest else None,
+        }
+    except Exception as e:
+        return {"status": "ERROR", "message": str(e)}
+
+async def _direct_context_page(client, task_name, sections, page_size, after, request):
+    # 直接上下游按 (方向, 1, 名称) 做 keyset 分页：每次只从后端取本页所需的行，
+    # 多取一行用于判断是否还有下一页，内存与 page_size 成正比而与邻居总数无关
+    nodes, edges, more = [], [], False
+    for section_index, section in enumerate(sections):
+        if after is not None and section_index < after[0]:
+            continue
+        start = after[2] if after is not None and section_index == after[0] else None
+        room = page_size - len(nodes)
+        names = await client.neighbour_page(task_name, section, start, room + 1)
+        for name in names[:room]:
+            nodes.append({"name": name, "hop": 1, "direction": section})
+            edges.append([task_name, name] if section == "upstream" else [name, task_name])
+        if len(names) > room:
+            more = True
+            break
+    last = nodes[-1] if nodes else None
+    return {
+        "task": task_name,
+        "depth": 1,
+        "direction": request["dir"],
+        "nodes": nodes,
+        "edges": edges,
+        "truncated": False,
+        "next_cursor": encode_cursor(
+            "context", {"req": request, "after": [sections.index(last["direction"]), 1, last["name"]]}
+        ) if more else None,
+    }
+
+@YA_MCPServer_Tool(
+    name="suggest_task_names",
+    description="""按字面相似度查找与 name 相近的任务名（用于核对拼写、找回记不全的任务名）。
+    返回至多 limit 个候选及 0~1 的相似度得分，exists 表示 name 本身是否存在；project 为项目命名空间。"""
 )
-async def query_project_context(task_name: str) -> dict:
+@_timed
+async def suggest_task_names(name: str, limit: int = 10, project: Optional[str] = None) -> dict:
     try:
-        driver = client.get_driver()
-        with driver.session() as session:
-            query = """
-            MATCH (t:Task {name: $name})
-            OPTIONAL MATCH (t)-[:DependsOn]->(pre)
-            OPTIONAL MATCH (next)-[:DependsOn]->(t)
-            RETURN collect(DISTINCT pre.name) as upstream, collect(DISTINCT next.name) as downstream
-            """
-            res = session.run(query, name=task_name).single()
+        if limit < 1:
+            return {"status": "ERROR", "message": "limit 必须大于等于 1"}
+        index = get_name_index(project)
+        if index is None:
+            return {"status": "ERROR", "message": "任务名索引未启用（logic_graph.name_index.enabled）"}
+        name = get_name_normalizer().normalize(name)
+        await index.ensure_loaded()
+        return {
+            "status": "SUCCESS",
+            "name": name,
+            "exists": index.contains(name),
+            "suggestions": index.suggest(name, limit),
+        }
+    except Exception as e:
+        return {"status": "ERROR", "message": str(e)}
+
+@YA_MCPServer_Tool(
+    name="search_tasks",
+    description="""按关键词全文检索任务名与描述（task_properties 中的 description），例如找出所有与“测试”相关的任务。
+    结果按相关度 score 从高到低排列，每页至多 top_k 条（默认 logic_graph.search.top_k），用返回的 next_cursor 继续读取。
+    Neo4j 后端使用带 CJK 分词的全文索引（logic_graph.search.fulltext_index）；project 为项目命名空间。"""
+)
+@_timed
+async def search_tasks(
+    query: str,
+    top_k: Optional[int] = None,
+    cursor: Optional[str] = None,
+    project: Optional[str] = None,
+) -> dict:
+    try:
+        project = resolve_project(project)
+        query = query.strip()
+        if not query:
+            return {"status": "ERROR", "message": "query 不能为空"}
+        top_k = top_k or get_config("logic_graph.search.top_k", 20)
+        max_top_k = get_config("logic_graph.search.max_top_k", 200)
+        if not 1 <= top_k <= max_top_k:
+            return {"status": "ERROR", "message": f"top_k 必须在 1 到 {max_top_k} 之间"}
+        request = {"p": project, "q": query, "n": top_k}
+        position = decode_cursor("search", cursor)
+        if position is not None and position.pop("req", None) != request:
+            return {"status": "ERROR", "message": "游标与本次查询参数不一致"}
+        offset = position["offset"] if position else 0
+        # 多取一条用于判断是否还有下一页
+        rows = await get_backend(project).search_tasks(query, offset, top_k + 1)
+        return {
+            "status": "SUCCESS",
+            "query": query,
+            "results": [{**row, "score": round(row["score"], 4)} for row in rows[:top_k]],
+            "next_cursor": encode_cursor(
+                "search", {"req": request, "offset": offset + top_k}
+            ) if len(rows) > top_k else None,
+        }
+    except Exception as e:
+        return {"status": "ERROR", "message": str(e)}
+
+@YA_MCPServer_Tool(
+    name="detect_logic_cycles",
+    description="""检测 DependsOn 图中的全部循环依赖（强连通分量），并给出每个环的具体链条。
+    不传 task_names 时检测项目全图（写入后仅增量重算受影响区域）；传入时只检测这些任务依赖的子图。"""
+)
+@_timed
+async def detect_logic_cycles(
+    task_names: Optional[list] = None, full_scan: bool = False, project: Optional[str] = None
+) -> dict:
+    try:
+        if task_names:
+            edges = await get_backend(project).fetch_edges(_normalize_names(task_names))
+            report = {"cycles": find_cycles(edges), "mode": "subgraph", "checked_tasks": len(edges)}
+        else:
+            report = await get_cycle_monitor(project).check(full_scan=full_scan)
+        cycles = [{"tasks": c["tasks"], "chain": " -> ".join(c["chain"])} for c in report["cycles"]]
+        return {
+            "status": "CYCLIC" if cycles else "ACYCLIC",
+            "cycles": cycles,
+            "mode": report["mode"],
+            "checked_tasks": report["checked_tasks"],
+        }
+    except Exception as e:
+        return {"status": "ERROR", "message": str(e)}
+
+@YA_MCPServer_Tool(
+    name="get_topological_order",
+    description="""返回任务的拓扑执行顺序（前置任务在前）。
+    传入 task_names 时只排序完成这些任务所需的全部前置任务；存在循环依赖时返回无法排序的任务。"""
+)
+@_timed
+async def get_topological_order(task_names: Optional[list] = None, project: Optional[str] = None) -> dict:
+    try:
+        edges = await get_backend(project).fetch_edges(_normalize_names(task_names) or None)
+        order, blocked = topological_order(edges)
+        if blocked:
             return {
-                "task": task_name,
-                "pre_tasks": res["upstream"],
-                "next_tasks": res["downstream"]
+                "status": "CYCLIC",
+                "order": order,
+                "blocked_tasks": blocked,
+                "cycles": [" -> ".join(c["chain"]) for c in find_cycles(edges)],
             }
+        return {"status": "SUCCESS", "order": order}
     except Exception as e:
-        return {"status": "ERROR", "message": str(e)}
\ No newline at end of file
+        return {"status": "ERROR", "message": str(e)}
+
+@YA_MCPServer_Tool(
+    name="compute_schedule",
+    description="""一次性计算任务路线图：分层、最早开始时间、松弛时间与关键路径。
+    传入 task_names 时只排期完成这些任务所需的全部前置任务；工期取任务的 duration 属性，
+    可用 durations 覆盖，缺失时使用 default_duration。"""
+)
+@_timed
+async def compute_schedule(
+    task_names: Optional[list] = None,
+    durations: Optional[dict] = None,
+    default_duration: float = 1,
+    project: Optional[str] = None,
+) -> dict:
+    try:
+        client = get_backend(project)
+        edges = await client.fetch_edges(_normalize_names(task_names) or None)
+        stored = await client.fetch_task_properties(list(edges), ["duration"])
+        merged = {name: props["duration"] for name, props in stored.items() if "duration" in props}
+        normalize = get_name_normalizer().normalize
+        merged.update({normalize(name): value for name, value in (durations or {}).items()})
+        for name, value in merged.items():
+            if not TASK_PROPERTIES["duration"](value):
+                return {"status": "ERROR", "message": f"任务 {name} 的工期 {value!r} 不合法"}
+        plan = schedule(edges, merged, default_duration)
+        return {"status": "SUCCESS", **plan}
+    except CyclicDependencyError as e:
+        return {"status": "CYCLIC", "message": str(e)}
+    except Exception as e:
+        return {"status": "ERROR", "message": str(e)}
+
+@YA_MCPServer_Tool(
+    name="export_graph",
+    description="""把一个项目的 Task / DependsOn 图（含任务属性）导出为紧凑的二进制快照文件。
+    path 默认取 logic_graph.snapshot.path（{project} 替换为项目名），指定时必须位于该路径所在的目录内；compress=True 时使用 zlib 压缩（加载时无法 mmap，需先解压）。"""
+)
+@_timed
+async def export_graph(path: Optional[str] = None, compress: bool = False, project: Optional[str] = None) -> dict:
+    try:
+        project = resolve_project(project)
+        path = resolve_snapshot_path(path, project)
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        stats = await export_snapshot(get_backend(project), path, compress)
+        return {"status": "SUCCESS", "project": project, "path": path, **stats}
+    except Exception as e:
+        return {"status": "ERROR", "message": str(e)}
+
+@YA_MCPServer_Tool(
+    name="import_graph",
+    description="""从 export_graph 生成的快照文件把任务图导入到项目中，按 MERGE 语义与现有数据合并。
+    path 默认取 logic_graph.snapshot.path（{project} 替换为项目名），指定时必须位于该路径所在的目录内。"""
+)
+@_timed
+async def import_graph(
+    path: Optional[str] = None, chunk_size: Optional[int] = None, project: Optional[str] = None
+) -> dict:
+    try:
+        project = resolve_project(project)
+        path = resolve_snapshot_path(path, project)
+        if not os.path.exists(path):
+            return {"status": "ERROR", "message": f"快照文件不存在: {path}"}
+        report = await import_snapshot(get_backend(project), path, chunk_size)
+        failed = report["failed_rows"]
+        return {
+            "status": "PARTIAL" if failed else "SUCCESS",
+            "message": f"导入 {report['nodes']} 个任务、{report['edges'] - len(failed)} 条依赖",
+            **report,
+        }
+    except Exception as e:
+        return {"status": "ERROR", "message": str(e)}
+
+@YA_MCPServer_Tool(
+    name="drop_project",
+    description="""删除一个项目的全部任务与依赖关系，其他项目不受影响；该项目的缓存与索引随之重建。
+    需传 confirm=True 才会执行。"""
+)
+@_timed
+async def drop_project(project: str, confirm: bool = False) -> dict:
+    try:
+        project = resolve_project(project)
+        if not confirm:
+            return {"status": "ERROR", "message": f"删除项目 {project} 不可恢复，请传入 confirm=True 确认"}
+        dropped = await get_backend(project).drop_project()
+        discard_backend(project)
+        return {"status": "SUCCESS", "project": project, "message": f"已删除项目 {project} 的 {dropped} 个任务。"}
+    except Exception as e:
+        return {"status": "ERROR", "message": str(e)}